@@ -0,0 +1,41 @@
+"""Filtering speed of the in-memory Catalog on a synthetic 10k-game library.
+
+Run: python benchmarks/bench_catalog.py
+"""
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "script"))
+from catalog import Catalog, CatalogEntry
+
+WORDS = ["doom", "quest", "space", "king", "war", "prince", "island", "dark", "star", "commander", "legend", "tomb", "night", "fury", "zone"]
+
+def build(count=10000):
+    rnd = random.Random(42)
+    entries = []
+    for i in range(count):
+        name = " ".join(rnd.choice(WORDS) for _ in range(3)).title() + f" {i}"
+        meta = {"favorite": rnd.random() < 0.1, "genre": "Action", "year": str(1985 + i % 15), "rating": rnd.randint(0, 5)}
+        entries.append(CatalogEntry(name + ".zip", rnd.random() < 0.3, meta, 1024 * i))
+    return Catalog(entries)
+
+def bench(label, func, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); result = func(); best = min(best, time.perf_counter() - t0)
+    print(f"{label:<40} {best * 1000:8.3f} ms  ({len(result)} hits)")
+
+if __name__ == "__main__":
+    cat = build()
+    print(f"Catalog: {len(cat)} entries")
+    bench("full scan: 'quest'", lambda: (cat.touch(), cat.filter("quest"))[1])
+    bench("favourites only", lambda: (cat.touch(), cat.filter("", True))[1])
+    def typing():
+        cat.touch()
+        for i in range(1, len("space king") + 1): res = cat.filter("space king"[:i])
+        return res
+    bench("typing 'space king' (10 keystrokes)", typing)
+    cat.filter("space")
+    bench("narrowed from cached 'space' result", lambda: cat.filter("space k"))
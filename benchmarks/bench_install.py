@@ -0,0 +1,63 @@
+"""Install extraction: old extract-then-move path vs. the single-pass planned extractor.
+
+Builds a synthetic game zip (everything wrapped in one top-level folder, plus a bundled
+DOSBox build) and installs it both ways into a temp dir.
+
+Run: python benchmarks/bench_install.py [files] [kb_per_file]
+"""
+import os
+import sys
+import shutil
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "script"))
+from extractor import extract_zip
+
+def build_zip(path, files, kb):
+    payload = os.urandom(kb * 1024)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as z:
+        for i in range(files):
+            z.writestr(f"GAME/DATA{i // 50}/FILE{i}.DAT", payload)
+        for i in range(files // 10):
+            z.writestr(f"GAME/DOSBox/lib{i}.dll", payload)
+
+def legacy_install(zip_path, target):
+    """The pre-planner install_game: extractall, flatten a lone folder, drop dosbox/."""
+    os.makedirs(target)
+    with zipfile.ZipFile(zip_path, "r") as z: z.extractall(target)
+    items = os.listdir(target)
+    if len(items) == 1 and os.path.isdir(os.path.join(target, items[0])):
+        sub = os.path.join(target, items[0])
+        for f in os.listdir(sub):
+            shutil.move(os.path.join(sub, f), os.path.join(target, f))
+        os.rmdir(sub)
+    for item in os.listdir(target):
+        if item.lower() == "dosbox" and os.path.isdir(os.path.join(target, item)):
+            shutil.rmtree(os.path.join(target, item), ignore_errors=True)
+
+def streaming_install(zip_path, target):
+    os.makedirs(target)
+    with zipfile.ZipFile(zip_path, "r") as z: extract_zip(z, target)
+
+def bench(label, func, zip_path, work, repeat=3):
+    best = float("inf")
+    for n in range(repeat):
+        target = os.path.join(work, f"{label}{n}")
+        t0 = time.perf_counter(); func(zip_path, target); best = min(best, time.perf_counter() - t0)
+        listing = sorted(os.path.relpath(os.path.join(r, f), target) for r, _, fs in os.walk(target) for f in fs)
+        shutil.rmtree(target)
+    print(f"{label:<12} {best * 1000:9.1f} ms  ({len(listing)} files)")
+    return listing
+
+if __name__ == "__main__":
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    kb = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    with tempfile.TemporaryDirectory() as work:
+        zip_path = os.path.join(work, "game.zip")
+        build_zip(zip_path, files, kb)
+        print(f"{files} files x {kb} KB (+{files // 10} in DOSBox/)")
+        old = bench("legacy", legacy_install, zip_path, work)
+        new = bench("streaming", streaming_install, zip_path, work)
+        assert old == new, "layouts differ"
@@ -0,0 +1,163 @@
+import os
+import stat
+import sys
+import shutil
+import hashlib
+import threading
+import zlib
+
+DEDUP_MIN_SIZE = 16 * 1024
+HASH_CHUNK = 1024 * 1024
+# Súbory, ktoré hry nemenia (CD obrazy, médiá, dokumenty); len tie sa smú zdieľať cez hardlink (bez copy-on-write).
+# Spustiteľné súbory, overlaye a dátové obrazy hry často samy prepisujú (ochrana, setup, high score), tie nie.
+READONLY_EXTS = ('.iso', '.cue', '.mdf', '.mds', '.ccd', '.sub', '.voc', '.wav', '.mid', '.xmi', '.mus', '.fli',
+                 '.flc', '.smk', '.pcx', '.lbm', '.gif', '.pdf')
+READONLY_MODE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+FICLONE = 0x40049409
+
+def _reflink(src, dst):
+    """Copy-on-write clone of `src` at `dst` (Linux btrfs/XFS); raises OSError when unsupported."""
+    if not sys.platform.startswith("linux"): raise OSError("reflinks not supported")
+    import fcntl
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        try: fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close(); os.remove(dst); raise
+
+def file_digest(path):
+    """(sha256 hex, crc32) of a file, read in chunks."""
+    sha, crc = hashlib.sha256(), 0
+    with open(path, 'rb') as f:
+        while True:
+            buf = f.read(HASH_CHUNK)
+            if not buf: break
+            sha.update(buf); crc = zlib.crc32(buf, crc)
+    return sha.hexdigest(), crc
+
+class BlobStore:
+    """Content-addressed store that lets identical files in different game folders share storage.
+
+    Each distinct file lives once under `store_dir`/<h[:2]>/<sha256>; installed copies are
+    reflinks (copy-on-write, any file type) where the filesystem supports them and hard links
+    otherwise, restricted to READONLY_EXTS so a game rewriting its exe, config or saves never
+    changes another game's copy. Hard-linked files are also made read-only, so an unexpected
+    write fails instead of reaching every install sharing the blob. Per-game reference counts
+    live in the library db; a blob is deleted once no installed game references it.
+    """
+
+    def __init__(self, store_dir, db):
+        self.store_dir = store_dir
+        self._db = db
+        self._lock = threading.Lock()
+        self._reflink_ok = None     # None = ešte nevyskúšané
+        self._verified = set()      # bloby, ktorých obsah v tomto behu sedel s ich sha256
+
+    def blob_path(self, h): return os.path.join(self.store_dir, h[:2], h)
+
+    def _shareable(self, path, size):
+        if size < DEDUP_MIN_SIZE: return False
+        return self._reflink_ok is not False or path.lower().endswith(READONLY_EXTS)
+
+    def _clone(self, src, dst, hardlink_ok):
+        """Makes `dst` share `src`'s data, replacing `dst` atomically. False when not allowed here."""
+        tmp = f"{dst}.{threading.get_ident()}.dedup"
+        if self._reflink_ok is not False:
+            try:
+                _reflink(src, tmp); self._reflink_ok = True
+                os.replace(tmp, dst); return True
+            except OSError:
+                if self._reflink_ok: raise
+                self._reflink_ok = False
+        if not hardlink_ok: return False
+        os.chmod(src, READONLY_MODE)    # platí pre všetky hardlinky toho istého súboru
+        os.link(src, tmp)
+        try: os.replace(tmp, dst)
+        except OSError: os.remove(tmp); raise
+        return True
+
+    def _share(self, h, path):
+        """Points `path` at blob `h`, creating the blob from `path` when it is new."""
+        blob = self.blob_path(h)
+        hardlink_ok = path.lower().endswith(READONLY_EXTS)
+        with self._lock:
+            if self._blob_ok(h): return self._clone(blob, path, hardlink_ok)
+            # Chýbajúci alebo poškodený blob sa (znovu) vytvorí z tohto súboru
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            if os.path.exists(blob): os.chmod(blob, stat.S_IWRITE | stat.S_IREAD)
+            return self._clone(path, blob, hardlink_ok)
+
+    def _blob_ok(self, h):
+        """True when blob `h` exists and its content matches its sha256 (checked once per run)."""
+        if h in self._verified: return True
+        try:
+            if file_digest(self.blob_path(h))[0] != h: return False
+        except OSError: return False
+        self._verified.add(h)
+        return True
+
+    @staticmethod
+    def _unshare(path):
+        """Replaces a hard link made by older versions for a file games may write with a private copy."""
+        tmp = f"{path}.{threading.get_ident()}.unshare"
+        shutil.copyfile(path, tmp)
+        shutil.copystat(path, tmp)
+        os.chmod(tmp, os.stat(tmp).st_mode | stat.S_IWUSR)
+        os.replace(tmp, path)
+
+    def link_member(self, member, dest, known):
+        """Install fast path: materializes `dest` from a stored blob matching the zip member's
+        size and CRC-32 without decompressing it. Records the hash in `known` on success."""
+        if not self._shareable(dest, member.file_size): return False
+        h = self._db.find_blob(member.file_size, member.CRC)
+        if not h: return False
+        blob = self.blob_path(h)
+        try:
+            with self._lock:
+                # Veľkosť a CRC-32 nestačia: blob sa použije, len ak jeho obsah sedí so sha256 z uloženia
+                if not self._blob_ok(h): return False
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                if not self._clone(blob, dest, dest.lower().endswith(READONLY_EXTS)): return False
+        except OSError: return False
+        known[dest] = (h, member.file_size, member.CRC)
+        return True
+
+    def ingest(self, game_name, folder, known=None):
+        """Moves every shareable file of an installed game into the store and records the
+        game's references (replacing any previous ones). Returns the bytes now shared."""
+        blobs, shared = {}, 0
+        for root, dirs, files in os.walk(folder):
+            for f in files:
+                path = os.path.join(root, f)
+                if known and path in known:
+                    h, size, crc = known[path]
+                else:
+                    try:
+                        st = os.lstat(path)
+                        if not stat.S_ISREG(st.st_mode): continue
+                        if st.st_nlink > 1 and not path.lower().endswith(READONLY_EXTS): self._unshare(path)
+                        if not self._shareable(path, st.st_size): continue
+                        (h, crc), size = file_digest(path), st.st_size
+                        if not self._share(h, path): continue
+                    except OSError: continue
+                count = blobs.get(h, (0,))[0]
+                blobs[h] = (count + 1, size, crc)
+                shared += size
+        with self._lock: self._remove(self._db.set_blob_refs(game_name, blobs))
+        return shared
+
+    def release(self, game_name):
+        """Drops a game's references (uninstall) and deletes blobs nobody uses any more."""
+        with self._lock: self._remove(self._db.set_blob_refs(game_name, {}))
+
+    def _remove(self, hashes):
+        for h in hashes:
+            self._verified.discard(h)
+            try:
+                os.chmod(self.blob_path(h), stat.S_IWRITE)     # Windows nezmaže súbor len na čítanie
+                os.remove(self.blob_path(h))
+            except OSError: pass
+
+    def report(self):
+        """{'blobs', 'stored', 'logical', 'saved'} byte counts for the whole store."""
+        count, stored, logical = self._db.blob_stats()
+        return {"blobs": count, "stored": stored, "logical": logical, "saved": max(0, logical - stored)}
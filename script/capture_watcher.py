@@ -0,0 +1,145 @@
+import os
+import re
+import sys
+import select
+import struct
+import threading
+import ctypes
+import ctypes.util
+
+POLL_INTERVAL = 1.0
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+def _load_libc():
+    if not sys.platform.startswith("linux"): return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError): return None
+
+_libc = _load_libc()
+
+class ScreenshotNames:
+    """Next free `<game>NNN.png` index per game, from one listing of its screens folder; later
+    names are handed out from the counter without listing the folder again."""
+
+    def __init__(self):
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, game_name, screens_dir):
+        with self._lock:
+            idx = self._next.get(game_name)
+            if idx is None:
+                pattern = re.compile(rf"^{re.escape(game_name)}(\d+)\.png$", re.IGNORECASE)
+                found = [int(m.group(1)) for m in map(pattern.match, os.listdir(screens_dir)) if m] if os.path.isdir(screens_dir) else []
+                idx = max(found, default=-1) + 1
+            # Súbor mohol pribudnúť mimo launchera
+            while os.path.exists(os.path.join(screens_dir, f"{game_name}{idx:03d}.png")): idx += 1
+            self._next[game_name] = idx + 1
+        return f"{game_name}{idx:03d}.png"
+
+    def forget(self, game_name):
+        with self._lock: self._next.pop(game_name, None)
+
+class CaptureWatcher:
+    """Reports .png files written into `dirs` while a game runs, via `on_capture(path)`.
+
+    On Linux it uses inotify (IN_CLOSE_WRITE / IN_MOVED_TO, so a file is reported once DOSBox
+    has finished writing it); a watched folder that doesn't exist yet (DOSBox creates capture/
+    on the first screenshot) is picked up from its parent's IN_CREATE. Elsewhere it polls:
+    a folder is only listed again when its mtime changed, and a new file is reported once its
+    size stayed the same between two polls. Files present at start() are never reported.
+    """
+
+    def __init__(self, dirs, on_capture, interval=POLL_INTERVAL):
+        self.dirs = [os.path.normpath(d) for d in dict.fromkeys(dirs)]
+        self.on_capture = on_capture
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._fd = None
+        self._wds = {}      # wd -> priečinok
+
+    def start(self):
+        fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC) if _libc else -1
+        if fd >= 0:
+            self._fd = fd
+            for d in self.dirs: self._add_watch(d)
+            for parent in {os.path.dirname(d) for d in self.dirs if not os.path.isdir(d)}: self._add_watch(parent)
+            target = self._run_inotify
+        else:
+            self._known = {d: self._listing(d) for d in self.dirs}
+            target = self._run_polling
+        self._thread = threading.Thread(target=target, name="capture-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops watching; files reported before it returns have been handled."""
+        self._stop.set()
+        if self._thread: self._thread.join()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _report(self, path):
+        try: self.on_capture(path)
+        except Exception as e: print(f"Screenshot import error: {e}")
+
+    # --- inotify ---
+    def _add_watch(self, d):
+        if d in self._wds.values() or not os.path.isdir(d): return
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(d), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+        if wd >= 0: self._wds[wd] = d
+
+    def _run_inotify(self):
+        while not self._stop.is_set():
+            if not select.select([self._fd], [], [], 0.5)[0]: continue
+            try: buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError: continue
+            except OSError: return
+            pos = 0
+            while pos + _EVENT.size <= len(buf):
+                wd, mask, _, length = _EVENT.unpack_from(buf, pos)
+                name = buf[pos + _EVENT.size:pos + _EVENT.size + length].rstrip(b"\0").decode(errors="replace")
+                pos += _EVENT.size + length
+                d = self._wds.get(wd)
+                if d is None or not name: continue
+                path = os.path.join(d, name)
+                if mask & IN_ISDIR:
+                    if mask & IN_CREATE and path in self.dirs: self._add_watch(path)
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and d in self.dirs and name.lower().endswith(".png"):
+                    self._report(path)
+
+    # --- polling ---
+    @staticmethod
+    def _listing(d):
+        try:
+            with os.scandir(d) as it:
+                return os.stat(d).st_mtime_ns, {e.name: e.stat().st_size for e in it if e.name.lower().endswith(".png") and e.is_file()}
+        except OSError: return None, {}
+
+    def _run_polling(self):
+        pending = {}    # cesta -> veľkosť pri poslednej kontrole
+        while not self._stop.wait(self.interval):
+            for d in self.dirs:
+                try: mtime = os.stat(d).st_mtime_ns
+                except OSError: continue
+                known = self._known[d]
+                if mtime != known[0]:
+                    listing = self._listing(d)
+                    for name in listing[1].keys() - known[1].keys(): pending.setdefault(os.path.join(d, name), -1)
+                    self._known[d] = listing
+            for path, size in list(pending.items()):
+                try: now = os.path.getsize(path)
+                except OSError: pending.pop(path); continue
+                if now == size: pending.pop(path); self._report(path)
+                else: pending[path] = now
@@ -0,0 +1,81 @@
+import os
+
+class CatalogEntry:
+    """One game of the library as held in memory for filtering and sorting."""
+    __slots__ = ("zip_name", "name", "installed", "favorite", "genre", "year", "company", "rating", "zip_size", "hdd_size",
+                 "last_played", "play_time", "recent_time", "search_key")
+
+    def __init__(self, zip_name, installed=False, meta=None, zip_size=0, hdd_size=0, play_stats=None):
+        meta = meta or {}
+        self.zip_name = zip_name
+        self.name = os.path.splitext(zip_name)[0]
+        self.installed = installed
+        self.favorite = meta.get("favorite", False)
+        self.genre = meta.get("genre", "")
+        self.year = meta.get("year", "")
+        self.company = meta.get("company", "")
+        self.rating = meta.get("rating", 0)
+        self.zip_size = zip_size
+        self.hdd_size = hdd_size    # None = ešte sa počíta na pozadí
+        self.last_played, self.play_time, self.recent_time = play_stats or (0, 0, 0)
+        self.search_key = self.name.lower()
+
+class Catalog:
+    """In-memory model of the library; filtering never touches the disk.
+
+    With a SearchIndex attached, queries use its fielded/prefix syntax; otherwise they
+    match a substring of the game name. The last filter result is remembered so a query
+    that only gets longer (or a favourites filter being switched on) narrows that result
+    instead of the whole catalog. That only holds for plain terms where the new query
+    extends the old one token by token; fielded queries are not monotonic while being typed
+    (`year:199` vs `year:1993`, `genre` vs `genre:rpg`), so they always filter the whole catalog.
+    """
+
+    def __init__(self, entries=(), index=None):
+        self.entries = {e.zip_name: e for e in entries}
+        self.index = index
+        self._version = 0
+        self._last = None   # (state, search, fav_only, result)
+
+    def __len__(self): return len(self.entries)
+    def __contains__(self, zip_name): return zip_name in self.entries
+    def get(self, zip_name): return self.entries.get(zip_name)
+
+    def touch(self):
+        """Call after mutating an entry in place so cached filter results are dropped."""
+        self._version += 1
+
+    def put(self, entry):
+        self.entries[entry.zip_name] = entry
+        self.touch()
+
+    def remove(self, zip_name):
+        if self.entries.pop(zip_name, None) is not None: self.touch()
+
+    def _state(self):
+        return (self._version, self.index.version if self.index is not None else 0)
+
+    @staticmethod
+    def _narrows(old, new):
+        """True when every match of query `new` also matches `old`: both are plain terms and
+        `new` only extends the last term of `old` or adds terms after it."""
+        if ":" in old or ":" in new or not new.startswith(old): return False
+        old_terms, new_terms = old.split(), new.split()
+        if not old_terms: return True
+        n = len(old_terms)
+        return len(new_terms) >= n and new_terms[:n - 1] == old_terms[:-1] and new_terms[n - 1].startswith(old_terms[-1])
+
+    def filter(self, search="", fav_only=False):
+        search = search.lower().strip()
+        last, state = self._last, self._state()
+        if last and last[0] == state and self._narrows(last[1], search) and (fav_only or not last[2]):
+            pool = last[3]
+        else:
+            pool = self.entries.values()
+        if search and self.index is not None:
+            matched = self.index.search(search)
+            result = [e for e in pool if (matched is None or e.name in matched) and (not fav_only or e.favorite)]
+        else:
+            result = [e for e in pool if (not search or search in e.search_key) and (not fav_only or e.favorite)]
+        self._last = (state, search, fav_only, result)
+        return result
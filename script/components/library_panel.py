@@ -2,6 +2,9 @@ import tkinter as tk
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
+from components.tree_updater import TreeUpdater
+from components.virtual_tree import VirtualTree
+
 class LibraryPanel(tb.Frame):
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
@@ -20,19 +23,25 @@ class LibraryPanel(tb.Frame):
         f_search.pack(fill=tk.X, pady=(0, 10), padx=10)
         tb.Label(f_search, text="🔍").pack(side=tk.LEFT, padx=5)
         tb.Entry(f_search, textvariable=self.app.search_var, bootstyle="dark").pack(side=tk.LEFT, fill=tk.X, expand=True)
-        tb.Checkbutton(f_search, text="★ Only", variable=self.app.fav_only_var, command=self.app.refresh_library, bootstyle="danger-round-toggle").pack(side=tk.LEFT, padx=10)
+        tb.Checkbutton(f_search, text="★ Only", variable=self.app.fav_only_var, command=self.app.apply_filter, bootstyle="danger-round-toggle").pack(side=tk.LEFT, padx=10)
         
         f_tree_container = tb.Frame(self)
         f_tree_container.grid(row=1, column=0, sticky="nsew")
 
-        all_cols_info = {"name": 220, "genre": 100, "year": 60, "company": 120, "rating": 90, "zip": 70, "hdd": 70}
+        all_cols_info = {"name": 220, "genre": 100, "year": 60, "company": 120, "rating": 90, "zip": 70, "hdd": 70, "played": 85, "time": 65, "recent": 65}
         hidden_cols = self.app.settings.get("hidden_columns") or []
         cols_to_show = [c for c in all_cols_info if c not in hidden_cols]
-        self.tree = tb.Treeview(f_tree_container, columns=cols_to_show, show="headings", selectmode="browse", bootstyle="dark")
+        if self.app.settings.get("virtual_list"):
+            # Pri veľkých knižniciach sa materializujú len riadky, ktoré sú práve vidieť
+            self.tree = VirtualTree(f_tree_container, columns=cols_to_show, show="headings", selectmode="extended", bootstyle="dark")
+            self.tree_updater = self.tree
+        else:
+            self.tree = tb.Treeview(f_tree_container, columns=cols_to_show, show="headings", selectmode="extended", bootstyle="dark")
+            self.tree_updater = TreeUpdater(self.tree)
         
         for col_name in cols_to_show:
             width = all_cols_info[col_name]
-            anchor = "center" if col_name in ["year", "rating", "zip", "hdd"] else "w"
+            anchor = "center" if col_name in ["year", "rating", "zip", "hdd", "played", "time", "recent"] else "w"
             stretch = (col_name == "name")
             self.tree.heading(col_name, text=col_name.title(), command=lambda c=col_name: self.app.sort_tree(c))
             self.tree.column(col_name, width=width, anchor=anchor, stretch=stretch)
@@ -51,8 +60,16 @@ class LibraryPanel(tb.Frame):
 
         f_bottom_controls = tb.Frame(self)
         f_bottom_controls.grid(row=2, column=0, sticky="ew", pady=(10,0))
+
+        # --- STAV INŠTALÁCIÍ NA POZADÍ (skrytý, kým nič nebeží) ---
+        self.f_jobs = tb.Frame(f_bottom_controls)
+        self.lbl_jobs = tb.Label(self.f_jobs, text="", bootstyle="info", anchor="w")
+        self.lbl_jobs.pack(side=tk.TOP, fill=tk.X, padx=5)
+        self.pb_jobs = tb.Progressbar(self.f_jobs, maximum=100, bootstyle="success-striped")
+        self.pb_jobs.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, pady=(2, 5))
+        tb.Button(self.f_jobs, text="✕ Cancel", command=self.app.cancel_installs, bootstyle="danger-outline").pack(side=tk.RIGHT, padx=5)
         
-        f_toggles = tb.Frame(f_bottom_controls)
+        f_toggles = self.f_toggles = tb.Frame(f_bottom_controls)
         f_toggles.pack(fill=tk.X, pady=(0, 5))
         tb.Checkbutton(f_toggles, text="Force Fullscreen", variable=self.app.force_fullscreen_var, bootstyle="info-round-toggle").pack(side=tk.LEFT, padx=5)
         tb.Checkbutton(f_toggles, text="Hide Console", variable=self.app.hide_console_var, bootstyle="info-round-toggle").pack(side=tk.LEFT, padx=5)
@@ -60,4 +77,10 @@ class LibraryPanel(tb.Frame):
         f_bot_buttons = tb.Frame(f_bottom_controls)
         f_bot_buttons.pack(fill=tk.X)
         tb.Button(f_bot_buttons, text="⚙ Settings", command=self.app.open_settings, bootstyle="secondary").pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
-        tb.Button(f_bot_buttons, text="↻ Refresh", command=self.app.refresh_library, bootstyle="secondary").pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
\ No newline at end of file
+        tb.Button(f_bot_buttons, text="↻ Refresh", command=self.app.rescan_library, bootstyle="secondary").pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
+        self.btn_sessions = tb.Button(f_bot_buttons, text="▣ Running (0)", command=self.app.open_sessions, bootstyle="secondary")
+        self.btn_sessions.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
+
+    def show_jobs(self, visible):
+        if visible and not self.f_jobs.winfo_manager(): self.f_jobs.pack(fill=tk.X, pady=(0, 5), before=self.f_toggles)
+        elif not visible: self.f_jobs.pack_forget()
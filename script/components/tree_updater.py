@@ -0,0 +1,87 @@
+from bisect import bisect_left
+
+def _longest_increasing(seq):
+    """Indices of one longest strictly increasing subsequence of `seq`."""
+    tails, tails_idx, prev = [], [], [-1] * len(seq)
+    for i, v in enumerate(seq):
+        pos = bisect_left(tails, v)
+        if pos == len(tails): tails.append(v); tails_idx.append(i)
+        else: tails[pos] = v; tails_idx[pos] = i
+        prev[i] = tails_idx[pos - 1] if pos else -1
+    out, i = [], tails_idx[-1] if tails_idx else -1
+    while i != -1: out.append(i); i = prev[i]
+    return out[::-1]
+
+class TreeUpdater:
+    """Keeps a flat ttk.Treeview in sync with an ordered list of rows keyed by iid.
+
+    Rows are never deleted and re-inserted: filtered-out rows are detached, rows that come
+    back are re-attached, changed rows get a single item() call and reordering uses the
+    fewest move() calls (everything on a longest increasing subsequence stays put).
+    Selection and scroll position survive because the items themselves survive.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._rows = {}     # iid -> (values, tags) práve nastavené v strome
+        self._order = []    # pripojené iid v poradí zobrazenia
+        self._attached = set()
+
+    def is_visible(self, iid): return iid in self._attached
+    def visible_ids(self): return list(self._order)
+
+    def update(self, rows):
+        """rows: ordered list of (iid, values, tags). Returns the set of iids whose content changed."""
+        tree = self.tree
+        target = [r[0] for r in rows]
+        target_set = set(target)
+
+        for iid in self._order:
+            if iid not in target_set: tree.detach(iid)
+        current = [iid for iid in self._order if iid in target_set]
+
+        changed = set()
+        for iid, values, tags in rows:
+            values, tags = tuple(values), tuple(tags)
+            old = self._rows.get(iid)
+            if old is None:
+                tree.insert("", "end", iid=iid, values=values, tags=tags)
+                current.append(iid)
+            elif old != (values, tags):
+                tree.item(iid, values=values, tags=tags)
+                changed.add(iid)
+            self._rows[iid] = (values, tags)
+
+        # Riadky mimo LIS (a znovu pripájané riadky) presunieme hneď za ich cieľového predchodcu
+        pos = {iid: i for i, iid in enumerate(current)}
+        attached = [iid for iid in target if iid in pos]
+        keep = {attached[i] for i in _longest_increasing([pos[iid] for iid in attached])}
+        if len(target) - len(keep) > len(target) // 2:
+            # Takmer úplné preusporiadanie (napr. zoradenie podľa iného stĺpca): postupne od začiatku
+            for i, iid in enumerate(target): tree.move(iid, "", i)
+        else:
+            for i, iid in enumerate(target):
+                if iid in keep: continue
+                index = tree.index(target[i - 1]) + 1 if i else 0
+                # Index pri move() nepočíta presúvaný riadok; ak stojí pred predchodcom, cieľ je o jedno nižšie
+                if i and iid in pos and tree.index(iid) < index: index -= 1
+                tree.move(iid, "", index)
+
+        self._order, self._attached = target, target_set
+        return changed
+
+    def set_row(self, iid, values, tags):
+        """Updates one row in place (e.g. a background result) without a full update pass."""
+        if iid not in self._rows: return
+        values, tags = tuple(values), tuple(tags)
+        if self._rows[iid] != (values, tags):
+            self.tree.item(iid, values=values, tags=tags)
+            self._rows[iid] = (values, tags)
+
+    def prune(self, valid_ids):
+        """Deletes items whose game no longer exists at all (not just filtered out)."""
+        for iid in [i for i in self._rows if i not in valid_ids]:
+            if self.tree.exists(iid): self.tree.delete(iid)
+            del self._rows[iid]
+            if iid in self._attached:
+                self._attached.discard(iid); self._order.remove(iid)
@@ -0,0 +1,242 @@
+import tkinter as tk
+from tkinter import ttk
+import ttkbootstrap as tb
+
+from components.tree_updater import TreeUpdater
+
+class VirtualTree:
+    """Treeview stand-in that only materializes the rows currently scrolled into view.
+
+    The full ordered row model (iid -> values, tags) lives in Python; the wrapped ttk
+    Treeview holds just one window of it, so Tk memory and insertion cost stay constant no
+    matter how large the library is. It offers the Treeview calls the app uses (selection,
+    see, item, get_children, identify_row, heading, ...) with the same iids, and the
+    TreeUpdater calls (update, set_row, prune, is_visible), so it can replace both.
+    Everything else is delegated to the wrapped Treeview.
+
+    Selection lives in the model too, so with selectmode="extended" Ctrl/Shift clicks and
+    Shift+arrows select rows that are not materialized, like in a plain Treeview.
+    """
+
+    def __init__(self, master, selectmode="extended", **kwargs):
+        self._tree = tb.Treeview(master, selectmode=selectmode, **kwargs)
+        self._window = TreeUpdater(self._tree)
+        self._rows, self._order, self._pos = {}, [], {}
+        self._offset, self._page = 0, 20
+        self._extended = selectmode == "extended"
+        self._selected = set()
+        self._anchor = self._cursor = None     # začiatok rozsahu pre Shift, riadok s kurzorom
+        self._select_callbacks = []
+        self._yscrollcommand = None
+
+        self._tree.bind("<<TreeviewSelect>>", self._on_inner_select)
+        self._tree.bind("<Configure>", self._on_resize)
+        self._tree.bind("<Button-1>", lambda e: self._on_click(e, "single"))
+        self._tree.bind("<Control-Button-1>", lambda e: self._on_click(e, "toggle"))
+        self._tree.bind("<Shift-Button-1>", lambda e: self._on_click(e, "range"))
+        for seq, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"), ("<Home>", "home"), ("<End>", "end")):
+            self._tree.bind(seq, lambda e, s=step: self._on_key(s))
+            self._tree.bind(seq.replace("<", "<Shift-"), lambda e, s=step: self._on_key(s, extend=True))
+        self._tree.bind("<Control-a>", lambda e: self._select_all())
+        self._tree.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1, 3))
+        self._tree.bind("<Button-4>", lambda e: self._scroll(-1, 3))
+        self._tree.bind("<Button-5>", lambda e: self._scroll(1, 3))
+
+    def __getattr__(self, name):
+        if name == "_tree": raise AttributeError(name)
+        return getattr(self._tree, name)
+
+    def __getitem__(self, key):
+        return self._tree[key]
+
+    # --- Treeview API used by the app ---
+
+    def configure(self, cnf=None, **kw):
+        if "yscrollcommand" in kw: self._yscrollcommand = kw.pop("yscrollcommand")
+        if kw or cnf: return self._tree.configure(cnf, **kw)
+    config = configure
+
+    def bind(self, sequence=None, func=None, add=None):
+        if sequence == "<<TreeviewSelect>>":
+            self._select_callbacks.append(func)
+            return None
+        return self._tree.bind(sequence, func, add)
+
+    def selection(self):
+        """Selected iids in display order."""
+        return tuple(sorted(self._selected, key=self._pos.__getitem__))
+
+    @staticmethod
+    def _flatten(items):
+        out = []
+        for it in items: out.extend(it if isinstance(it, (list, tuple)) else [it])
+        return [iid for iid in out if iid is not None]
+
+    def _set_selected(self, selected):
+        selected = {iid for iid in selected if iid in self._pos}
+        if not self._extended and len(selected) > 1: selected = {min(selected, key=self._pos.__getitem__)}
+        if selected == self._selected: return
+        self._selected = selected
+        self._sync_selection()
+        self._tree.after_idle(self._fire_select)
+
+    def selection_set(self, *items):
+        items = [iid for iid in self._flatten(items) if iid in self._pos]
+        if items: self._anchor = self._cursor = items[0]
+        self._set_selected(items)
+
+    def selection_add(self, *items): self._set_selected(self._selected | set(self._flatten(items)))
+
+    def selection_remove(self, *items):
+        """Deselects `items`, or everything when called without items."""
+        self._set_selected(self._selected - set(self._flatten(items)) if items else ())
+
+    def see(self, iid):
+        i = self._pos.get(iid)
+        if i is None: return
+        if i < self._offset: self._offset = i
+        elif i >= self._offset + self._page: self._offset = i - self._page + 1
+        else: return
+        self._render()
+
+    def exists(self, iid): return iid in self._rows
+    def prev(self, iid):
+        i = self._pos.get(iid)
+        return self._order[i - 1] if i else ""
+    def next(self, iid):
+        i = self._pos.get(iid)
+        return self._order[i + 1] if i is not None and i + 1 < len(self._order) else ""
+    def index(self, iid):
+        if iid not in self._pos: raise tk.TclError(f"Item {iid} not found")
+        return self._pos[iid]
+    def get_children(self, item=""): return tuple(self._order)
+
+    def item(self, iid, option=None, **kw):
+        # Ako Treeview: neznáma položka je TclError, volajúci ho tak ošetrujú
+        if iid not in self._rows: raise tk.TclError(f"Item {iid} not found")
+        values, tags = self._rows[iid]
+        if kw:
+            self.set_row(iid, kw.get("values", values), kw.get("tags", tags))
+            return None
+        data = {"values": list(values), "tags": list(tags)}
+        return data[option] if option else data
+
+    def yview(self, *args):
+        n = len(self._order)
+        if not args: return self._fractions()
+        if args[0] == "moveto":
+            self._offset = int(float(args[1]) * n)
+        elif args[0] == "scroll":
+            self._offset += int(args[1]) * (self._page if args[2] == "pages" else 1)
+        self._render()
+
+    # --- TreeUpdater API ---
+
+    def update(self, rows):
+        changed = set()
+        new_rows = {}
+        for iid, values, tags in rows:
+            entry = (tuple(values), tuple(tags))
+            if iid in self._rows and self._rows[iid] != entry: changed.add(iid)
+            new_rows[iid] = entry
+        self._rows = new_rows
+        self._order = [r[0] for r in rows]
+        self._pos = {iid: i for i, iid in enumerate(self._order)}
+        self._selected = {iid for iid in self._selected if iid in self._pos}
+        self._render()
+        return changed
+
+    def set_row(self, iid, values, tags):
+        if iid not in self._rows: return
+        self._rows[iid] = (tuple(values), tuple(tags))
+        self._window.set_row(iid, values, tags)
+
+    def prune(self, valid_ids):
+        pass   # riadky mimo modelu sa nikdy nematerializujú, okno si čistí render()
+
+    def is_visible(self, iid): return iid in self._pos
+
+    # --- internal ---
+
+    def _render(self):
+        n = len(self._order)
+        self._offset = max(0, min(self._offset, n - self._page))
+        window = self._order[self._offset:self._offset + self._page + 1]
+        self._window.update([(iid, *self._rows[iid]) for iid in window])
+        self._window.prune(set(window))
+        self._sync_selection()
+        if self._yscrollcommand: self._yscrollcommand(*self._fractions())
+
+    def _fractions(self):
+        n = len(self._order)
+        if not n: return (0.0, 1.0)
+        return (self._offset / n, min(1.0, (self._offset + self._page) / n))
+
+    def _visible_selection(self):
+        return {iid for iid in self._selected if self._window.is_visible(iid)}
+
+    def _sync_selection(self):
+        wanted = self._visible_selection()
+        if set(self._tree.selection()) != wanted:
+            if wanted: self._tree.selection_set(*wanted)
+            else: self._tree.selection_remove(*self._tree.selection())
+
+    def _fire_select(self):
+        for cb in self._select_callbacks: cb(None)
+
+    def _on_inner_select(self, event):
+        # Zmeny z _sync_selection sa ignorujú; iné zmeny vo viditeľnom okne sa prevezmú do modelu
+        current = set(self._tree.selection())
+        visible = self._visible_selection()
+        if current == visible: return
+        self._selected = (self._selected - visible) | current
+        self._fire_select()
+
+    def _on_click(self, event, mode):
+        iid = self._tree.identify_row(event.y)
+        if not iid: return None     # hlavička, oddeľovač stĺpcov: predvolené správanie
+        self._tree.focus_set()
+        if mode == "toggle" and self._extended:
+            self._set_selected(self._selected ^ {iid}); self._anchor = self._cursor = iid
+        elif mode == "range" and self._extended and self._anchor in self._pos:
+            self._cursor = iid; self._select_range(self._anchor, iid)
+        else:
+            self.selection_set(iid)
+        return "break"
+
+    def _select_range(self, a, b):
+        lo, hi = sorted((self._pos[a], self._pos[b]))
+        self._set_selected(self._order[lo:hi + 1])
+
+    def _select_all(self):
+        if self._extended and self._order: self._set_selected(self._order)
+        return "break"
+
+    def _on_resize(self, event):
+        style = ttk.Style(self._tree)
+        try: row_h = int(style.lookup(self._tree.cget("style") or "Treeview", "rowheight") or 20)
+        except (tk.TclError, ValueError): row_h = 20
+        page = max(1, (event.height - row_h) // row_h)
+        if page != self._page:
+            self._page = page
+            self._render()
+
+    def _scroll(self, direction, units):
+        self.yview("scroll", direction * units, "units")
+        return "break"
+
+    def _on_key(self, step, extend=False):
+        if not self._order: return "break"
+        i = self._pos.get(self._cursor, -1)
+        if step == "home": i = 0
+        elif step == "end": i = len(self._order) - 1
+        elif step == "page": i += self._page
+        elif step == "-page": i -= self._page
+        else: i += step
+        i = max(0, min(i, len(self._order) - 1))
+        iid = self._order[i]
+        if extend and self._extended and self._anchor in self._pos:
+            self._cursor = iid; self._select_range(self._anchor, iid)
+        else: self.selection_set(iid)
+        self.see(iid)
+        return "break"
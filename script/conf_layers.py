@@ -0,0 +1,104 @@
+import os
+import hashlib
+import threading
+
+from dosbox_conf import DosboxConf, load_cached
+
+def _conf_from_dict(sections):
+    conf = DosboxConf()
+    for section, values in sections.items():
+        for k, v in values.items(): conf.set(section, k, v)
+    return conf
+
+class ConfLayers:
+    """Layered DOSBox configuration passed to DOSBox as successive -conf files, later ones winning:
+    the launcher defaults, the global template conf, a named profile and the game's own
+    dosbox.conf, which only holds what the game overrides.
+
+    Profiles are plain .conf files in `profiles_dir` (the built-in ones are written there the
+    first time). No layer is copied into the games, so editing a profile or the template
+    applies to every game at its next launch. DOSBox runs the [autoexec] of every -conf, so a
+    template or profile that has one is passed as a cached copy without it.
+    """
+    MAX_RESOLVED = 256
+
+    def __init__(self, cache_dir, profiles_dir, defaults, builtin_profiles=None):
+        self.cache_dir = cache_dir
+        self.profiles_dir = profiles_dir
+        self._defaults = defaults
+        self._builtin = builtin_profiles or {}
+        self._lock = threading.Lock()
+        self._base = None
+        self._stripped = {}     # path -> (signature, path to pass)
+        self._resolved = {}     # ((path, signature), ...) -> DosboxConf
+
+    def write_cached(self, conf, prefix):
+        """Writes `conf` to a content-addressed file in the cache dir (once) and returns its path."""
+        text = conf.serialize()
+        path = os.path.join(self.cache_dir, f"{prefix}-{hashlib.sha1(text.encode()).hexdigest()[:16]}.conf")
+        if not os.path.exists(path):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'w') as f: f.write(text)
+            os.replace(tmp, path)
+        return path
+
+    def base_path(self):
+        with self._lock:
+            if self._base is None or not os.path.exists(self._base):
+                self._base = self.write_cached(_conf_from_dict(self._defaults), "base")
+            return self._base
+
+    def profiles(self):
+        """Names of the available profiles, sorted."""
+        if not os.path.isdir(self.profiles_dir):
+            os.makedirs(self.profiles_dir, exist_ok=True)
+            for name, sections in self._builtin.items():
+                with open(self.profile_path(name), 'w') as f: f.write(_conf_from_dict(sections).serialize())
+        return sorted(f[:-5] for f in os.listdir(self.profiles_dir) if f.lower().endswith(".conf"))
+
+    def profile_path(self, name): return os.path.join(self.profiles_dir, name + ".conf")
+
+    @staticmethod
+    def _signature(path):
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except OSError: return None
+
+    def settings_only(self, path):
+        """`path` itself, or a cached copy without [autoexec] when it has one."""
+        sig = self._signature(path)
+        with self._lock:
+            hit = self._stripped.get(path)
+            if hit and hit[0] == sig: return hit[1]
+        conf = load_cached(path)
+        out = path
+        if conf.has_autoexec():
+            conf = conf.copy()
+            conf.set_autoexec([])
+            out = self.write_cached(conf, "layer")
+        with self._lock: self._stripped[path] = (sig, out)
+        return out
+
+    def layers(self, global_conf=None, profile=None):
+        """Conf files below the game's own dosbox.conf, lowest first."""
+        out = [self.base_path()]
+        if global_conf and os.path.isfile(global_conf): out.append(self.settings_only(global_conf))
+        if profile and os.path.isfile(self.profile_path(profile)): out.append(self.settings_only(self.profile_path(profile)))
+        return out
+
+    def resolve(self, paths):
+        """Settings of `paths` merged in order (later wins), as a shared DosboxConf. Cached until
+        one of the files changes; use .copy() before modifying it."""
+        key = tuple((p, self._signature(p)) for p in paths)
+        with self._lock:
+            hit = self._resolved.get(key)
+        if hit is not None: return hit
+        merged = DosboxConf()
+        for p in paths:
+            for section, k, v in load_cached(p).items(): merged.set(section, k, v)
+        with self._lock:
+            if len(self._resolved) >= self.MAX_RESOLVED: self._resolved.clear()
+            self._resolved[key] = merged
+        return merged
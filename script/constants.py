@@ -44,4 +44,39 @@ GUS_BOOL = ["false", "true"]
 SPEAKER_TYPES = ["auto", "fast", "on", "off", "impulse"]
 TANDY_TYPES = ["auto", "on", "off"]
 LPT_DAC_TYPES = ["none", "disney", "stereo"]
-MIDI_DEVICES = ["auto", "default", "alsa", "oss", "win32", "coremidi", "none"]
\ No newline at end of file
+MIDI_DEVICES = ["auto", "default", "alsa", "oss", "win32", "coremidi", "none"]
+
+# Prípony, podľa ktorých sa hľadajú uložené pozície (plus súbory začínajúce na "save")
+SAVE_EXTENSIONS = ('.sav', '.gam', '.dat', '.cfg', '.hi', '.scr', '.srm')
+
+# Stĺpec "Recent" v knižnici: čas hrania za posledných N dní
+RECENT_PLAY_DAYS = 14
+
+# Súbory a priečinky, ktoré po hre nie sú uložené pozície (zapisuje ich DOSBox alebo launcher)
+SESSION_IGNORE = {"dosbox.conf", "dosbox.conf.bak", "stdout.txt", "stderr.txt", "capture"}
+
+# Predvolené nastavenia launchera: najnižšia vrstva konfigurácie každej hry
+DEFAULT_GAME_CONFIG = {
+    'sdl': {'output': 'opengl', 'fullscreen': 'false', 'windowresolution': 'default', 'fullresolution': 'desktop'},
+    'render': {'glshader': 'none', 'integer_scaling': 'false'},
+    'cpu': {'core': 'auto', 'cputype': 'auto', 'cycles': '3000', 'cycles_protected': '60000'},
+    'dosbox': {'memsize': '16'},
+    'dos': {'xms': 'true', 'ems': 'true', 'umb': 'true'},
+    'sblaster': {'sbtype': 'sb16', 'sbbase': '220', 'irq': '7', 'dma': '1', 'hdma': '5', 'oplmode': 'auto'},
+    'gus': {'gus': 'false'},
+    'speaker': {'pcspeaker': 'impulse', 'tandy': 'auto', 'lpt_dac': 'none'},
+    'midi': {'mididevice': 'auto', 'mpu401': 'intelligent'},
+    'mixer': {'rate': '48000', 'blocksize': '1024', 'prebuffer': '25'}
+}
+
+# Vstavané profily (vrstva medzi globálnou šablónou a nastaveniami hry)
+CONFIG_PROFILES = {
+    "386 real-mode": {
+        'cpu': {'core': 'normal', 'cputype': '386', 'cycles': '6000'},
+        'dosbox': {'memsize': '8'},
+    },
+    "Pentium DOS4GW": {
+        'cpu': {'core': 'dynamic', 'cputype': 'pentium_slow', 'cycles': 'max'},
+        'dosbox': {'memsize': '32'},
+    },
+}
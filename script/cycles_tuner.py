@@ -0,0 +1,43 @@
+import statistics
+
+SATURATED_CPU = 90.0    # vzorka nad touto hodnotou (% jedného jadra) = DOSBox nestíha
+MIN_CYCLES = 1000
+CYCLES_STEP = 500
+MIN_CHANGE = 0.05       # menšie zmeny sa neodporúčajú
+
+def parse_cycles(value):
+    """('fixed', cycles), ('max', percent) or ('auto', None) for a DOSBox cycles setting."""
+    tokens = str(value or "").lower().replace("%", " %").split()
+    if not tokens or tokens[0] == "auto": return "auto", None
+    if tokens[0] == "fixed": tokens = tokens[1:]
+    if tokens and tokens[0].isdigit(): return "fixed", int(tokens[0])
+    if tokens and tokens[0] == "max":
+        return "max", int(tokens[1]) if len(tokens) > 2 and tokens[1].isdigit() and tokens[2] == "%" else 100
+    return "auto", None
+
+def percentile(values, q):
+    if not values: return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def recommend_cycles(cycles, loads, target):
+    """Cycles value that should keep the DOSBox process under `target` % of one core, given
+    the p90 CPU `loads` of recent sessions that ran with `cycles`; None when it already does
+    or can't be told.
+
+    Emulation cost is roughly proportional to fixed cycles, so those are scaled down by
+    target/load (rounded to CYCLES_STEP). `max` lets DOSBox take what it can get and is
+    capped with its own `max N%` limit instead. `auto` is left alone.
+    """
+    if not loads: return None
+    load = statistics.median(loads)
+    if load <= target: return None
+    kind, amount = parse_cycles(cycles)
+    if kind == "fixed":
+        new = max(MIN_CYCLES, int(amount * target / load) // CYCLES_STEP * CYCLES_STEP)
+        return str(new) if new < amount * (1 - MIN_CHANGE) else None
+    if kind == "max":
+        # Limit nad cieľom sa zníži na cieľ; ak už je pod ním, zmenší sa úmerne nameranej záťaži
+        new = max(10, int(target if amount > target else amount * target / load))
+        return f"max {new}%" if new < amount * (1 - MIN_CHANGE) else None
+    return None
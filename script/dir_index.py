@@ -0,0 +1,46 @@
+import os
+
+class DirIndex:
+    """Cached listing of the files matching `match(name)` below a folder.
+
+    For every directory it remembers (mtime_ns, matching files, subdirectories). A refresh only
+    stats directories; one is listed again only when its mtime changed, i.e. when an entry
+    was created, deleted or renamed in it. `skip_dir(name)` prunes subdirectories. The state
+    is a plain dict (`dirs`) so callers can persist it as JSON.
+    """
+
+    def __init__(self, match, dirs=None, skip_dir=None):
+        self.match = match
+        self.skip_dir = skip_dir
+        self.dirs = {d: (v[0], list(v[1]), list(v[2])) for d, v in (dirs or {}).items()}
+
+    def refresh(self, folder):
+        """Returns (relative paths of matching files, whether the cached state changed)."""
+        dirs, out, dirty = {}, [], False
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            full = os.path.join(folder, rel) if rel else folder
+            try: mtime = os.stat(full).st_mtime_ns
+            except OSError: dirty = True; continue
+            cached = self.dirs.get(rel)
+            if cached and cached[0] == mtime:
+                files, subdirs = cached[1], cached[2]
+            else:
+                files, subdirs, dirty = [], [], True
+                try:
+                    with os.scandir(full) as it:
+                        for e in it:
+                            if e.is_dir(follow_symlinks=False):
+                                if not (self.skip_dir and self.skip_dir(e.name)): subdirs.append(e.name)
+                            elif self.match(e.name): files.append(e.name)
+                except OSError: continue
+            dirs[rel] = (mtime, files, subdirs)
+            out.extend(os.path.join(rel, f) if rel else f for f in files)
+            stack.extend(os.path.join(rel, d) if rel else d for d in subdirs)
+        if dirty or dirs.keys() != self.dirs.keys():
+            self.dirs, dirty = dirs, True
+        return out, dirty
+
+    def to_json(self):
+        return {d: list(v) for d, v in self.dirs.items()}
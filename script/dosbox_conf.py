@@ -0,0 +1,139 @@
+import os
+import threading
+
+COMMENT_PREFIXES = ("#", ";", "%")
+
+class DosboxConf:
+    """Ordered, round-trippable model of a dosbox.conf.
+
+    Every line is kept: comments, blank lines, keys this launcher knows nothing about and the
+    raw [autoexec] body. `set` edits a key in place (or appends it to its section), so
+    serializing a parsed file without changes gives back the same text.
+    """
+
+    def __init__(self):
+        self.preamble = []      # riadky pred prvou sekciou
+        self.sections = []      # [(name, header_line, [lines])]
+
+    @classmethod
+    def parse(cls, text):
+        conf = cls()
+        lines = conf.preamble
+        for raw in text.splitlines():
+            line = raw.strip()
+            if line.startswith("[") and line.endswith("]"):
+                lines = []
+                conf.sections.append((line[1:-1].strip().lower(), raw, lines))
+            else:
+                lines.append(raw)
+        return conf
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', errors='replace') as f: return cls.parse(f.read())
+
+    def copy(self):
+        conf = DosboxConf()
+        conf.preamble = list(self.preamble)
+        conf.sections = [(name, header, list(lines)) for name, header, lines in self.sections]
+        return conf
+
+    def _section(self, name):
+        name = name.lower()
+        for s in self.sections:
+            if s[0] == name: return s[2]
+        return None
+
+    @staticmethod
+    def _key_of(raw):
+        line = raw.strip()
+        if not line or line.startswith(COMMENT_PREFIXES) or "=" not in line: return None
+        return line.split("=", 1)[0].strip().lower()
+
+    def get(self, section, key, default=""):
+        lines = self._section(section)
+        if lines is None or section.lower() == "autoexec": return default
+        key = key.lower()
+        for raw in lines:
+            if self._key_of(raw) == key: return raw.split("=", 1)[1].strip()
+        return default
+
+    def set(self, section, key, value):
+        lines = self._section(section)
+        if lines is None: lines = self.add_section(section)
+        new_line = f"{key}={value}"
+        for i, raw in enumerate(lines):
+            if self._key_of(raw) == key.lower():
+                lines[i] = new_line; return
+        # Nový kľúč ide za posledný neprázdny riadok sekcie
+        end = len(lines)
+        while end and not lines[end - 1].strip(): end -= 1
+        lines.insert(end, new_line)
+
+    def remove(self, section, key):
+        lines = self._section(section)
+        if lines is None: return
+        lines[:] = [raw for raw in lines if self._key_of(raw) != key.lower()]
+
+    def items(self):
+        """(section, key, value) of every setting outside [autoexec], in file order."""
+        for name, _, lines in self.sections:
+            if name == "autoexec": continue
+            for raw in lines:
+                key = self._key_of(raw)
+                if key is not None: yield name, raw.split("=", 1)[0].strip(), raw.split("=", 1)[1].strip()
+
+    def add_section(self, name):
+        """Appends an empty section, keeping [autoexec] last."""
+        lines = [""]
+        entry = (name.lower(), f"[{name.lower()}]", lines)
+        at = next((i for i, s in enumerate(self.sections) if s[0] == "autoexec"), len(self.sections))
+        if at and self.sections[at - 1][2] and self.sections[at - 1][2][-1].strip():
+            self.sections[at - 1][2].append("")
+        self.sections.insert(at, entry)
+        return lines
+
+    def autoexec(self):
+        lines = self._section("autoexec")
+        return list(lines) if lines is not None else []
+
+    def set_autoexec(self, lines):
+        current = self._section("autoexec")
+        if current is None: current = self.add_section("autoexec")
+        current[:] = list(lines)
+
+    def has_autoexec(self):
+        return any(l.strip() and not l.strip().startswith(COMMENT_PREFIXES) for l in self.autoexec())
+
+    def serialize(self):
+        out = list(self.preamble)
+        for _, header, lines in self.sections:
+            out.append(header)
+            out.extend(lines)
+        return "\n".join(out)
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, 'w') as f: f.write(self.serialize())
+        os.replace(tmp, path)
+        _cache.pop(path, None)
+
+_cache = {}     # path -> ((mtime_ns, size), DosboxConf)
+_lock = threading.Lock()
+
+def load_cached(path):
+    """Parsed conf for `path`, re-read only when its mtime or size changed. The returned model
+    is shared: use .copy() before modifying it. Missing or unreadable files give an empty model."""
+    try:
+        st = os.stat(path)
+        sig = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        with _lock: _cache.pop(path, None)
+        return DosboxConf()
+    with _lock:
+        hit = _cache.get(path)
+        if hit and hit[0] == sig: return hit[1]
+    try: conf = DosboxConf.load(path)
+    except OSError: return DosboxConf()
+    with _lock: _cache[path] = (sig, conf)
+    return conf
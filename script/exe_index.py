@@ -0,0 +1,163 @@
+import os
+import re
+import json
+import struct
+import time
+import threading
+
+from dir_index import DirIndex
+
+EXE_EXTS = ('.exe', '.com', '.bat')
+
+EXE_DOS = "dos"             # real-mode MZ alebo .com
+EXE_EXTENDED = "extended"   # LE/LX (DOS/4GW a spol.)
+EXE_WINDOWS = "windows"     # NE/PE
+EXE_SETUP = "setup"
+EXE_RUNTIME = "runtime"     # samotný DOS extender, nie hra
+EXE_BATCH = "batch"
+
+EXE_KIND_LABELS = {
+    EXE_DOS: "DOS", EXE_EXTENDED: "DOS/4GW", EXE_WINDOWS: "Windows",
+    EXE_SETUP: "Setup", EXE_RUNTIME: "Extender", EXE_BATCH: "Batch",
+}
+
+SETUP_HINTS = ('setup', 'install', 'config', 'setsound', 'sound', 'uninst')
+# Samostatné DOS extendery pribalené k hre
+RUNTIME_EXTENDERS = {
+    'dos4gw.exe': "DOS/4GW", 'dos4g.exe': "DOS/4GW", 'dos32a.exe': "DOS/32A", 'dos32.exe': "DOS/32A",
+    'pmodew.exe': "PMODE/W", 'cwsdpmi.exe': "CWSDPMI", 'rtm.exe': "Borland RTM", '32rtm.exe': "Borland RTM",
+}
+# Reťazce, ktoré nechávajú extendery vo svojom stube na začiatku zviazaného .exe
+EXTENDER_SIGNATURES = (
+    (b"DOS/4G", "DOS/4GW"), (b"PMODE/W", "PMODE/W"), (b"DOS/32A", "DOS/32A"),
+    (b"CWSDPMI", "CWSDPMI"), (b"go32stub", "CWSDPMI"), (b"Phar Lap", "Phar Lap"),
+)
+EXTENDER_SCAN_BYTES = 64 * 1024
+# Ako dlho (s) platí výsledok prechodu priečinka; jedno otvorenie editačného okna volá index viackrát
+REFRESH_TTL = 2.0
+
+def read_new_header(path):
+    """Signature of the 'new' executable header an MZ file points to (b'PE', b'NE', b'LE',
+    b'LX', ...), b'' for a plain DOS MZ and None when the file is not MZ at all."""
+    with open(path, 'rb') as f:
+        head = f.read(64)
+        if len(head) < 2 or head[:2] not in (b'MZ', b'ZM'): return None
+        if len(head) < 64: return b''
+        reloc_offset = struct.unpack_from('<H', head, 0x18)[0]
+        new_offset = struct.unpack_from('<I', head, 0x3C)[0]
+        # Pri reálnom DOS MZ je na 0x3C ľubovoľný obsah; nová hlavička má tabuľku relokácií na >= 0x40
+        if reloc_offset < 0x40 or new_offset < 0x40: return b''
+        f.seek(new_offset)
+        sig = f.read(4)
+    if sig == b'PE\0\0': return b'PE'
+    if sig[:2] in (b'NE', b'LE', b'LX', b'PL'): return sig[:2]
+    return b''
+
+def find_embedded_extender(path):
+    """Name of a DOS extender whose stub is bound into the executable, from the first
+    EXTENDER_SCAN_BYTES only, or None."""
+    with open(path, 'rb') as f: head = f.read(EXTENDER_SCAN_BYTES)
+    for marker, name in EXTENDER_SIGNATURES:
+        if marker in head: return name
+    return None
+
+def classify_exe(path):
+    """(EXE_* kind, extender name or None) from the file name, its MZ/NE/LE/LX/PE headers
+    and the extender stub bound into it."""
+    name = os.path.basename(path).lower()
+    if name.endswith('.bat'): return EXE_BATCH, None
+    if name in RUNTIME_EXTENDERS: return EXE_RUNTIME, RUNTIME_EXTENDERS[name]
+    try: sig = read_new_header(path)
+    except OSError: sig = None
+    if sig in (b'PE', b'NE'): return EXE_WINDOWS, None
+    extender = None
+    if sig is not None:
+        try: extender = find_embedded_extender(path)
+        except OSError: pass
+        if not extender and sig in (b'LE', b'LX'): extender = "LE/LX"
+        if not extender and sig == b'PL': extender = "Phar Lap"
+    if any(h in os.path.splitext(name)[0] for h in SETUP_HINTS): return EXE_SETUP, extender
+    return (EXE_EXTENDED if extender else EXE_DOS), extender
+
+class ExeIndex:
+    """Per-game index of executables with their EXE_* kind, cached in the library db.
+
+    The folder walk is a DirIndex (directories are only re-listed when their mtime changes)
+    and a file's headers are only read again when its size or mtime changes. The game's
+    DOS extender (protected mode) is derived from the same entries and stored with them, so
+    it is only recomputed when an executable was added, removed or changed.
+
+    A result is reused for REFRESH_TTL seconds while the folder's own mtime is unchanged, so
+    the several lookups one dialog makes (list, suggestion, extender) share a single walk.
+    """
+    CACHE_KEY = "exes"
+
+    def __init__(self, db):
+        self._db = db
+        self._lock = threading.Lock()
+        self._recent = {}   # (game_name, folder) -> (mtime_ns priečinka, čas, data)
+
+    def _refresh(self, game_name, folder):
+        key = (game_name, folder)
+        try: mtime = os.stat(folder).st_mtime_ns
+        except OSError: mtime = None
+        with self._lock:
+            recent = self._recent.get(key)
+            if recent and recent[0] == mtime and time.monotonic() - recent[1] < REFRESH_TTL: return recent[2]
+            try: data = json.loads(self._db.get_cache(game_name, self.CACHE_KEY) or "{}")
+            except ValueError: data = {}
+            if data.get("folder") != folder: data = {}
+            dirs = DirIndex(lambda n: n.lower().endswith(EXE_EXTS), data.get("dirs"), skip_dir=lambda n: "dosbox" in n.lower())
+            rels, dirty = dirs.refresh(folder)
+            old, exes = data.get("exes", {}), {}
+            for rel in rels:
+                try: st = os.stat(os.path.join(folder, rel))
+                except OSError: continue
+                cached = old.get(rel)
+                if cached and len(cached) == 4 and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                    exes[rel] = cached
+                else:
+                    exes[rel] = [st.st_size, st.st_mtime_ns, *classify_exe(os.path.join(folder, rel))]
+            if dirty or exes != old or "extender" not in data:
+                data = {"folder": folder, "dirs": dirs.to_json(), "exes": exes, "extender": self._game_extender(exes)}
+                self._db.set_cache(game_name, self.CACHE_KEY, json.dumps(data))
+            self._recent[key] = (mtime, time.monotonic(), data)
+        return data
+
+    @staticmethod
+    def _game_extender(exes):
+        """[extender, relative path] for the game, or [None, None] when it runs in real mode."""
+        found = sorted((rel for rel, e in exes.items() if e[3]), key=lambda rel: (exes[rel][2] != EXE_EXTENDED, rel.count(os.sep), rel))
+        if not found: return [None, None]
+        return [exes[found[0]][3], found[0]]
+
+    def scan(self, game_name, folder):
+        """{relative path: kind} of every .exe/.com/.bat in `folder`, outside bundled DOSBox dirs."""
+        exes = self._refresh(game_name, folder)["exes"]
+        return {rel: exes[rel][2] for rel in sorted(exes)}
+
+    def extender(self, game_name, folder):
+        """(extender name, relative path of the file it was found in), or (None, None)."""
+        return tuple(self._refresh(game_name, folder)["extender"])
+
+    @staticmethod
+    def suggest_main(game_name, exes):
+        """Best guess for the main executable, or None when it is ambiguous.
+
+        The only DOS program that is not a setup tool or an extender wins; among several,
+        the one whose name matches the game name does.
+        """
+        playable = [rel for rel, kind in exes.items() if kind in (EXE_DOS, EXE_EXTENDED)]
+        if len(playable) == 1: return playable[0]
+        if not playable: return next(iter(exes)) if len(exes) == 1 else None
+        compact = re.sub(r'[^a-z0-9]', '', game_name.lower())
+        words = set(re.findall(r'[a-z0-9]+', game_name.lower()))
+        matches = []
+        for rel in playable:
+            stem = os.path.splitext(os.path.basename(rel))[0].lower()
+            if stem == compact[:8] or stem in words or (len(stem) >= 4 and compact.startswith(stem)): matches.append(rel)
+        if len(matches) > 1:
+            # Pri zhode mien vyhráva súbor najbližšie ku koreňu hry
+            depth = min(rel.count(os.sep) for rel in matches)
+            matches = [rel for rel in matches if rel.count(os.sep) == depth]
+        return matches[0] if len(matches) == 1 else None
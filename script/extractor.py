@@ -0,0 +1,118 @@
+import os
+import re
+
+CHUNK_SIZE = 1024 * 1024
+SKIP_DIRS = ("dosbox",)
+CD_IMAGE_EXTS = ('.iso', '.img', '.ccd', '.mdf', '.mds')
+LAYOUT_DIRS = ('cd', 'docs', 'drives', 'dosbox.conf', 'capture', 'screens')
+
+class InstallCancelled(Exception):
+    """Raised inside an extraction when its cancel event gets set."""
+
+def member_parts(member_name):
+    """Path components of a zip member; drops drive letters, '..' and absolute parts."""
+    parts = []
+    for p in member_name.replace("\\", "/").split("/"):
+        p = os.path.splitdrive(p)[1]
+        if p in ("", ".", ".."): continue
+        parts.append(p)
+    return parts
+
+def plan_install(members, skip_dirs=SKIP_DIRS):
+    """Maps zip members to their final relative paths, using only the central directory.
+
+    A lone top-level folder wrapping the whole archive is stripped, and top-level folders
+    named in `skip_dirs` (bundled DOSBox builds) are left out, so every member can be
+    written straight to where it ends up. Returns a list of (ZipInfo, parts) tuples.
+    """
+    entries = [(m, member_parts(m.filename)) for m in members]
+    entries = [(m, parts) for m, parts in entries if parts]
+    tops = {parts[0] for _, parts in entries}
+    if len(tops) == 1 and all(len(parts) > 1 or m.is_dir() for m, parts in entries):
+        entries = [(m, parts[1:]) for m, parts in entries if len(parts) > 1]
+    skip = {d.lower() for d in skip_dirs}
+    return [(m, parts) for m, parts in entries
+            if not (parts[0].lower() in skip and (len(parts) > 1 or m.is_dir()))]
+
+def dos_dir_name(game_name):
+    """Default 8-character DOS folder name for a game."""
+    return re.sub(r'[^a-zA-Z0-9]', '', game_name)[:8].upper()
+
+def plan_organized(plan, game_name, dos_name=None):
+    """Rewrites a plan_install plan into the standard drives/c, cd, docs layout.
+
+    Mirrors GameLogic.organize_game_structure, but decides everything from the member list:
+    top-level CD images (and the .bin next to each .cue) go to cd/, everything else goes to
+    drives/c/<DOSNAME>. A lone top-level folder that already is a valid 8.3 name is kept.
+    """
+    dest = organized_layout(plan, game_name, dos_name)
+    return [(m, dest(parts)) for m, parts in plan]
+
+def organized_layout(plan, game_name, dos_name=None):
+    """The path mapping plan_organized applies to `plan`, as a function of path parts. It also
+    maps paths that are not in the plan (e.g. files a game wrote while played from the zip):
+    new top-level entries next to a lone game folder stay in the root of C:."""
+    tops = {}   # top-level name -> je to priečinok
+    for m, parts in plan:
+        tops[parts[0]] = tops.get(parts[0], False) or len(parts) > 1 or m.is_dir()
+    files = {t.lower(): t for t, is_dir in tops.items() if not is_dir}
+
+    to_cd = {t for t in files.values() if t.lower().endswith(CD_IMAGE_EXTS)}
+    for t in list(files.values()):
+        if t.lower().endswith(".cue"):
+            to_cd.add(t)
+            bin_name = files.get(os.path.splitext(t)[0].lower() + ".bin")
+            if bin_name: to_cd.add(bin_name)
+
+    rest = [t for t in tops if t not in to_cd and t not in LAYOUT_DIRS]
+    single_dir = len(rest) == 1 and tops[rest[0]]
+    final = dos_name
+    if not final and single_dir and len(rest[0]) <= 8 and " " not in rest[0]: final = rest[0].upper()
+    if not final: final = dos_dir_name(game_name)
+
+    def dest(parts):
+        top = parts[0]
+        if top in to_cd: return ["cd", *parts]
+        if top in LAYOUT_DIRS: return parts
+        if single_dir:
+            if top != rest[0]: return ["drives", "c", *parts]
+            return ["drives", "c", top if top.upper() == final.upper() else final, *parts[1:]]
+        return ["drives", "c", final, *parts]
+    return dest
+
+def extract_plan(z, target, plan, progress=None, cancel_event=None, link=None):
+    """Writes each planned member of an open ZipFile to `target`/parts, copying in chunks.
+
+    `progress(bytes_done, bytes_total, entries_done, entries_total)` is called after each
+    chunk and member. When `cancel_event` is set, InstallCancelled is raised between chunks.
+    `link(member, dest)` may materialize a file some other way (e.g. from a blob store) and
+    return True to skip decompressing it.
+    """
+    bytes_total = sum(m.file_size for m, _ in plan)
+    bytes_done = 0
+    made = set()
+    for i, (m, parts) in enumerate(plan, 1):
+        if cancel_event is not None and cancel_event.is_set(): raise InstallCancelled()
+        dest = os.path.join(target, *parts)
+        if m.is_dir():
+            if dest not in made: os.makedirs(dest, exist_ok=True); made.add(dest)
+        else:
+            parent = os.path.dirname(dest)
+            if parent not in made: os.makedirs(parent, exist_ok=True); made.add(parent)
+            if link and link(m, dest):
+                bytes_done += m.file_size
+                if progress: progress(bytes_done, bytes_total, i, len(plan))
+                continue
+            with z.open(m) as src, open(dest, 'wb') as dst:
+                while True:
+                    buf = src.read(CHUNK_SIZE)
+                    if not buf: break
+                    dst.write(buf)
+                    bytes_done += len(buf)
+                    if cancel_event is not None and cancel_event.is_set(): raise InstallCancelled()
+                    if progress: progress(bytes_done, bytes_total, i - 1, len(plan))
+        if progress: progress(bytes_done, bytes_total, i, len(plan))
+
+def extract_zip(z, target, progress=None, cancel_event=None):
+    """Single-pass install extraction: plan_install followed by extract_plan."""
+    extract_plan(z, target, plan_install(z.infolist()), progress, cancel_event)
@@ -4,21 +4,20 @@ import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 import os
 import sys
+import queue
 import webbrowser
-
-try:
-    from PIL import Image, ImageTk
-    HAS_PILLOW = True
-except ImportError:
-    HAS_PILLOW = False
+from concurrent.futures import ThreadPoolExecutor
 
 from logic import GameLogic
 from settings import SettingsManager
 from windows.settings_window import SettingsWindow
 from windows.edit_window import EditWindow
+from windows.sessions_window import SessionsWindow
 from components.detail_panel import DetailPanel
 from components.library_panel import LibraryPanel
-from utils import format_size, truncate_text, get_folder_size, get_file_size
+from catalog import Catalog
+from thumbnail_cache import HAS_PILLOW
+from utils import format_size, format_duration, format_date, truncate_text
 import constants
 
 class DOSManagerApp(tb.Window):
@@ -33,18 +32,29 @@ class DOSManagerApp(tb.Window):
         self.geometry("")
 
         self.logic = GameLogic(self.settings)
-        self.win_settings, self.win_edit = None, None
+        self._ui_queue = queue.Queue()
+        self._image_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="images")
+        self._image_token = 0
+        self.logic.size_cache.on_ready = lambda path, size: self.call_in_ui(self._on_size_ready, path, size)
+        self.logic.install_queue.on_update = lambda job: self.call_in_ui(self._on_install_update, job)
+        self.logic.sessions.on_update = lambda sessions: self.call_in_ui(self._on_sessions_update, len(sessions))
+        self.logic.on_session_end = lambda name: self.call_in_ui(self._reload_entry, name + ".zip")
+        self.logic.on_screenshot = lambda name, path: self.call_in_ui(self._on_screenshot, name, path)
+        self.win_settings, self.win_edit, self.win_sessions = None, None, None
         self.playlist_visible, self.description_visible = True, True
         self.current_images, self.current_img_index = [], 0
         
         self.search_var = tk.StringVar()
         self.fav_only_var = tk.BooleanVar(value=False)
-        self.search_var.trace("w", lambda *args: self.refresh_library())
+        self.catalog, self._filter_job = Catalog(), None
+        self.search_var.trace("w", lambda *args: self._schedule_filter())
         self.sort_col, self.sort_desc = "name", False
         self.force_fullscreen_var, self.hide_console_var = tk.BooleanVar(value=False), tk.BooleanVar(value=True)
 
         self.init_ui()
         self.minsize(550, 500)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(50, self._drain_ui_queue)
 
         if os.path.exists(self.settings.get("root_dir")):
             self.refresh_library()
@@ -59,6 +69,24 @@ class DOSManagerApp(tb.Window):
         self.detail_panel = DetailPanel(self, self.logic)
         self.library_panel = LibraryPanel(self)
         self.tree = self.library_panel.tree
+        self.tree_updater = self.library_panel.tree_updater
+
+    def call_in_ui(self, func, *args):
+        """Thread-safe: queues `func(*args)` to run on the Tk main loop."""
+        self._ui_queue.put((func, args))
+
+    def _drain_ui_queue(self):
+        while True:
+            try: func, args = self._ui_queue.get_nowait()
+            except queue.Empty: break
+            try: func(*args)
+            except Exception as e: print(f"UI callback error: {e}")
+        self.after(50, self._drain_ui_queue)
+
+    def on_close(self):
+        self._image_pool.shutdown(wait=False, cancel_futures=True)
+        self.logic.shutdown()
+        self.destroy()
 
     def toggle_description(self):
         if self.description_visible:
@@ -116,30 +144,83 @@ class DOSManagerApp(tb.Window):
         dp.txt_desc.config(state=tk.NORMAL); dp.txt_desc.delete(1.0, tk.END); dp.txt_desc.insert(tk.END, desc or "No description."); dp.txt_desc.config(state=tk.DISABLED)
         notes = self.logic.load_meta(name, ".notes"); dp.txt_notes.delete(1.0, tk.END); dp.txt_notes.insert(tk.END, notes or "")
 
-        z_sz = get_file_size(os.path.join(self.logic.zipped_dir, zip_name)) if self.logic.zipped_dir else 0
-        h_sz = get_folder_size(os.path.join(self.logic.installed_dir, name)) if is_installed and self.logic.installed_dir else 0
-        dp.lbl_size.config(text=f"Zip: {format_size(z_sz)} | HDD: {format_size(h_sz)}")
+        self._update_size_label(zip_name, is_installed)
 
         self.current_images = self.logic.get_game_images(name); self.current_img_index = 0
         self.load_and_display_image()
 
+    def _update_size_label(self, zip_name, is_installed):
+        z_sz = self.logic.scanner.zip_size(zip_name)
+        h_sz = self.logic.get_install_size(os.path.splitext(zip_name)[0]) if is_installed and self.logic.installed_dir else 0
+        h_txt = "computing…" if h_sz is None else format_size(h_sz)
+        self.detail_panel.lbl_size.config(text=f"Zip: {format_size(z_sz)} | HDD: {h_txt}")
+
+    def _on_size_ready(self, path, size):
+        zip_name = os.path.basename(path) + ".zip"
+        entry = self.catalog.get(zip_name)
+        if not entry: return
+        entry.hdd_size = size
+        self._update_tree_row(entry)
+        if self._get_selected_zip() == zip_name: self._update_size_label(zip_name, 'installed' in self.tree.item(zip_name, 'tags'))
+
     def load_and_display_image(self):
         dp = self.detail_panel
+        # Dekódovanie beží na pozadí; výsledok pre už neaktuálny výber sa zahodí podľa tokenu
+        self._image_token += 1
         if not HAS_PILLOW or not self.current_images:
             dp.lbl_img.config(image='', text="No Image"); dp.lbl_img.image = None; dp.lbl_img_info.config(text=""); return
         
         if self.current_img_index >= len(self.current_images): self.current_img_index = 0
         path = self.current_images[self.current_img_index]
+        info_text = f"Image {self.current_img_index + 1} of {len(self.current_images)}" if len(self.current_images) > 1 else ""
+        dp.lbl_img_info.config(text=info_text)
         
-        try:
-            # Oprava: Použijeme .resize() na natiahnutie obrázku
-            img = Image.open(path); img = img.resize((512, 384), Image.Resampling.LANCZOS)
-            photo_img = ImageTk.PhotoImage(img)
-            dp.lbl_img.image = photo_img; dp.lbl_img.config(image=photo_img)
-            info_text = f"Image {self.current_img_index + 1} of {len(self.current_images)}" if len(self.current_images) > 1 else ""
-            dp.lbl_img_info.config(text=info_text)
-        except Exception as e:
-            dp.lbl_img.config(image='', text="Image Error"); dp.lbl_img.image = None; print(f"Image Error: {e}")
+        photo_img = self.logic.thumbnails.cached_photo(path)
+        if photo_img:
+            self._show_image(photo_img); self._prefetch_images()
+        else:
+            dp.lbl_img.config(image='', text="Loading…"); dp.lbl_img.image = None
+            self._image_pool.submit(self._decode_image, self._image_token, path)
+
+    def _show_image(self, photo_img):
+        dp = self.detail_panel; dp.lbl_img.image = photo_img; dp.lbl_img.config(image=photo_img)
+
+    def _decode_image(self, token, path):
+        if token != self._image_token: return
+        try: img, err = self.logic.thumbnails.load_scaled(path), None
+        except Exception as e: img, err = None, e
+        self.call_in_ui(self._on_image_decoded, token, path, img, err)
+
+    def _on_image_decoded(self, token, path, img, err):
+        if token != self._image_token:
+            if img is not None: self._warm_image(path, img)
+            return
+        if err is not None:
+            dp = self.detail_panel; dp.lbl_img.config(image='', text="Image Error"); dp.lbl_img.image = None; print(f"Image Error: {err}")
+            return
+        self._show_image(self.logic.thumbnails.put_photo(path, img))
+        self._prefetch_images()
+
+    def _warm_image(self, path, img):
+        if self.logic.thumbnails.cached_photo(path) is None: self.logic.thumbnails.put_photo(path, img)
+
+    def _prefetch_images(self):
+        """Decodes the next image of this game and the first image of the rows above and below."""
+        if len(self.current_images) > 1:
+            nxt = self.current_images[(self.current_img_index + 1) % len(self.current_images)]
+            if self.logic.thumbnails.cached_photo(nxt) is None: self._image_pool.submit(self._prefetch_path, nxt)
+        sel = self._get_selected_zip()
+        if not sel: return
+        for neighbour in (self.tree.prev(sel), self.tree.next(sel)):
+            if neighbour: self._image_pool.submit(self._prefetch_game, os.path.splitext(neighbour)[0])
+
+    def _prefetch_path(self, path):
+        try: self.call_in_ui(self._warm_image, path, self.logic.thumbnails.load_scaled(path))
+        except Exception: pass
+
+    def _prefetch_game(self, game_name):
+        images = self.logic.get_game_images(game_name)
+        if images: self._prefetch_path(images[0])
 
     def next_image(self, event=None):
         if len(self.current_images) > 1:
@@ -167,61 +248,121 @@ class DOSManagerApp(tb.Window):
     def select_next(self): self._move_selection(1)
             
     def refresh_library(self):
-        search = self.search_var.get().lower().strip(); fav_only = self.fav_only_var.get()
-        selected = self.tree.selection(); save_id = selected[0] if selected else None
-        for i in self.tree.get_children(): self.tree.delete(i)
+        """Rebuilds the in-memory catalog from disk and the library index, then re-applies the filter."""
+        self.catalog = self.logic.build_catalog()
+        self.apply_filter()
+
+    def _schedule_filter(self, delay=150):
+        if self._filter_job: self.after_cancel(self._filter_job)
+        self._filter_job = self.after(delay, self.apply_filter)
+
+    def apply_filter(self):
+        self._filter_job = None
+        entries = self.catalog.filter(self.search_var.get(), self.fav_only_var.get())
+        save_id = self._get_selected_zip()
         
-        game_list, installed_set = self.logic.get_game_list(); data_rows = []
-        for zip_name in game_list:
-            name_no_zip = os.path.splitext(zip_name)[0]
-            if search and search not in name_no_zip.lower(): continue
-            is_fav = self.logic.is_favorite(name_no_zip)
-            if fav_only and not is_fav: continue
-            is_inst = zip_name in installed_set
-            
-            g = self.logic.load_meta(name_no_zip, ".genre"); y = self.logic.load_meta(name_no_zip, ".year"); c = self.logic.load_meta(name_no_zip, ".company")
-            r = self.logic.load_rating(name_no_zip)
-            z_sz = get_file_size(os.path.join(self.logic.zipped_dir, zip_name)) if self.logic.zipped_dir else 0
-            h_sz = get_folder_size(os.path.join(self.logic.installed_dir, name_no_zip)) if is_inst and self.logic.installed_dir else 0
-            
-            prefix = "✓" if is_inst else "…"; disp_name = f"{prefix} {name_no_zip}"
-            if is_fav: disp_name += " ★"
-            tag = 'installed' if is_inst else 'zipped'; rating_stars = "★" * r if r else ""
-            row_data = {"name": disp_name, "genre": g, "year": y, "company": c, "rating": rating_stars, "zip": format_size(z_sz), "hdd": format_size(h_sz), "id": zip_name, "tag": tag, "_sort_rating": r, "_sort_zip": z_sz, "_sort_hdd": h_sz}
-            data_rows.append(row_data)
-            
-        sort_map = {"name": "id", "genre": "genre", "company": "company", "year": "year", "rating": "_sort_rating", "zip": "_sort_zip", "hdd": "_sort_hdd"}
-        sort_key_name = sort_map.get(self.sort_col, "id")
-        data_rows.sort(key=lambda item: (item.get(sort_key_name) or "").lower() if isinstance(item.get(sort_key_name), str) else (item.get(sort_key_name) or 0), reverse=self.sort_desc)
+        sort_map = {"name": "zip_name", "genre": "genre", "company": "company", "year": "year", "rating": "rating", "zip": "zip_size", "hdd": "hdd_size",
+                    "played": "last_played", "time": "play_time", "recent": "recent_time"}
+        sort_attr = sort_map.get(self.sort_col, "zip_name")
+        data_rows = [self._build_row(e) for e in sorted(entries, key=lambda e: self._sort_value(getattr(e, sort_attr)), reverse=self.sort_desc)]
         
         visible_columns = self.tree["columns"]
-        for row in data_rows:
-            values_to_insert = [row.get(col_id) for col_id in visible_columns]
-            self.tree.insert("", "end", iid=row["id"], values=values_to_insert, tags=(row["tag"],))
+        self.tree_updater.prune(self.catalog.entries)
+        changed = self.tree_updater.update([(row["id"], [row.get(col_id) for col_id in visible_columns], (row["tag"],)) for row in data_rows])
             
-        if save_id and self.tree.exists(save_id): self.tree.selection_set(save_id); self.tree.see(save_id)
+        if save_id and self.tree_updater.is_visible(save_id):
+            if save_id in changed: self.on_select()
         elif data_rows:
-            first_id = data_rows[0]["id"]
-            if self.tree.exists(first_id): self.tree.selection_set(first_id)
-        else: self.clear_preview()
-        self.on_select()
+            first_id = data_rows[0]["id"]; self.tree.selection_set(first_id); self.tree.see(first_id)
+        else:
+            self.tree.selection_remove(*self.tree.selection()); self.clear_preview()
+
+    def _update_tree_row(self, entry):
+        row = self._build_row(entry)
+        self.tree_updater.set_row(row["id"], [row.get(col_id) for col_id in self.tree["columns"]], (row["tag"],))
+
+    @staticmethod
+    def _sort_value(val):
+        return (val or "").lower() if isinstance(val, str) else (val or 0)
+
+    def _build_row(self, entry):
+        prefix = "✓" if entry.installed else "…"; disp_name = f"{prefix} {entry.name}"
+        if entry.favorite: disp_name += " ★"
+        tag = 'installed' if entry.installed else 'zipped'; rating_stars = "★" * entry.rating if entry.rating else ""
+        h_sz = entry.hdd_size
+        return {"name": disp_name, "genre": entry.genre, "year": entry.year, "company": entry.company, "rating": rating_stars, "zip": format_size(entry.zip_size), "hdd": "computing…" if h_sz is None else format_size(h_sz),
+                "played": format_date(entry.last_played), "time": format_duration(entry.play_time), "recent": format_duration(entry.recent_time), "id": entry.zip_name, "tag": tag}
+
+    def rescan_library(self):
+        """Applies only what the scanner reports as changed to the catalog; the tree updater patches the rows."""
+        delta = self.logic.scan_library()
+        if not delta: return
+        self.logic.update_catalog(self.catalog, delta)
+        self.apply_filter()
+
+    def _on_screenshot(self, game_name, path):
+        """Shows a screenshot taken in a running game when that game is selected."""
+        if self._get_selected_zip() != game_name + ".zip" or path in self.current_images: return
+        self.current_images = sorted(self.current_images + [path]); self.current_img_index = self.current_images.index(path)
+        self.load_and_display_image()
+
+    def _reload_entry(self, zip_name):
+        self.logic.refresh_catalog_entry(self.catalog, zip_name)
+        self.apply_filter()
     
     def clear_preview(self):
         dp = self.detail_panel; dp.lbl_title.config(text="Select Game"); dp.lbl_img.config(image='', text="No Image")
         dp.lbl_img.image = None; dp.btn_play.config(state=tk.DISABLED); dp.btn_install.config(state=tk.DISABLED)
         dp.lbl_size.config(text=""); dp.lbl_img_info.config(text=""); dp.txt_desc.config(state=tk.NORMAL)
         dp.txt_desc.delete(1.0, tk.END); dp.txt_desc.config(state=tk.DISABLED); dp.txt_notes.delete(1.0, tk.END); dp.lbl_sheet.config(text="")
-        self.current_images = []
+        self.current_images = []; self._image_token += 1
 
-    def _get_selected_zip(self): sel = self.tree.selection(); return sel[0] if sel else None
-    def on_install(self):
+    def on_play_from_zip(self):
         zip_name = self._get_selected_zip()
         if zip_name:
-            try: self.logic.install_game(zip_name); self.refresh_library()
+            try: self.logic.play_from_zip(zip_name, force_fullscreen=self.force_fullscreen_var.get(), hide_console=self.hide_console_var.get())
             except Exception as e: messagebox.showerror("Error", str(e))
+    def _get_selected_zip(self): sel = self.tree.selection(); return sel[0] if sel else None
+    def on_install(self, organized=False):
+        """Queues every selected, not yet installed game for background installation."""
+        for zip_name in self.tree.selection():
+            if 'installed' not in self.tree.item(zip_name, 'tags'): self.logic.install_queue.submit(zip_name, organized)
+    def cancel_installs(self): self.logic.install_queue.cancel_all()
+    def _on_install_update(self, job):
+        lp = self.library_panel; q = self.logic.install_queue
+        if job.status == "done": self.rescan_library()
+        active = q.active_jobs()
+        if active:
+            running = [j for j in active if j.status == "running"]
+            queued = len(active) - len(running)
+            parts = [f"{os.path.splitext(j.zip_name)[0]} {j.percent}% ({j.entries_done}/{j.entries_total} files)" for j in running]
+            text = "Installing " + ", ".join(parts) if parts else "Waiting…"
+            if queued: text += f"  |  {queued} queued"
+            lp.lbl_jobs.config(text=truncate_text(text, 90))
+            lp.pb_jobs.configure(value=sum(j.percent for j in running) / len(running) if running else 0)
+            lp.show_jobs(True)
+            return
+        lp.show_jobs(False)
+        failed = [j for j in q.jobs() if j.status == "failed"]
+        q.clear_finished()
+        if failed: messagebox.showerror("Install Error", "\n".join(f"{j.zip_name}: {j.error}" for j in failed))
+    def _on_sessions_update(self, count):
+        self.library_panel.btn_sessions.config(text=f"▣ Running ({count})", bootstyle="success" if count else "secondary")
+    def open_sessions(self):
+        if self.win_sessions and self.win_sessions.winfo_exists(): self.win_sessions.lift()
+        else: self.win_sessions = SessionsWindow(self)
+    def launch_custom(self, zip_name, exe=None):
+        try:
+            if exe: self.logic.launch_game(zip_name, specific_exe=exe, force_fullscreen=self.force_fullscreen_var.get(), hide_console=self.hide_console_var.get())
+            else: self.logic.launch_dosbox_prompt(zip_name)
+        except Exception as e: messagebox.showerror("Error", str(e))
+    def stop_game(self, name):
+        if messagebox.askyesno("Stop Game", f"Stop {name}? Unsaved progress in the game is lost."): self.logic.sessions.kill(name)
+    def focus_game(self, name):
+        if not self.logic.sessions.focus(name): messagebox.showinfo("Focus Window", "Could not find the DOSBox window (focusing needs xdotool or wmctrl).")
     def on_uninstall(self):
         zip_name = self._get_selected_zip()
-        if zip_name and messagebox.askyesno("Confirm", "Uninstall game?"): self.logic.uninstall_game(zip_name); self.refresh_library()
+        if zip_name and messagebox.askyesno("Confirm", "Uninstall game?"): self.logic.uninstall_game(zip_name); self.rescan_library()
     def restart_program(self): sys.stdout.flush(); os.execl(sys.executable, sys.executable, *sys.argv)
     def open_settings(self):
         if self.win_settings and self.win_settings.winfo_exists(): self.win_settings.lift()
@@ -234,36 +375,61 @@ class DOSManagerApp(tb.Window):
     def sort_tree(self, col):
         if self.sort_col == col: self.sort_desc = not self.sort_desc
         else: self.sort_col = col; self.sort_desc = False
-        self.refresh_library()
+        self.apply_filter()
     def save_notes(self):
         sel = self._get_selected_zip()
         if sel: self.logic.save_meta(os.path.splitext(sel)[0], ".notes", self.detail_panel.txt_notes.get(1.0, tk.END).strip())
     def show_tree_context(self, event):
         item_id = self.tree.identify_row(event.y)
         if not item_id: return
-        self.tree.selection_set(item_id); is_inst = 'installed' in self.tree.item(item_id, 'tags'); name = os.path.splitext(item_id)[0]
+        if item_id not in self.tree.selection(): self.tree.selection_set(item_id)
+        is_inst = 'installed' in self.tree.item(item_id, 'tags'); name = os.path.splitext(item_id)[0]
         menu = tb.Menu(self, tearoff=0)
         menu.add_command(label="✎ Configuration", command=self.open_edit_window)
         is_fav = self.logic.is_favorite(name); fav_label = "💔 Unfavorite" if is_fav else "★ Favorite"
         menu.add_command(label=fav_label, command=lambda n=name: self.toggle_fav_from_context(n))
         menu.add_separator()
+        if self.logic.sessions.get(name):
+            menu.add_command(label="⧉ Focus Window", command=lambda n=name: self.focus_game(n))
+            menu.add_command(label="■ Stop Game", command=lambda n=name: self.stop_game(n))
+            menu.add_separator()
         if is_inst:
             menu.add_command(label="▶ Play Game", command=self.on_play)
             exe_map = self.logic.load_exe_map(name); custom_items = [(info.get("title", os.path.basename(exe)), exe) for exe, info in exe_map.items() if info.get("role") != "main"]
             if custom_items:
                 sub_custom = tb.Menu(menu, tearoff=0)
-                for title, exe in custom_items: sub_custom.add_command(label=title, command=lambda i=item_id, x=exe: self.logic.launch_game(i, specific_exe=x, force_fullscreen=self.force_fullscreen_var.get(), hide_console=self.hide_console_var.get()))
+                for title, exe in custom_items: sub_custom.add_command(label=title, command=lambda i=item_id, x=exe: self.launch_custom(i, x))
                 menu.add_cascade(label="📂 Other Executables", menu=sub_custom)
             menu.add_separator()
             menu.add_command(label="📝 Edit Config (Notepad)", command=lambda i=item_id: self.logic.open_config_in_notepad(i))
-            menu.add_command(label="💻 Run DOSBox (CMD)", command=lambda i=item_id: self.logic.launch_dosbox_prompt(i))
+            menu.add_command(label="💻 Run DOSBox (CMD)", command=lambda i=item_id: self.launch_custom(i))
+            menu.add_separator()
+            menu.add_command(label="💾 Backup Saves", command=lambda i=item_id: self.backup_saves(i))
+            snapshots = self.logic.list_save_backups(name)
+            if snapshots:
+                sub_restore = tb.Menu(menu, tearoff=0)
+                for snap_id in snapshots[:20]: sub_restore.add_command(label=snap_id, command=lambda i=item_id, s=snap_id: self.restore_saves(i, s))
+                menu.add_cascade(label="⟲ Restore Saves", menu=sub_restore)
             menu.add_separator()
             menu.add_command(label="Uninstall", command=self.on_uninstall)
-        else: menu.add_command(label="Install", command=self.on_install)
+        else:
+            pending = [z for z in self.tree.selection() if 'installed' not in self.tree.item(z, 'tags')]
+            menu.add_command(label="▶ Play Without Installing", command=self.on_play_from_zip)
+            menu.add_separator()
+            suffix = f" Selected ({len(pending)})" if len(pending) > 1 else ""
+            menu.add_command(label="Install" + suffix, command=self.on_install)
+            menu.add_command(label="Install Organized" + suffix + " (drives/c, cd, docs)", command=lambda: self.on_install(organized=True))
         menu.add_separator()
         rate_menu = tb.Menu(menu, tearoff=0)
         for i in range(1, 6): rate_menu.add_command(label="★" * i, command=lambda r=i: self.set_rating(item_id, r))
         menu.add_cascade(label="Rate", menu=rate_menu)
         menu.post(event.x_root, event.y_root)
-    def toggle_fav_from_context(self, name): self.logic.toggle_favorite(name); self.refresh_library()
-    def set_rating(self, item_id, rating): self.logic.save_meta(os.path.splitext(item_id)[0], ".rating", rating); self.refresh_library()
\ No newline at end of file
+    def backup_saves(self, zip_name):
+        ok, msg = self.logic.backup_game_saves(zip_name)
+        (messagebox.showinfo if ok else messagebox.showwarning)("Backup Saves", msg)
+    def restore_saves(self, zip_name, snap_id):
+        if not messagebox.askyesno("Restore Saves", f"Overwrite the current save files with snapshot {snap_id}?"): return
+        ok, msg = self.logic.restore_game_saves(zip_name, snap_id)
+        (messagebox.showinfo if ok else messagebox.showerror)("Restore Saves", msg)
+    def toggle_fav_from_context(self, name): self.logic.toggle_favorite(name); self._reload_entry(name + ".zip")
+    def set_rating(self, item_id, rating): self.logic.save_meta(os.path.splitext(item_id)[0], ".rating", rating); self._reload_entry(item_id)
\ No newline at end of file
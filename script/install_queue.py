@@ -0,0 +1,101 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from extractor import InstallCancelled
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+class InstallJob:
+    def __init__(self, zip_name, organized=False):
+        self.zip_name = zip_name
+        self.organized = organized
+        self.status = JOB_QUEUED
+        self.bytes_done = self.bytes_total = 0
+        self.entries_done = self.entries_total = 0
+        self.error = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def finished(self): return self.status in (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+    @property
+    def percent(self):
+        return int(100 * self.bytes_done / self.bytes_total) if self.bytes_total else 0
+
+class InstallQueue:
+    """Runs GameLogic.install_game jobs on a bounded worker pool.
+
+    `on_update(job)` is called from worker threads whenever a job changes state and, at
+    most every PROGRESS_INTERVAL seconds, while it is extracting.
+    """
+    PROGRESS_INTERVAL = 0.2
+
+    def __init__(self, logic, workers=1, on_update=None):
+        self.logic = logic
+        self.on_update = on_update
+        self._jobs = {}     # zip_name -> InstallJob (aj dokončené, kým sa nezavolá clear_finished)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="install")
+
+    def submit(self, zip_name, organized=False):
+        with self._lock:
+            job = self._jobs.get(zip_name)
+            if job and not job.finished: return job
+            job = self._jobs[zip_name] = InstallJob(zip_name, organized)
+        self._pool.submit(self._run, job)
+        self._notify(job)
+        return job
+
+    def cancel(self, zip_name):
+        job = self._jobs.get(zip_name)
+        if job and not job.finished: job.cancel_event.set()
+
+    def cancel_all(self):
+        for job in self.jobs(): job.cancel_event.set()
+
+    def jobs(self):
+        with self._lock: return list(self._jobs.values())
+
+    def active_jobs(self):
+        return [j for j in self.jobs() if not j.finished]
+
+    def clear_finished(self):
+        with self._lock:
+            self._jobs = {k: j for k, j in self._jobs.items() if not j.finished}
+
+    def shutdown(self):
+        """Cancels (and so rolls back) every pending and running install."""
+        self.cancel_all()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _notify(self, job):
+        if self.on_update:
+            try: self.on_update(job)
+            except Exception as e: print(f"Install update error: {e}")
+
+    def _run(self, job):
+        if job.cancel_event.is_set():
+            job.status = JOB_CANCELLED; self._notify(job); return
+        job.status = JOB_RUNNING; self._notify(job)
+        last = [0.0]
+
+        def progress(bytes_done, bytes_total, entries_done, entries_total):
+            job.bytes_done, job.bytes_total = bytes_done, bytes_total
+            job.entries_done, job.entries_total = entries_done, entries_total
+            now = time.monotonic()
+            if now - last[0] >= self.PROGRESS_INTERVAL:
+                last[0] = now; self._notify(job)
+
+        try:
+            self.logic.install_game(job.zip_name, progress=progress, cancel_event=job.cancel_event, organized=job.organized)
+            job.status = JOB_DONE
+        except InstallCancelled:
+            job.status = JOB_CANCELLED
+        except Exception as e:
+            job.status, job.error = JOB_FAILED, e
+        self._notify(job)
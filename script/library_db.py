@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import threading
+
+# Mapovanie starých sidecar súborov z info/ na stĺpce indexu
+META_COLUMNS = {
+    ".genre": "genre",
+    ".year": "year",
+    ".company": "company",
+    ".rating": "rating",
+    ".fav": "favorite",
+    ".notes": "notes",
+    ".txt": "description",
+    ".exes.json": "exe_map",
+    ".extra": "extra",
+    ".dosbox": "dosbox",
+}
+
+class LibraryIndex:
+    """Single SQLite file holding per-game metadata instead of one tiny file per field."""
+
+    def __init__(self, db_path, legacy_dir=None):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._ensure_schema()
+        if legacy_dir and not self.get_state("legacy_imported"):
+            self.import_legacy_files(legacy_dir)
+
+    def _ensure_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS games (name TEXT PRIMARY KEY)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS sizes (path TEXT PRIMARY KEY, signature TEXT, size INTEGER)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, size INTEGER, crc INTEGER, refs INTEGER DEFAULT 0)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS blobs_size_crc ON blobs (size, crc)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS game_cache (game TEXT, key TEXT, data TEXT, PRIMARY KEY (game, key))")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS blob_refs (game TEXT, hash TEXT, count INTEGER, PRIMARY KEY (game, hash))")
+            # Záznam relácií sa len dopĺňa; play_stats drží súhrny, aby knižnica nemusela prechádzať celý log
+            self._conn.execute("CREATE TABLE IF NOT EXISTS sessions (id INTEGER PRIMARY KEY, game TEXT, start REAL, end REAL, exit_code INTEGER, "
+                               "exe TEXT, conf_hash TEXT, peak_rss INTEGER, avg_cpu REAL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_start ON sessions (start)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_game ON sessions (game, start)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS play_stats (game TEXT PRIMARY KEY, last_played REAL, total_time REAL, sessions INTEGER)")
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+            for col, kind in (("cycles", "TEXT"), ("cpu_p90", "REAL"), ("busy", "REAL")):
+                if col not in existing: self._conn.execute(f"ALTER TABLE sessions ADD COLUMN {col} {kind}")
+            if "computed" not in {row[1] for row in self._conn.execute("PRAGMA table_info(sizes)")}:
+                self._conn.execute("ALTER TABLE sizes ADD COLUMN computed REAL DEFAULT 0")
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(games)")}
+            for col in META_COLUMNS.values():
+                if col not in existing:
+                    self._conn.execute(f"ALTER TABLE games ADD COLUMN {col} TEXT")
+
+    @staticmethod
+    def _column(extension):
+        col = META_COLUMNS.get(extension)
+        if not col: raise ValueError(f"Unknown metadata field: {extension}")
+        return col
+
+    def get_state(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM state WHERE key=?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value))
+
+    def get(self, game_name, extension):
+        col = self._column(extension)
+        with self._lock:
+            row = self._conn.execute(f"SELECT {col} FROM games WHERE name=?", (game_name,)).fetchone()
+        return (row[0] or "").strip() if row else ""
+
+    def set(self, game_name, extension, value):
+        col = self._column(extension)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO games (name, {col}) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET {col}=excluded.{col}",
+                (game_name, str(value)))
+
+    def get_row(self, game_name):
+        with self._lock:
+            cur = self._conn.execute("SELECT * FROM games WHERE name=?", (game_name,))
+            row = cur.fetchone()
+            cols = [d[0] for d in cur.description]
+        return dict(zip(cols, row)) if row else {}
+
+    def all_rows(self):
+        """Returns {game_name: {column: value}} for the whole library in one query."""
+        with self._lock:
+            cur = self._conn.execute("SELECT * FROM games")
+            cols = [d[0] for d in cur.description]
+            rows = cur.fetchall()
+        return {row[0]: dict(zip(cols, row)) for row in rows}
+
+    def rename(self, old_name, new_name):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM games WHERE name=?", (new_name,))
+            self._conn.execute("UPDATE games SET name=? WHERE name=?", (new_name, old_name))
+            self._conn.execute("DELETE FROM game_cache WHERE game=?", (new_name,))
+            self._conn.execute("UPDATE game_cache SET game=? WHERE game=?", (new_name, old_name))
+            self._conn.execute("UPDATE sessions SET game=? WHERE game=?", (new_name, old_name))
+            old = self._conn.execute("SELECT last_played, total_time, sessions FROM play_stats WHERE game=?", (old_name,)).fetchone()
+            if old:
+                self._conn.execute("DELETE FROM play_stats WHERE game=?", (old_name,))
+                self._conn.execute("INSERT INTO play_stats (game, last_played, total_time, sessions) VALUES (?, ?, ?, ?) ON CONFLICT(game) DO UPDATE SET "
+                                   "last_played=MAX(last_played, excluded.last_played), total_time=total_time+excluded.total_time, sessions=sessions+excluded.sessions",
+                                   (new_name, *old))
+
+    def delete(self, game_name):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM games WHERE name=?", (game_name,))
+            self._conn.execute("DELETE FROM game_cache WHERE game=?", (game_name,))
+
+    def get_cache(self, game_name, key):
+        """Derived per-game data (exe index, ...) that can always be rebuilt from disk."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM game_cache WHERE game=? AND key=?", (game_name, key)).fetchone()
+        return row[0] if row else None
+
+    def set_cache(self, game_name, key, data):
+        with self._lock, self._conn:
+            if data is None: self._conn.execute("DELETE FROM game_cache WHERE game=? AND key=?", (game_name, key))
+            else: self._conn.execute("INSERT OR REPLACE INTO game_cache (game, key, data) VALUES (?, ?, ?)", (game_name, key, data))
+
+    def add_session(self, game_name, start, end, exit_code=None, exe=None, conf_hash=None, peak_rss=None, avg_cpu=None,
+                    cycles=None, cpu_p90=None, busy=None):
+        """Appends a finished session to the log and adds it to the game's play_stats."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO sessions (game, start, end, exit_code, exe, conf_hash, peak_rss, avg_cpu, cycles, cpu_p90, busy) "
+                               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               (game_name, start, end, exit_code, exe, conf_hash, peak_rss, avg_cpu, cycles, cpu_p90, busy))
+            self._conn.execute("INSERT INTO play_stats (game, last_played, total_time, sessions) VALUES (?, ?, ?, 1) ON CONFLICT(game) DO UPDATE SET "
+                               "last_played=MAX(last_played, excluded.last_played), total_time=total_time+excluded.total_time, sessions=sessions+1",
+                               (game_name, end, max(0.0, end - start)))
+
+    def play_stats(self, recent_since, game_name=None):
+        """{game: (last_played, total_time, time played since `recent_since`)} from the summary
+        table and one indexed range query over the recent part of the log."""
+        where, args = ("WHERE game=?", (game_name,)) if game_name else ("", ())
+        with self._lock:
+            stats = {g: (last, total, 0.0) for g, last, total in self._conn.execute(f"SELECT game, last_played, total_time FROM play_stats {where}", args)}
+            recent = self._conn.execute(f"SELECT game, SUM(end - start) FROM sessions WHERE start>=? {'AND game=?' if game_name else ''} GROUP BY game",
+                                        (recent_since, *args)).fetchall()
+        for g, t in recent:
+            if g in stats: stats[g] = (stats[g][0], stats[g][1], t or 0.0)
+        return stats
+
+    def cpu_loads(self, game_name, cycles, limit=3, min_duration=60):
+        """p90 CPU of the game's latest sessions that ran with `cycles` for at least `min_duration` seconds."""
+        with self._lock:
+            rows = self._conn.execute("SELECT cpu_p90 FROM sessions WHERE game=? AND cycles=? AND cpu_p90 IS NOT NULL AND end - start >= ? "
+                                      "ORDER BY start DESC LIMIT ?", (game_name, cycles, min_duration, limit)).fetchall()
+        return [r[0] for r in rows]
+
+    def game_sessions(self, game_name, limit=20):
+        """The game's latest sessions, newest first, as dicts."""
+        with self._lock:
+            cur = self._conn.execute("SELECT * FROM sessions WHERE game=? ORDER BY start DESC LIMIT ?", (game_name, limit))
+            cols = [d[0] for d in cur.description]
+            return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+    def load_sizes(self):
+        with self._lock:
+            return {path: (sig, size, computed or 0) for path, sig, size, computed in self._conn.execute("SELECT path, signature, size, computed FROM sizes")}
+
+    def store_size(self, path, signature, size, computed):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO sizes (path, signature, size, computed) VALUES (?, ?, ?, ?)", (path, signature, size, computed))
+
+    def delete_size(self, path):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sizes WHERE path=?", (path,))
+
+    def find_blob(self, size, crc):
+        """Hash of the only stored blob with this size and CRC-32, or None (missing or ambiguous)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT hash FROM blobs WHERE size=? AND crc=? LIMIT 2", (size, crc)).fetchall()
+        return rows[0][0] if len(rows) == 1 else None
+
+    def set_blob_refs(self, game_name, blobs):
+        """Replaces a game's blob references. blobs: {hash: (count, size, crc)}.
+
+        Returns the hashes nobody references any more; their rows are already gone.
+        """
+        with self._lock, self._conn:
+            old = dict(self._conn.execute("SELECT hash, count FROM blob_refs WHERE game=?", (game_name,)))
+            for h, (count, size, crc) in blobs.items():
+                self._conn.execute("INSERT OR IGNORE INTO blobs (hash, size, crc, refs) VALUES (?, ?, ?, 0)", (h, size, crc))
+            for h in old.keys() | blobs.keys():
+                diff = (blobs[h][0] if h in blobs else 0) - old.get(h, 0)
+                if diff: self._conn.execute("UPDATE blobs SET refs=refs+? WHERE hash=?", (diff, h))
+            self._conn.execute("DELETE FROM blob_refs WHERE game=?", (game_name,))
+            self._conn.executemany("INSERT INTO blob_refs (game, hash, count) VALUES (?, ?, ?)",
+                                   [(game_name, h, v[0]) for h, v in blobs.items()])
+            orphans = [h for (h,) in self._conn.execute("SELECT hash FROM blobs WHERE refs<=0")]
+            self._conn.execute("DELETE FROM blobs WHERE refs<=0")
+        return orphans
+
+    def rename_blob_refs(self, old_name, new_name):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE blob_refs SET game=? WHERE game=?", (new_name, old_name))
+
+    def blob_stats(self):
+        """(blob count, bytes stored once, bytes the installed copies would take without sharing)."""
+        with self._lock:
+            count, stored, logical = self._conn.execute("SELECT COUNT(*), SUM(size), SUM(size * refs) FROM blobs").fetchone()
+        return count, stored or 0, logical or 0
+
+    def import_legacy_files(self, legacy_dir):
+        """One-time import of the old .genre/.year/.rating/.fav/.exes.json/.extra files."""
+        records = {}
+        if os.path.isdir(legacy_dir):
+            # Dlhšie prípony najprv, aby ".exes.json" nevyhral nad kratšou zhodou
+            suffixes = sorted(META_COLUMNS, key=len, reverse=True)
+            for f in os.listdir(legacy_dir):
+                ext = next((s for s in suffixes if f.endswith(s) and len(f) > len(s)), None)
+                if not ext: continue
+                try:
+                    with open(os.path.join(legacy_dir, f), 'r', encoding='utf-8') as fh: value = fh.read().strip()
+                except: continue
+                if ext == ".fav": value = "1"
+                records.setdefault(f[:-len(ext)], {})[META_COLUMNS[ext]] = value
+
+        with self._lock, self._conn:
+            for name, fields in records.items():
+                cols = list(fields)
+                updates = ", ".join(f"{c}=excluded.{c}" for c in cols)
+                self._conn.execute(
+                    f"INSERT INTO games (name, {', '.join(cols)}) VALUES (?{', ?' * len(cols)}) ON CONFLICT(name) DO UPDATE SET {updates}",
+                    [name] + [fields[c] for c in cols])
+            self._conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('legacy_imported', '1')")
+        return len(records)
+
+    def close(self):
+        with self._lock: self._conn.close()
@@ -1,16 +1,32 @@
 import os
+import hashlib
 import shutil
 import zipfile
 import subprocess
-import re
 import json
 import threading
 import time
-import datetime
 
 # Imports from our modules
 from constants import *
-from utils import remove_readonly
+from utils import remove_readonly, format_size
+from library_db import LibraryIndex, META_COLUMNS
+from scanner import LibraryScanner
+from size_cache import SizeCache
+from catalog import Catalog, CatalogEntry
+from search_index import SearchIndex, TEXT_FIELDS, NUMERIC_FIELDS
+from thumbnail_cache import ThumbnailCache
+from extractor import plan_install, organized_layout, extract_plan, dos_dir_name
+from install_queue import InstallQueue
+from blob_store import BlobStore
+from play_cache import PlayCache
+from save_vault import SaveVault
+from exe_index import ExeIndex
+from dosbox_conf import DosboxConf, load_cached
+from conf_layers import ConfLayers
+from sessions import SessionSupervisor
+from cycles_tuner import SATURATED_CPU, percentile, recommend_cycles
+from capture_watcher import CaptureWatcher, ScreenshotNames
 
 HAS_PILLOW = False
 try:
@@ -24,13 +40,52 @@ class GameLogic:
         self.folder_info = os.path.join(BASE_DIR, "info")
         self.folder_screens = os.path.join(BASE_DIR, "screens")
         self.folder_backups = os.path.join(BASE_DIR, "backups")
+        self.save_vault = SaveVault(self.folder_backups, SAVE_EXTENSIONS)
+        self.db = LibraryIndex(os.path.join(self.folder_info, "library.db"), legacy_dir=self.folder_info)
+        self.exe_index = ExeIndex(self.db)
+        self.scanner = LibraryScanner()
+        self.size_cache = SizeCache(self.db)
+        self.search_index = None
+        self.thumbnails = ThumbnailCache(os.path.join(BASE_DIR, "cache", "thumbs"), budget_mb=self.settings.get("thumb_cache_mb") or 64)
+        self.install_queue = InstallQueue(self, workers=self.settings.get("install_workers") or 1)
+        self._blob_store = None
+        self.play_cache = PlayCache(os.path.join(BASE_DIR, "cache", "play"), os.path.join(BASE_DIR, "overlays"),
+                                    budget_mb=self.settings.get("play_cache_mb") or 4096)
+        # cycles_protected nie je kľúč DOSBoxu, launcher ho zapisuje ako cycles pri hrách v chránenom režime
+        base_config = {s: {k: v for k, v in d.items() if k != 'cycles_protected'} for s, d in DEFAULT_GAME_CONFIG.items()}
+        self.conf_layers = ConfLayers(os.path.join(BASE_DIR, "cache", "conf"), os.path.join(BASE_DIR, "profiles"), base_config, CONFIG_PROFILES)
+        self.sessions = SessionSupervisor()
+        self.on_session_end = None  # on_session_end(game_name) po zázname relácie, z vlákna supervízora
+        self.folder_logs = os.path.join(BASE_DIR, "logs")
+        self._dosbox_flavors = {}   # (exe, mtime_ns) -> 'staging' | 'x' | 'dosbox'
+        self.screenshot_names = ScreenshotNames()
+        self.on_screenshot = None   # on_screenshot(game_name, path) po importe snímky, z vlákna watchera
         self._migrate_legacy_screens()
+        if not self.settings.get("confs_minimized"):
+            threading.Thread(target=self._minimize_game_configs, name="conf-migration", daemon=True).start()
 
     @property
     def installed_dir(self): return self.settings.get("root_dir")
     @property
     def zipped_dir(self): return self.settings.get("zip_dir")
 
+    @property
+    def blob_store(self):
+        """Shared blob store next to the installed games (same volume, so hard links work)."""
+        path = os.path.join(self.installed_dir, ".blobs")
+        if self._blob_store is None or self._blob_store.store_dir != path: self._blob_store = BlobStore(path, self.db)
+        return self._blob_store
+
+    def dedup_installed_games(self):
+        """Moves every installed game's shareable files into the blob store; returns the store report."""
+        store = self.blob_store
+        for d in os.listdir(self.installed_dir):
+            folder = os.path.join(self.installed_dir, d)
+            if d.startswith(".") or not os.path.isdir(folder): continue
+            store.ingest(d, folder)
+            self.invalidate_install_size(d)
+        return store.report()
+
     def get_dosbox_exe(self, game_name=None):
         if game_name:
             custom = self.load_meta(game_name, ".dosbox")
@@ -48,17 +103,25 @@ class GameLogic:
         return path
 
     def get_game_list(self):
-        zipped = set()
-        if os.path.exists(self.zipped_dir):
-            zipped = {f for f in os.listdir(self.zipped_dir) if f.lower().endswith(".zip")}
-        
-        installed = set()
-        if os.path.exists(self.installed_dir):
-            for d in os.listdir(self.installed_dir):
-                full_path = os.path.join(self.installed_dir, d)
-                if os.path.isdir(full_path):
-                    installed.add(d + ".zip")
-        return sorted(list(zipped | installed)), installed
+        game_list, installed, _ = self.scanner.scan(self.zipped_dir, self.installed_dir)
+        return game_list, installed
+
+    def scan_library(self):
+        """Rescans only what changed since the last scan and returns the ScanDelta."""
+        return self.scanner.scan(self.zipped_dir, self.installed_dir)[2]
+
+    def get_install_size(self, game_name):
+        """Cached size of the installed folder; None while it is still being computed in the background."""
+        sig = self.scanner.install_signature(game_name + ".zip")
+        if sig is None: return 0
+        return self.size_cache.get(os.path.join(self.installed_dir, game_name), sig)
+
+    def invalidate_install_size(self, game_name):
+        self.size_cache.invalidate(os.path.join(self.installed_dir, game_name))
+
+    def shutdown(self):
+        self.install_queue.shutdown()
+        self.size_cache.close()
 
     def launch_game(self, zip_name, specific_exe=None, force_fullscreen=False, hide_console=False):
         name = os.path.splitext(zip_name)[0]
@@ -76,101 +139,277 @@ class GameLogic:
         if specific_exe: 
             self._launch_custom_mode(folder, specific_exe, command_args, mode="exe", game_name=name)
         else: 
-            def run_std():
-                final_command = command_args + ["-conf", "dosbox.conf"]
-                
-                start_time = time.time()
-                subprocess.call(final_command, cwd=folder, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                
-                for f in ["stdout.txt", "stderr.txt"]:
-                    fp = os.path.join(folder, f)
-                    if os.path.exists(fp):
-                        try: os.remove(fp)
-                        except: pass
-                self.import_screenshots_from_capture(folder, name, start_time)
+            self._start_session(name, command_args + self.conf_args(name, "dosbox.conf"), folder,
+                                after=lambda session: self._after_session(name, folder, session), exe=self.main_exe(name, folder))
 
-            threading.Thread(target=run_std, daemon=True).start()
+    def _session_log(self, game_name):
+        return os.path.join(self.folder_logs, game_name + ".log")
 
-    def load_meta(self, game_name, extension):
-        path = os.path.join(self.folder_info, f"{game_name}{extension}")
-        if os.path.exists(path):
+    @staticmethod
+    def _conf_paths(args, cwd):
+        return [os.path.join(cwd, path) for flag, path in zip(args, args[1:]) if flag == "-conf"]
+
+    @staticmethod
+    def _conf_hash(paths):
+        """Short hash of the contents of the conf files, i.e. of the configuration a session ran with."""
+        h = hashlib.sha1()
+        for path in paths:
             try:
-                with open(path, 'r', encoding='utf-8') as f: return f.read().strip()
-            except: pass
-        return ""
+                with open(path, 'rb') as f: h.update(f.read())
+            except OSError: pass
+        return h.hexdigest()[:16]
+
+    def _start_session(self, name, args, folder, after=None, exe=None, claimed=False):
+        """Starts a supervised DOSBox session. Screenshots are imported while it runs; when it ends
+        it is written to the session log before `after(session)` runs."""
+        watcher = self._watch_captures(name, folder)
+        def on_exit(session):
+            watcher.stop()
+            try: self._record_session(session)
+            finally:
+                if after: after(session)
+        paths = self._conf_paths(args, folder)
+        try:
+            return self.sessions.start(name, args, folder, on_exit=on_exit, exe=exe, log_path=self._session_log(name), conf_hash=self._conf_hash(paths),
+                                       cycles=self.conf_layers.resolve(paths).get("cpu", "cycles") or None, claimed=claimed)
+        except BaseException:
+            watcher.stop()
+            raise
+
+    def _record_session(self, session):
+        avg_cpu, samples = session.avg_cpu, session.cpu_samples
+        busy = round(sum(1 for c in samples if c >= SATURATED_CPU) / len(samples), 3) if samples else None
+        self.db.add_session(session.game, session.start_time, session.end_time, session.exit_code, session.exe, session.conf_hash,
+                            session.peak_rss or None, round(avg_cpu, 1) if avg_cpu is not None else None,
+                            session.cycles, percentile(samples, 0.9), busy)
+        if self.settings.get("auto_cycles") and session.exe != "prompt":
+            try: self._auto_tune_cycles(session)
+            except Exception as e: print(f"Cycles tuning error: {e}")
+        if self.on_session_end:
+            try: self.on_session_end(session.game)
+            except Exception as e: print(f"Session callback error: {e}")
+
+    def cycles_recommendation(self, game_name):
+        """(current cycles, p90 CPU loads of recent sessions with them, recommended cycles or None)
+        for keeping the game's DOSBox under the `cycles_target_cpu` setting."""
+        cycles = self.resolve_game_config(game_name).get("cpu", "cycles")
+        loads = self.db.cpu_loads(game_name, cycles)
+        return cycles, loads, recommend_cycles(cycles, loads, self.settings.get("cycles_target_cpu") or 70)
+
+    def _auto_tune_cycles(self, session):
+        """Applies the cycles recommendation after a session of an installed game that ran with its current cycles."""
+        if not os.path.isdir(os.path.join(self.installed_dir, session.game)): return
+        cycles, _, recommended = self.cycles_recommendation(session.game)
+        if not recommended or cycles != session.cycles: return
+        config_data = {'cpu': {'cycles': recommended, 'cycles_protected': recommended}, 'extra': self.load_extra_config(session.game)}
+        self.write_game_config(session.game, config_data)
+        print(f"Cycles of {session.game}: {cycles} -> {recommended}")
+
+    def get_play_stats(self, game_name=None):
+        """{game: (last_played, total_time, seconds played in the last RECENT_PLAY_DAYS days)}."""
+        return self.db.play_stats(time.time() - RECENT_PLAY_DAYS * 86400, game_name)
+
+    def get_session_history(self, game_name, limit=20):
+        return self.db.game_sessions(game_name, limit)
+
+    def _after_session(self, game_name, folder, session):
+        """Post-exit work of an installed game's session (runs on the supervisor's exit thread)."""
+        for f in ["stdout.txt", "stderr.txt"]:
+            fp = os.path.join(folder, f)
+            if os.path.exists(fp):
+                try: os.remove(fp)
+                except: pass
+        self.invalidate_install_size(game_name)
+        self.import_screenshots_from_capture(folder, game_name, session.start_time)
+        self.backup_session_saves(game_name, folder, session.start_time)
+
+    def dosbox_flavor(self, db_exe):
+        """'staging', 'x' or 'dosbox' from the `-version` output of a DOSBox executable, cached per
+        file. Builds that print nothing recognizable (e.g. to stdout.txt on Windows) count as 'dosbox'."""
+        try: key = (db_exe, os.stat(db_exe).st_mtime_ns)
+        except OSError: return "dosbox"
+        if key not in self._dosbox_flavors:
+            try:
+                out = subprocess.run([db_exe, "-version"], capture_output=True, text=True, timeout=5, stdin=subprocess.DEVNULL,
+                                     creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+                text = (out.stdout + out.stderr).lower()
+            except (OSError, subprocess.SubprocessError): text = ""
+            self._dosbox_flavors[key] = "staging" if "staging" in text else "x" if "dosbox-x" in text else "dosbox"
+        return self._dosbox_flavors[key]
+
+    def play_from_zip(self, zip_name, force_fullscreen=False, hide_console=False):
+        """Runs a game that is not installed from the play cache, with writes going to its overlay.
+
+        Only DOSBox Staging has overlay mounts; with other builds the game runs from a writable
+        copy kept in the overlay folder instead, so its writes never reach the cached copy."""
+        name = os.path.splitext(zip_name)[0]
+        zip_path = os.path.join(self.zipped_dir, zip_name)
+        db_exe = self.get_dosbox_exe(name)
+        if not db_exe or not os.path.exists(db_exe): raise Exception(f"DOSBox EXE not found:\n{db_exe}")
+        if not os.path.exists(zip_path): raise Exception("ZIP not found")
 
-    def load_extra_config(self, game_name):
-        path = os.path.join(self.folder_info, f"{game_name}.extra")
-        if os.path.exists(path):
+        command_args = [db_exe]
+        if force_fullscreen: command_args.append("--fullscreen")
+        if hide_console: command_args.append("-noconsole")
+
+        self.sessions.claim(name)
+
+        def run_cached():
+            try:
+                folder = self.play_cache.prepare(name, zip_path)
+                overlay = self.play_cache.overlay(name)
+                if self.dosbox_flavor(db_exe) != "staging": folder, overlay = self.play_cache.writable_copy(name), None
+            except Exception as e:
+                self.sessions.unclaim(name)
+                print(f"Play cache error: {e}"); return
+            def after(session):
+                try: self.import_screenshots_from_capture(folder, name, session.start_time)
+                finally: self.play_cache.release(name)
             try:
-                with open(path, 'r') as f: return json.load(f)
+                conf = self.play_cache.conf_path(name)
+                config_data = {'extra': self.load_extra_config(name)}
+                self.write_game_config(name, config_data, game_folder=folder, conf_path=conf, overlay_dir=overlay)
+                self._start_session(name, command_args + self.conf_args(name, conf), folder, after=after,
+                                    exe=self.main_exe(name, folder), claimed=True)
+            except Exception as e:
+                self.sessions.unclaim(name)
+                self.play_cache.release(name)
+                print(f"Run Error: {e}")
+
+        threading.Thread(target=run_cached, daemon=True).start()
+
+    def load_meta(self, game_name, extension):
+        return self.db.get(game_name, extension)
+
+    @staticmethod
+    def _normalize_meta(row):
+        rating = (row.get("rating") or "").strip()
+        return {
+            "genre": row.get("genre") or "", "year": row.get("year") or "", "company": row.get("company") or "",
+            "rating": int(rating) if rating.isdigit() else 0, "favorite": bool(row.get("favorite"))
+        }
+
+    def get_library_meta(self):
+        """Metadata of every game from one bulk query: {game_name: {genre, year, company, rating, favorite}}."""
+        return {name: self._normalize_meta(row) for name, row in self.db.all_rows().items()}
+
+    def get_game_meta(self, game_name):
+        return self._normalize_meta(self.db.get_row(game_name))
+
+    def make_catalog_entry(self, zip_name, is_installed, library_meta=None, play_stats=None):
+        name = os.path.splitext(zip_name)[0]
+        meta = library_meta.get(name) if library_meta is not None else self.get_game_meta(name)
+        stats = (play_stats if play_stats is not None else self.get_play_stats(name)).get(name)
+        hdd_size = self.get_install_size(name) if is_installed and self.installed_dir else 0
+        return CatalogEntry(zip_name, is_installed, meta, self.scanner.zip_size(zip_name), hdd_size, stats)
+
+    def build_catalog(self):
+        """Builds the in-memory Catalog from one scan and one bulk metadata query."""
+        game_list, installed = self.get_game_list()
+        rows = self.db.all_rows()
+        library_meta = {name: self._normalize_meta(row) for name, row in rows.items()}
+        self._sync_search_index(game_list, rows)
+        play_stats = self.get_play_stats()
+        return Catalog((self.make_catalog_entry(z, z in installed, library_meta, play_stats) for z in game_list), index=self.search_index)
+
+    @staticmethod
+    def _index_fields(row):
+        return {col: row.get(col) or "" for col in set(TEXT_FIELDS) | set(NUMERIC_FIELDS) if col != "name"}
+
+    def _sync_search_index(self, game_list, rows):
+        """Builds the search index once; later calls only add/remove games that appeared or vanished."""
+        names = {os.path.splitext(z)[0] for z in game_list}
+        if self.search_index is None:
+            self.search_index = SearchIndex()
+            for name in names: self.search_index.add(name, self._index_fields(rows.get(name, {})))
+            return
+        for name in self.search_index.doc_ids():
+            if name not in names: self.search_index.remove(name)
+        for name in names:
+            if name not in self.search_index: self.search_index.add(name, self._index_fields(rows.get(name, {})))
+
+    def update_catalog(self, catalog, delta):
+        """Applies a ScanDelta to an existing Catalog, using the installed set of the scan that
+        produced it (scanning again here would swallow changes made in between)."""
+        for zip_name in delta.removed:
+            catalog.remove(zip_name)
+            if self.search_index is not None: self.search_index.remove(os.path.splitext(zip_name)[0])
+        if delta.added or delta.changed:
+            for zip_name in delta.added | delta.changed:
+                catalog.put(self.make_catalog_entry(zip_name, zip_name in delta.installed))
+            if self.search_index is not None:
+                for zip_name in delta.added:
+                    name = os.path.splitext(zip_name)[0]
+                    self.search_index.add(name, self._index_fields(self.db.get_row(name)))
+
+    def refresh_catalog_entry(self, catalog, zip_name):
+        """Re-reads one game's metadata into the catalog after it was edited in the app."""
+        entry = catalog.get(zip_name)
+        if entry is None: return None
+        entry = self.make_catalog_entry(zip_name, entry.installed)
+        catalog.put(entry)
+        return entry
+
+    def load_extra_config(self, game_name):
+        raw = self.load_meta(game_name, ".extra")
+        if raw:
+            try: return json.loads(raw)
             except: pass
         return {}
     
     def save_extra_config(self, game_name, data):
-        os.makedirs(self.folder_info, exist_ok=True)
-        path = os.path.join(self.folder_info, f"{game_name}.extra")
-        try:
-            with open(path, 'w') as f: json.dump(data, f)
-        except: pass
+        self.save_meta(game_name, ".extra", json.dumps(data))
     
     def load_rating(self, game_name):
         val = self.load_meta(game_name, ".rating")
         return int(val) if val.isdigit() else 0
 
     def is_favorite(self, game_name):
-        return os.path.exists(os.path.join(self.folder_info, f"{game_name}.fav"))
+        return bool(self.load_meta(game_name, ".fav"))
 
     def toggle_favorite(self, game_name):
-        os.makedirs(self.folder_info, exist_ok=True)
-        path = os.path.join(self.folder_info, f"{game_name}.fav")
-        if os.path.exists(path):
-            os.remove(path)
-            return False
-        else:
-            with open(path, 'w') as f: f.write("1")
-            return True
+        is_fav = not self.is_favorite(game_name)
+        self.save_meta(game_name, ".fav", "1" if is_fav else "")
+        return is_fav
 
     def save_meta(self, game_name, extension, value):
-        os.makedirs(self.folder_info, exist_ok=True)
-        path = os.path.join(self.folder_info, f"{game_name}{extension}")
-        try:
-            with open(path, 'w', encoding='utf-8') as f: f.write(str(value))
-        except: pass
+        try: self.db.set(game_name, extension, value)
+        except Exception as e: print(f"Meta save error: {e}"); return
+        if self.search_index is not None: self.search_index.update_field(game_name, META_COLUMNS[extension], value)
 
     def load_exe_map(self, game_name):
-        path = os.path.join(self.folder_info, f"{game_name}.exes.json")
+        raw = self.load_meta(game_name, ".exes.json")
         data = {}
-        if os.path.exists(path):
+        if raw:
             try:
-                with open(path, 'r') as f:
-                    raw = json.load(f)
-                    for k, v in raw.items():
-                        if isinstance(v, str): data[k] = {"role": v, "title": ""}
-                        else: data[k] = v
+                for k, v in json.loads(raw).items():
+                    if isinstance(v, str): data[k] = {"role": v, "title": ""}
+                    else: data[k] = v
             except: pass
         return data
 
     def save_exe_map(self, game_name, mapping):
-        os.makedirs(self.folder_info, exist_ok=True)
-        path = os.path.join(self.folder_info, f"{game_name}.exes.json")
-        try:
-            with open(path, 'w') as f: json.dump(mapping, f, indent=4)
-        except: pass
+        self.save_meta(game_name, ".exes.json", json.dumps(mapping, indent=4))
 
-    def scan_game_executables(self, zip_name):
-        game_folder = self.find_game_folder(zip_name)
-        exes = []
-        if not os.path.exists(game_folder): return []
-        for root, _, files in os.walk(game_folder):
-            if "dosbox" in root.lower(): continue 
-            for f in files:
-                if f.lower().endswith(('.exe', '.com', '.bat')):
-                    full_path = os.path.join(root, f)
-                    rel_path = os.path.relpath(full_path, game_folder)
-                    exes.append(rel_path)
-        return sorted(exes)
+    def scan_game_executables(self, zip_name, game_folder=None):
+        return list(self.classify_game_executables(zip_name, game_folder))
+
+    def classify_game_executables(self, zip_name, game_folder=None):
+        """{relative path: EXE_* kind} from the cached exe index."""
+        game_folder = game_folder or self.find_game_folder(zip_name)
+        if not os.path.exists(game_folder): return {}
+        return self.exe_index.scan(os.path.splitext(zip_name)[0], game_folder)
+
+    def suggest_main_exe(self, zip_name, game_folder=None):
+        name = os.path.splitext(zip_name)[0]
+        return ExeIndex.suggest_main(name, self.classify_game_executables(zip_name, game_folder))
     
+    def main_exe(self, game_name, game_folder=None):
+        """The executable marked as main in the exe map, else the suggested one, else None."""
+        for rel, info in self.load_exe_map(game_name).items():
+            if info.get("role") == ROLE_MAIN: return rel
+        return self.suggest_main_exe(game_name + ".zip", game_folder)
+
     def get_mounted_isos(self, game_name):
         game_folder = os.path.join(self.installed_dir, game_name)
         cd_folder = os.path.join(game_folder, "cd")
@@ -181,107 +420,212 @@ class GameLogic:
         return isos
 
     def backup_game_saves(self, zip_name):
+        """Takes an incremental snapshot of the game's save files and applies the retention policy."""
         game_name = os.path.splitext(zip_name)[0]
         game_folder = self.find_game_folder(zip_name)
         if not os.path.exists(game_folder): return False, "Game not installed"
 
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        backup_subdir = os.path.join(self.folder_backups, game_name)
-        os.makedirs(backup_subdir, exist_ok=True)
-        
-        backup_zip_path = os.path.join(backup_subdir, f"save_backup_{timestamp}.zip")
-        
-        save_extensions = ('.sav', '.gam', '.dat', '.cfg', '.hi', '.scr', '.srm')
-        files_to_backup = []
-        
-        for root, _, files in os.walk(game_folder):
-            for f in files:
-                lower = f.lower()
-                if lower.endswith(save_extensions) or lower.startswith("save"):
-                    full_path = os.path.join(root, f)
-                    rel_path = os.path.relpath(full_path, game_folder)
-                    files_to_backup.append((full_path, rel_path))
-        
+        files_to_backup = self.save_vault.index(game_name).candidates(game_folder)
         if not files_to_backup:
             return False, "No save files found (tried .sav, .gam, .dat...)"
-            
+
         try:
-            with zipfile.ZipFile(backup_zip_path, 'w') as z:
-                for full, rel in files_to_backup:
-                    z.write(full, rel)
-            return True, f"Backed up {len(files_to_backup)} files to:\n{os.path.basename(backup_zip_path)}"
+            snap_id, count, changed, new_bytes = self.save_vault.snapshot(game_name, game_folder, files_to_backup)
+            if not snap_id: return True, "No changes since the last backup."
+            self._prune_save_backups(game_name)
+            return True, f"Backed up {count} files ({changed} changed, {format_size(new_bytes)} new) to snapshot:\n{snap_id}"
+        except Exception as e:
+            return False, str(e)
+
+    def _prune_save_backups(self, game_name):
+        self.save_vault.prune(game_name, self.settings.get("backup_keep_last") or 10,
+                              self.settings.get("backup_keep_daily") or 7, self.settings.get("backup_keep_weekly") or 4)
+
+    @staticmethod
+    def _files_changed_since(folder, since):
+        """Relative paths of files modified at or after `since`, from one stat pass over `folder`."""
+        changed, stack = [], [""]
+        while stack:
+            rel = stack.pop()
+            try:
+                with os.scandir(os.path.join(folder, rel) if rel else folder) as it:
+                    for e in it:
+                        path = os.path.join(rel, e.name) if rel else e.name
+                        if e.is_dir(follow_symlinks=False):
+                            if path.lower() not in SESSION_IGNORE: stack.append(path)
+                        elif e.name.lower() not in SESSION_IGNORE and not e.name.lower().endswith(".png"):
+                            try:
+                                if e.stat().st_mtime >= since: changed.append(path)
+                            except OSError: pass
+            except OSError: continue
+        return changed
+
+    def backup_session_saves(self, game_name, game_folder, start_time):
+        """Post-session backup: files the game wrote while it ran are remembered as saves and a
+        snapshot of all candidate saves is taken, as by a manual backup (only changed files are read)."""
+        if not self.settings.get("auto_backup_saves"): return None
+        try:
+            # Tolerancia pre 2 s rozlíšenie časov na FAT
+            changed = self._files_changed_since(game_folder, start_time - 2)
+            if not changed: return None
+            index = self.save_vault.index(game_name)
+            index.add_known(changed)
+            # Aj saves nájdené podľa prípony, inak by ich najnovší snapshot nemal
+            snap_id = self.save_vault.snapshot(game_name, game_folder, index.candidates(game_folder))[0]
+            if snap_id:
+                self._prune_save_backups(game_name)
+            return snap_id
+        except Exception as e:
+            print(f"Auto backup error: {e}")
+            return None
+
+    def list_save_backups(self, game_name):
+        return self.save_vault.snapshots(game_name)
+
+    def restore_game_saves(self, zip_name, snap_id):
+        game_name = os.path.splitext(zip_name)[0]
+        game_folder = self.find_game_folder(zip_name)
+        if not os.path.exists(game_folder): return False, "Game not installed"
+        try:
+            count = self.save_vault.restore(game_name, snap_id, game_folder)
+            self.invalidate_install_size(game_name)
+            return True, f"Restored {count} files from snapshot {snap_id}."
         except Exception as e:
             return False, str(e)
 
     def read_dosbox_param(self, conf_path, section, key):
-        if not os.path.exists(conf_path): return ""
+        return load_cached(conf_path).get(section, key)
+
+    def list_config_profiles(self):
+        return self.conf_layers.profiles()
+
+    def get_game_profile(self, game_name):
+        return self.load_extra_config(game_name).get("profile", "")
+
+    def base_conf_layers(self, game_name, profile=None):
+        """Conf files under the game's own dosbox.conf: launcher defaults, global template, profile."""
+        if profile is None: profile = self.get_game_profile(game_name) if game_name else ""
+        return self.conf_layers.layers(self.settings.get("global_conf"), profile)
+
+    def conf_args(self, game_name, conf_path):
+        """-conf arguments for DOSBox: every layer of the game, its own dosbox.conf last."""
+        args = []
+        for path in self.base_conf_layers(game_name) + [conf_path]: args += ["-conf", path]
+        return args
+
+    @staticmethod
+    def _default_cycles(lower, is_protected):
+        """Cycles a game gets without its own value. Protected-mode games get the protected
+        default unless the template or profile changed the launcher's real-mode one."""
+        cycles = lower.get("cpu", "cycles")
+        if is_protected and cycles == DEFAULT_GAME_CONFIG['cpu']['cycles']: return DEFAULT_GAME_CONFIG['cpu']['cycles_protected']
+        return cycles
+
+    def _layer_value(self, lower, section, key, is_protected):
+        """What a game gets for a key when its dosbox.conf doesn't set it."""
+        if (section, key) == ("cpu", "cycles"): return self._default_cycles(lower, is_protected)
+        return lower.get(section, key)
+
+    def minimize_game_config(self, game_name, game_folder=None):
+        """Reduces a game's dosbox.conf to its own layer, so template and profile changes reach it.
+        Returns the number of removed keys.
+
+        Removed are values equal to what the lower layers give and, for games without a profile,
+        values equal to the launcher defaults: confs written before configs were layered hold
+        the full baseline, whose values were defaults rather than choices of the player. A game
+        with a profile got its conf from the layered writer, so a value there that differs from
+        the profile was chosen and is kept."""
+        game_folder = game_folder or os.path.join(self.installed_dir, game_name)
+        conf_path = os.path.join(game_folder, "dosbox.conf")
+        if not os.path.isfile(conf_path): return 0
+        conf = load_cached(conf_path).copy()
+        layers = [self.conf_layers.resolve(self.base_conf_layers(game_name))]
+        if not self.get_game_profile(game_name): layers.append(self.conf_layers.resolve([self.conf_layers.base_path()]))
+        is_protected = None
+        removed = 0
+        for section, key, value in list(conf.items()):
+            if (section, key.lower()) == ("cpu", "cycles") and is_protected is None:
+                is_protected = self.detect_protected_mode(game_name, game_folder)
+            if any(value == self._layer_value(lower, section, key.lower(), is_protected) for lower in layers):
+                conf.remove(section, key); removed += 1
+        if removed: conf.save(conf_path)
+        return removed
+
+    def _minimize_game_configs(self):
+        """One-time migration of installed games to minimal dosbox.conf layers (background thread)."""
         try:
-            with open(conf_path, 'r') as f:
-                in_section = False
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith(("#", ";", "%")): continue
-                    if line.startswith("[") and line.endswith("]"):
-                        curr = line[1:-1].strip().lower()
-                        in_section = (curr == section.lower())
-                    elif in_section and "=" in line:
-                        k, v = line.split("=", 1)
-                        if k.strip().lower() == key.lower(): return v.strip()
-        except: pass
-        return ""
-
-    def detect_protected_mode(self, game_name):
+            for e in os.scandir(self.installed_dir):
+                if e.is_dir() and not e.name.startswith("."):
+                    try: self.minimize_game_config(e.name, e.path)
+                    except Exception as ex: print(f"Conf migration error ({e.name}): {ex}")
+        except OSError: return
+        self.settings.set("confs_minimized", True); self.settings.save()
+
+    def resolve_game_config(self, game_name, game_folder=None, profile=None, with_game=True):
+        """Effective settings of a game (all layers merged); with `with_game=False` only what the
+        layers under its dosbox.conf give it, e.g. after switching to `profile`."""
+        game_folder = game_folder or os.path.join(self.installed_dir, game_name)
+        layers = self.base_conf_layers(game_name, profile)
+        lower = merged = self.conf_layers.resolve(layers)
+        own_cycles = ""
+        if with_game:
+            conf_path = os.path.join(game_folder, "dosbox.conf")
+            merged = self.conf_layers.resolve(layers + [conf_path])
+            own_cycles = load_cached(conf_path).get("cpu", "cycles")
+        if not own_cycles:
+            merged = merged.copy()
+            merged.set("cpu", "cycles", self._default_cycles(lower, self.detect_protected_mode(game_name, game_folder)))
+        return merged
+
+    def detect_protected_mode(self, game_name, game_folder=None):
+        return self.get_dos_extender(game_name, game_folder)[0] is not None
+
+    def get_dos_extender(self, game_name, game_folder=None):
+        """(extender name, path relative to the game folder) from the cached exe index, or (None, None)."""
         zip_input = game_name + ".zip" if not game_name.endswith(".zip") else game_name
-        game_folder = self.find_game_folder(zip_input)
-        if not os.path.exists(game_folder): return False
-        target_files = {'dos4gw.exe', 'dos32.exe'}
-        for root, _, files in os.walk(game_folder):
-            for f in files:
-                if f.lower() in target_files: return True
-        return False
-
-    def write_game_config(self, game_name, config_data):
-        game_folder = os.path.join(self.installed_dir, game_name)
-        conf_path = os.path.join(game_folder, "dosbox.conf")
-        
-        legacy_autoexec = []
-        if os.path.exists(conf_path):
-            try:
-                with open(conf_path, 'r') as f:
-                    lines = f.readlines()
-                    in_backup = False
-                    for line in lines:
-                        if "# --- ORIGINAL CONFIGURATION" in line: in_backup = True; continue
-                        if "# --- LAUNCHER GENERATED" in line: in_backup = False; continue
-                        if in_backup: legacy_autoexec.append(line)
-            except: pass
+        game_folder = game_folder or self.find_game_folder(zip_input)
+        if not os.path.exists(game_folder): return None, None
+        return self.exe_index.extender(os.path.splitext(zip_input)[0], game_folder)
+
+    def write_game_config(self, game_name, config_data, game_folder=None, conf_path=None, overlay_dir=None):
+        """Writes the game's dosbox.conf. `game_folder`/`conf_path` default to the installed game;
+        with `overlay_dir`, C: gets a write overlay (DOSBox Staging `mount -t overlay`).
+
+        The file is only the game's layer over base_conf_layers(): a value equal to what the
+        layers below give is removed from it instead of written, so later changes to the
+        template or profile reach the game. Keys, sections and comments the launcher doesn't
+        manage are kept, only the launcher generated part of [autoexec] is rebuilt."""
+        game_folder = game_folder or os.path.join(self.installed_dir, game_name)
+        conf_path = conf_path or os.path.join(game_folder, "dosbox.conf")
+        conf = load_cached(conf_path).copy()
+        lower = self.conf_layers.resolve(self.base_conf_layers(game_name))
+
+        def put(section, key, value):
+            if str(value) == self._layer_value(lower, section, key, is_protected): conf.remove(section, key)
+            else: conf.set(section, key, value)
+
+        legacy_autoexec, in_backup = [], False
+        for line in conf.autoexec():
+            if "# --- ORIGINAL CONFIGURATION" in line: in_backup = True; continue
+            if "# --- LAUNCHER GENERATED" in line: in_backup = False; continue
+            if in_backup: legacy_autoexec.append(line.strip())
+
+        is_protected = self.detect_protected_mode(game_name, game_folder)
 
-        is_protected = self.detect_protected_mode(game_name)
-        content = []
-        
         for section in ['sdl', 'render', 'dosbox', 'dos', 'sblaster', 'gus', 'speaker', 'midi', 'mixer']:
-            if section in config_data:
-                content.append(f"[{section}]")
-                for k, v in config_data.get(section, {}).items():
-                     content.append(f"{k}={v}")
-                content.append("")
-
-        content.append("[cpu]")
-        content.append(f"core={config_data['cpu']['core']}")
-        content.append(f"cputype={config_data['cpu']['cputype']}")
-        
-        if is_protected:
-            val = config_data['cpu'].get('cycles_protected', '60000')
-            content.append(f"cycles={val}")
-        else:
-            val = config_data['cpu'].get('cycles', '3000')
-            content.append(f"cycles={val}")
-        content.append("")
-        
-        content.append("[autoexec]")
+            for k, v in config_data.get(section, {}).items():
+                put(section, k, v)
+
+        cpu = config_data.get('cpu', {})
+        for k in ('core', 'cputype'):
+            if k in cpu: put("cpu", k, cpu[k])
+        cycles = cpu.get('cycles_protected' if is_protected else 'cycles')
+        put("cpu", "cycles", cycles or self._default_cycles(lower, is_protected))
+
+        content = []
         if legacy_autoexec:
             content.append("# --- ORIGINAL CONFIGURATION (BACKUP) ---")
-            content.extend([l.strip() for l in legacy_autoexec])
+            content.extend(legacy_autoexec)
         
         content.append("# --- LAUNCHER GENERATED CONFIG START ---")
         content.append("@echo off")
@@ -293,6 +637,10 @@ class GameLogic:
             mount_cmd = 'mount C ".\\drives\\c"'
             is_standardized = True
         content.append(mount_cmd)
+        if overlay_dir:
+            overlay_c = os.path.join(overlay_dir, "drives", "c") if is_standardized else overlay_dir
+            os.makedirs(overlay_c, exist_ok=True)
+            content.append(f'mount -t overlay C "{overlay_c}"')
         
         cd_folder = os.path.join(game_folder, "cd")
         if os.path.exists(cd_folder):
@@ -304,16 +652,7 @@ class GameLogic:
         
         content.append("C:")
         
-        exe_map = self.load_exe_map(game_name)
-        main_exe_rel = None
-        for rel, info in exe_map.items():
-            if info.get("role") == ROLE_MAIN:
-                main_exe_rel = rel
-                break
-        
-        if not main_exe_rel:
-            all_exes = self.scan_game_executables(game_name + ".zip")
-            if len(all_exes) == 1: main_exe_rel = all_exes[0]
+        main_exe_rel = self.main_exe(game_name, game_folder)
 
         if main_exe_rel:
             path_parts = main_exe_rel.replace("\\", "/").split("/")
@@ -339,8 +678,8 @@ class GameLogic:
             
         content.append("# --- LAUNCHER GENERATED CONFIG END ---")
 
-        with open(conf_path, 'w') as f:
-            f.write("\n".join(content))
+        conf.set_autoexec(content)
+        conf.save(conf_path)
 
     def get_game_images(self, game_name):
         target_dir = self.get_screens_dir(game_name)
@@ -352,18 +691,7 @@ class GameLogic:
         return sorted(images)
 
     def get_next_screenshot_name(self, game_name):
-        target_dir = self.get_screens_dir(game_name)
-        existing = os.listdir(target_dir)
-        max_idx = -1
-        pattern = re.compile(rf"^{re.escape(game_name)}(\d+)\.png$", re.IGNORECASE)
-        for f in existing:
-            m = pattern.match(f)
-            if m:
-                try:
-                    idx = int(m.group(1))
-                    if idx > max_idx: max_idx = idx
-                except: pass
-        return f"{game_name}{max_idx + 1:03d}.png"
+        return self.screenshot_names.allocate(game_name, self.get_screens_dir(game_name))
 
     def _migrate_legacy_screens(self):
         if not os.path.exists(self.folder_screens): return
@@ -409,14 +737,13 @@ class GameLogic:
         if os.path.exists(old_folder):
             try: os.rename(old_folder, new_folder)
             except: return False
+            self.invalidate_install_size(old_name)
 
-        for f in os.listdir(self.folder_info):
-            if f.startswith(old_name + "."):
-                ext = f[len(old_name):]
-                src = os.path.join(self.folder_info, f)
-                dst = os.path.join(self.folder_info, new_name + ext)
-                try: os.rename(src, dst)
-                except: pass
+        self.db.rename(old_name, new_name)
+        self.screenshot_names.forget(old_name); self.screenshot_names.forget(new_name)
+        self.db.rename_blob_refs(old_name, new_name)
+        self.play_cache.rename(old_name, new_name)
+        if self.search_index is not None: self.search_index.rename(old_name, new_name)
         
         old_screen_dir = os.path.join(self.folder_screens, old_name)
         new_screen_dir = os.path.join(self.folder_screens, new_name)
@@ -431,36 +758,34 @@ class GameLogic:
             except: pass
         return True
     
-    def install_game(self, zip_name):
+    def install_game(self, zip_name, progress=None, cancel_event=None, organized=False):
+        """Extracts and configures a game. `progress(bytes_done, bytes_total, entries_done, entries_total)`
+        reports extraction; setting `cancel_event` raises InstallCancelled and removes the partial folder.
+        With `organized`, files are extracted straight into the drives/c, cd, docs layout."""
         target = self.find_game_folder(zip_name)
         zip_path = os.path.join(self.zipped_dir, zip_name)
         if not os.path.exists(zip_path): raise Exception("ZIP not found")
         try:
             if not os.path.exists(target): os.makedirs(target)
-            with zipfile.ZipFile(zip_path, 'r') as z: z.extractall(target)
-            
-            items = os.listdir(target)
-            if len(items) == 1 and os.path.isdir(os.path.join(target, items[0])):
-                sub = os.path.join(target, items[0])
-                for f in os.listdir(sub):
-                    shutil.move(os.path.join(sub, f), os.path.join(target, f))
-                os.rmdir(sub)
+            store, known = (self.blob_store, {}) if self.settings.get("dedup_store") else (None, None)
+            link = (lambda m, dest: store.link_member(m, dest, known)) if store else None
+            # Obalový priečinok a pribalený dosbox/ sa riešia už pri rozbaľovaní
+            layout = None     # mapovanie ciest pôvodného rozloženia na organizované (aj pre overlay)
+            with zipfile.ZipFile(zip_path, 'r') as z:
+                plan = plan_install(z.infolist())
+                if organized:
+                    layout = organized_layout(plan, os.path.splitext(zip_name)[0])
+                    plan = [(m, layout(parts)) for m, parts in plan]
+                    for sub in ("cd", "docs", os.path.join("drives", "c")): os.makedirs(os.path.join(target, sub), exist_ok=True)
+                extract_plan(z, target, plan, progress, cancel_event, link)
             
-            for item in os.listdir(target):
-                if item.lower() == "dosbox" and os.path.isdir(os.path.join(target, item)):
-                    shutil.rmtree(os.path.join(target, item), ignore_errors=True)
-            
-            default_config = {
-                'sdl': {'output': 'opengl', 'fullscreen': 'false', 'windowresolution': 'default', 'fullresolution': 'desktop'},
-                'render': {'glshader': 'none', 'integer_scaling': 'false'},
-                'cpu': {'core': 'auto', 'cputype': 'auto', 'cycles': '3000', 'cycles_protected': '60000'},
-                'dosbox': {'memsize': '16'},
-                'dos': {'xms': 'true', 'ems': 'true', 'umb': 'true'},
-                'sblaster': {'sbtype': 'sb16', 'irq': '7', 'dma': '1', 'hdma': '5', 'oplmode': 'auto'},
-                'gus': {'gus': 'false'},
-                'speaker': {'pcspeaker': 'impulse', 'tandy': 'auto', 'lpt_dac': 'none'}
-            }
-            self.write_game_config(os.path.splitext(zip_name)[0], default_config)
+            self.write_game_config(os.path.splitext(zip_name)[0], {})
+            self.play_cache.apply_overlay(os.path.splitext(zip_name)[0], target, layout)
+            self.play_cache.drop(os.path.splitext(zip_name)[0])
+            if store:
+                try: store.ingest(os.path.splitext(zip_name)[0], target, known)
+                except Exception as e: print(f"Dedup error: {e}")
+            self.invalidate_install_size(os.path.splitext(zip_name)[0])
             
             return True
         except Exception as e:
@@ -471,11 +796,9 @@ class GameLogic:
         path = self.find_game_folder(zip_name)
         if os.path.exists(path):
             shutil.rmtree(path, onerror=remove_readonly)
-        name = os.path.splitext(zip_name)[0]
-        for f in os.listdir(self.folder_info):
-            if f.startswith(name + "."):
-                try: os.remove(os.path.join(self.folder_info, f))
-                except: pass
+        self.blob_store.release(os.path.splitext(zip_name)[0])
+        self.invalidate_install_size(os.path.splitext(zip_name)[0])
+        self.db.delete(os.path.splitext(zip_name)[0])
 
     def organize_game_structure(self, current_zip_name, new_full_name, dos_name_8char=None):
         old_folder = self.find_game_folder(current_zip_name)
@@ -522,7 +845,7 @@ class GameLogic:
                 if len(candidate_name) <= 8 and " " not in candidate_name:
                     final_dos_name = candidate_name.upper()
             if not final_dos_name:
-                final_dos_name = re.sub(r'[^a-zA-Z0-9]', '', new_full_name)[:8].upper()
+                final_dos_name = dos_dir_name(new_full_name)
 
         dos_game_dir = os.path.join(path_c, final_dos_name)
         if items_to_move:
@@ -541,17 +864,8 @@ class GameLogic:
                     dst = os.path.join(dos_game_dir, item)
                     shutil.move(src, dst)
         
-        default_config = {
-                'sdl': {'output': 'opengl', 'fullscreen': 'false', 'windowresolution': 'default', 'fullresolution': 'desktop'},
-                'render': {'glshader': 'none', 'integer_scaling': 'false'},
-                'cpu': {'core': 'auto', 'cputype': 'auto', 'cycles': '3000', 'cycles_protected': '60000'},
-                'dosbox': {'memsize': '16'},
-                'dos': {'xms': 'true', 'ems': 'true', 'umb': 'true'},
-                'sblaster': {'sbtype': 'sb16', 'irq': '7', 'dma': '1', 'hdma': '5', 'oplmode': 'auto'},
-                'gus': {'gus': 'false'},
-                'speaker': {'pcspeaker': 'impulse', 'tandy': 'auto', 'lpt_dac': 'none'}
-        }
-        self.write_game_config(new_full_name, default_config)
+        self.write_game_config(new_full_name, {'extra': self.load_extra_config(new_full_name)})
+        self.invalidate_install_size(new_full_name)
         return new_full_name + ".zip"
 
     def launch_dosbox_prompt(self, zip_name):
@@ -562,118 +876,92 @@ class GameLogic:
         self._launch_custom_mode(folder, None, [db_exe], mode="prompt", game_name=name)
 
     def _launch_custom_mode(self, game_folder, target_file, db_command_args, mode="exe", game_name=None):
-        def thread_target():
-            org_conf = os.path.join(game_folder, "dosbox.conf")
-            bak_conf = os.path.join(game_folder, "dosbox.conf.bak")
-            start_time = time.time()
-            try:
-                if os.path.exists(org_conf):
-                    if os.path.exists(bak_conf): os.remove(bak_conf)
-                    os.rename(org_conf, bak_conf)
-                
-                mount_cmd = 'mount C "."'
-                drives_c = os.path.join(game_folder, "drives", "c")
-                if os.path.exists(drives_c): mount_cmd = 'mount C ".\\drives\\c"'
-                
-                img_cmd = ""
-                cd_dir = os.path.join(game_folder, "cd")
-                if os.path.exists(cd_dir):
-                    valid_exts = ('.cue', '.iso', '.img', '.ccd', '.mdf')
-                    images = [f for f in sorted(os.listdir(cd_dir)) if f.lower().endswith(valid_exts)]
-                    if images:
-                        img_paths = [f'".\\cd\\{img}"' for img in images]
-                        img_cmd = f'imgmount D {" ".join(img_paths)} -t iso'
-
-                lines = []
-                try:
-                    with open(bak_conf, 'r') as f:
-                        for line in f:
-                            if '[autoexec]' in line.lower(): break
-                            lines.append(line)
-                except: pass
-
-                autoexec = ["\n[autoexec]", "@echo off", mount_cmd, img_cmd, "C:"]
-                
-                if mode == "exe" and target_file:
-                    dos_path = target_file
-                    if os.path.exists(drives_c):
-                        prefix = os.path.join("drives", "c")
-                        if target_file.startswith(prefix):
-                            dos_path = target_file[len(prefix):].lstrip(os.sep)
-                    dos_dir = os.path.dirname(dos_path)
-                    dos_exe = os.path.basename(dos_path)
-                    if dos_dir: autoexec.append(f"cd {dos_dir}")
-                    autoexec.append(f"{dos_exe}")
-                    autoexec.append("exit")
-                elif mode == "prompt":
-                    autoexec.append("cls")
-                    autoexec.append("echo DOSBox Command Mode")
-                    autoexec.append("echo -------------------")
-
-                with open(org_conf, 'w') as f:
-                    f.writelines(lines)
-                    f.write("\n".join(autoexec))
-                
-                final_command = db_command_args + ["-conf", org_conf]
-                subprocess.call(final_command, cwd=game_folder, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                
-                for f in ["stdout.txt", "stderr.txt"]:
-                    fp = os.path.join(game_folder, f)
-                    if os.path.exists(fp):
-                        try: os.remove(fp)
-                        except: pass
-                
-                if game_name:
-                    self.import_screenshots_from_capture(game_folder, game_name, start_time)
-
-            except Exception as e: print(f"Run Error: {e}")
-            finally:
-                if os.path.exists(org_conf): 
-                    try: os.remove(org_conf)
-                    except: pass
-                if os.path.exists(bak_conf):
-                    try: os.rename(bak_conf, org_conf)
-                    except: pass
+        """Runs DOSBox with a side conf whose [autoexec] starts `target_file` (or a prompt) instead
+        of the game's own. The game's dosbox.conf is only read: its settings go in as a layer
+        without [autoexec], and both files live content-addressed in the conf cache, so
+        repeated launches reuse them and the game folder is never rewritten."""
+        game_name = game_name or os.path.basename(game_folder)
+        mount_cmd = 'mount C "."'
+        drives_c = os.path.join(game_folder, "drives", "c")
+        if os.path.exists(drives_c): mount_cmd = 'mount C ".\\drives\\c"'
         
-        threading.Thread(target=thread_target, daemon=True).start()
-
-    def import_screenshots_from_capture(self, game_folder, game_name, start_time):
-        paths_to_check = []
-        conf_capture = self.settings.get("capture_dir")
+        autoexec = ["@echo off", mount_cmd]
+        cd_dir = os.path.join(game_folder, "cd")
+        if os.path.exists(cd_dir):
+            valid_exts = ('.cue', '.iso', '.img', '.ccd', '.mdf')
+            images = [f for f in sorted(os.listdir(cd_dir)) if f.lower().endswith(valid_exts)]
+            if images:
+                img_paths = [f'".\\cd\\{img}"' for img in images]
+                autoexec.append(f'imgmount D {" ".join(img_paths)} -t iso')
+        autoexec.append("C:")
         
+        if mode == "exe" and target_file:
+            dos_path = target_file
+            if os.path.exists(drives_c):
+                prefix = os.path.join("drives", "c")
+                if target_file.startswith(prefix):
+                    dos_path = target_file[len(prefix):].lstrip(os.sep)
+            dos_dir = os.path.dirname(dos_path)
+            dos_exe = os.path.basename(dos_path)
+            if dos_dir: autoexec.append(f"cd {dos_dir}")
+            autoexec.append(f"{dos_exe}")
+            autoexec.append("exit")
+        elif mode == "prompt":
+            autoexec.append("cls")
+            autoexec.append("echo DOSBox Command Mode")
+            autoexec.append("echo -------------------")
+
+        side = DosboxConf()
+        side.set_autoexec(autoexec)
+        layers = self.base_conf_layers(game_name)
+        game_conf = os.path.join(game_folder, "dosbox.conf")
+        if os.path.exists(game_conf): layers.append(self.conf_layers.settings_only(game_conf))
+        layers.append(self.conf_layers.write_cached(side, "launch"))
+        final_command = list(db_command_args)
+        for path in layers: final_command += ["-conf", path]
+        self._start_session(game_name, final_command, game_folder, exe=target_file if mode == "exe" else mode,
+                            after=lambda session: self._after_session(game_name, game_folder, session))
+
+    def _capture_dirs(self, game_folder):
+        """[(folder, check_time)] where DOSBox may leave screenshots of a game in `game_folder`;
+        files in shared folders (check_time) only belong to the game when written during its session."""
+        dirs = []
+        conf_capture = self.settings.get("capture_dir")
         if conf_capture:
-            if os.path.isabs(conf_capture):
-                if os.path.exists(conf_capture):
-                    paths_to_check.append((conf_capture, True))
-            else:
-                local_path = os.path.join(game_folder, conf_capture)
-                if os.path.exists(local_path):
-                     paths_to_check.append((local_path, False))
-        
-        local_cap = os.path.join(game_folder, "capture")
-        if os.path.exists(local_cap) and local_cap not in [p[0] for p in paths_to_check]:
-            paths_to_check.append((local_cap, False)) 
-        paths_to_check.append((game_folder, True))
-
+            if os.path.isabs(conf_capture): dirs.append((os.path.normpath(conf_capture), True))
+            else: dirs.append((os.path.normpath(os.path.join(game_folder, conf_capture)), False))
+        local_cap = os.path.normpath(os.path.join(game_folder, "capture"))
+        if local_cap not in [d for d, _ in dirs]: dirs.append((local_cap, False))
+        dirs.append((os.path.normpath(game_folder), True))
+        return dirs
+
+    def _watch_captures(self, game_name, game_folder):
+        """Started watcher importing screenshots of `game_name` as DOSBox writes them."""
+        return CaptureWatcher([d for d, _ in self._capture_dirs(game_folder)], lambda path: self._import_capture(game_name, path)).start()
+
+    def _import_capture(self, game_name, src_path):
         target_dir = self.get_screens_dir(game_name)
-        
-        for source_dir, check_time in paths_to_check:
-            if not os.path.exists(source_dir): continue
-            for f in os.listdir(source_dir):
-                if f.lower().endswith(".png"):
-                    src_path = os.path.join(source_dir, f)
-                    if os.path.dirname(src_path) == target_dir: continue
-
-                    if check_time:
-                        ctime = os.path.getmtime(src_path)
-                        if ctime < start_time: continue
-                     
-                    new_name = self.get_next_screenshot_name(game_name)
-                    dst_path = os.path.join(target_dir, new_name)
-                    try:
-                        time.sleep(0.1)
-                        shutil.move(src_path, dst_path)
-                    except: pass
+        if os.path.dirname(src_path) == target_dir: return False
+        dst_path = os.path.join(target_dir, self.get_next_screenshot_name(game_name))
+        try: shutil.move(src_path, dst_path)
+        except OSError: return False    # napr. už importovaný iným watcherom zdieľaného capture priečinka
+        if self.on_screenshot:
+            try: self.on_screenshot(game_name, dst_path)
+            except Exception as e: print(f"Screenshot callback error: {e}")
+        return True
+
+    def import_screenshots_from_capture(self, game_folder, game_name, start_time):
+        """Final sweep after a session for screenshots its watcher did not import (e.g. still
+        being written when DOSBox exited)."""
+        for source_dir, check_time in self._capture_dirs(game_folder):
+            try:
+                with os.scandir(source_dir) as it: entries = [e for e in it if e.name.lower().endswith(".png") and e.is_file()]
+            except OSError: continue
+            for e in sorted(entries, key=lambda e: e.name):
+                try:
+                    if check_time and e.stat().st_mtime < start_time: continue
+                except OSError: continue
+                self._import_capture(game_name, e.path)
 
     def open_config_in_notepad(self, zip_name):
         name = os.path.splitext(zip_name)[0]
@@ -0,0 +1,145 @@
+import os
+import stat
+import shutil
+import threading
+import zipfile
+
+from extractor import plan_install, extract_plan
+
+READY_MARKER = ".ready"
+
+class PlayCache:
+    """Extracted copies of not-installed games for "play without installing".
+
+    A game is extracted into `cache_dir`/<name>/game the first time it is played and reused
+    afterwards. That copy is treated as read-only: DOSBox mounts it as C: with a per-game
+    overlay directory (`overlay_dir`/<name>) on top, so saves and config changes never touch
+    the cached files or the zip and survive eviction. DOSBox builds without overlay mounts run
+    the game from a full writable copy in that same folder instead (`writable_copy`). Copies are evicted least recently
+    played first once the cache grows past `budget_mb`. A copy whose zip has changed since it
+    was extracted is extracted again.
+    """
+
+    def __init__(self, cache_dir, overlay_dir, budget_mb=4096):
+        self.cache_dir = cache_dir
+        self.overlay_dir = overlay_dir
+        self.budget = int(budget_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._extract_lock = threading.Lock()
+        self._in_use = {}   # name -> počet bežiacich relácií
+
+    def entry_dir(self, name): return os.path.join(self.cache_dir, name)
+    def game_dir(self, name): return os.path.join(self.cache_dir, name, "game")
+    def conf_path(self, name): return os.path.join(self.cache_dir, name, "dosbox.conf")
+
+    def overlay(self, name):
+        path = os.path.join(self.overlay_dir, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @staticmethod
+    def _read_marker(marker):
+        """(extracted bytes, zip signature) from a ready marker; raises OSError/ValueError."""
+        with open(marker) as f: size, _, sig = f.read().partition("\n")
+        return int(size), sig.strip()
+
+    @staticmethod
+    def _zip_signature(zip_path):
+        st = os.stat(zip_path)
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    def prepare(self, name, zip_path, progress=None, cancel_event=None):
+        """Returns the cached game folder, extracting the zip on first use. Marks it in use
+        until release(name) is called, so eviction never removes a running game."""
+        with self._lock:
+            self._in_use[name] = self._in_use.get(name, 0) + 1
+        try:
+            marker = os.path.join(self.entry_dir(name), READY_MARKER)
+            sig = self._zip_signature(zip_path)
+            with self._extract_lock:
+                try: fresh = self._read_marker(marker)[1] == sig
+                except (OSError, ValueError): fresh = False
+                if not fresh:
+                    tmp = self.game_dir(name) + ".part"
+                    shutil.rmtree(tmp, ignore_errors=True)
+                    os.makedirs(tmp)
+                    with zipfile.ZipFile(zip_path, 'r') as z:
+                        plan = plan_install(z.infolist())
+                        extract_plan(z, tmp, plan, progress, cancel_event)
+                    shutil.rmtree(self.game_dir(name), ignore_errors=True)
+                    os.replace(tmp, self.game_dir(name))
+                    with open(marker, 'w') as f: f.write(f"{sum(m.file_size for m, _ in plan)}\n{sig}")
+            os.utime(marker)
+        except BaseException:
+            self.release(name)
+            shutil.rmtree(self.game_dir(name) + ".part", ignore_errors=True)
+            raise
+        self.evict()
+        return self.game_dir(name)
+
+    def release(self, name):
+        with self._lock:
+            left = self._in_use.get(name, 0) - 1
+            if left > 0: self._in_use[name] = left
+            else: self._in_use.pop(name, None)
+
+    def entries(self):
+        """[(name, size, last_played)] for every complete cached game."""
+        out = []
+        if not os.path.isdir(self.cache_dir): return out
+        for name in os.listdir(self.cache_dir):
+            marker = os.path.join(self.cache_dir, name, READY_MARKER)
+            try: out.append((name, self._read_marker(marker)[0], os.path.getmtime(marker)))
+            except (OSError, ValueError): continue
+        return out
+
+    def evict(self):
+        """Removes least recently played copies until the cache fits the budget."""
+        entries = sorted(self.entries(), key=lambda e: e[2])
+        used = sum(size for _, size, _ in entries)
+        for name, size, _ in entries:
+            if used <= self.budget: break
+            with self._lock:
+                if name in self._in_use: continue
+            self.drop(name)
+            used -= size
+
+    def drop(self, name):
+        """Deletes a cached copy (the overlay with the player's changes is kept)."""
+        shutil.rmtree(self.entry_dir(name), ignore_errors=True)
+
+    def writable_copy(self, name):
+        """Copies the prepared game into its overlay folder and returns that folder, for DOSBox
+        builds without overlay mounts. Files already there are the player's and are kept."""
+        src, dst = self.game_dir(name), self.overlay(name)
+        for root, dirs, files in os.walk(src):
+            out = os.path.join(dst, os.path.relpath(root, src))
+            os.makedirs(out, exist_ok=True)
+            for f in files:
+                if not os.path.exists(os.path.join(out, f)): shutil.copy2(os.path.join(root, f), os.path.join(out, f))
+        return dst
+
+    def apply_overlay(self, name, target, dest=None):
+        """Copies the overlay of a played-from-zip game onto its fresh install, then removes it.
+        `dest(parts)` maps a path in the overlay to its path in `target` when the install uses
+        another layout than the cached copy (organized installs)."""
+        src = os.path.join(self.overlay_dir, name)
+        if not os.path.isdir(src): return
+        for root, _, files in os.walk(src):
+            for f in files:
+                parts = os.path.relpath(os.path.join(root, f), src).split(os.sep)
+                dst = os.path.join(target, *(dest(parts) if dest else parts))
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                # Nový súbor namiesto prepisu: cieľ môže byť hardlink zdieľaný s inými hrami
+                if os.path.lexists(dst):
+                    if os.name == "nt": os.chmod(dst, stat.S_IWRITE)
+                    os.remove(dst)
+                shutil.copy2(os.path.join(root, f), dst)
+        shutil.rmtree(src, ignore_errors=True)
+
+    def rename(self, old_name, new_name):
+        for base in (self.cache_dir, self.overlay_dir):
+            old, new = os.path.join(base, old_name), os.path.join(base, new_name)
+            if os.path.exists(old) and not os.path.exists(new):
+                try: os.rename(old, new)
+                except OSError: pass
@@ -0,0 +1,188 @@
+import os
+import json
+import hashlib
+import datetime
+import threading
+import zlib
+
+from dir_index import DirIndex
+
+CHUNK_SIZE = 1024 * 1024
+SNAPSHOT_FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+def is_save_candidate(filename, extensions):
+    lower = filename.lower()
+    return lower.endswith(extensions) or lower.startswith("save")
+
+class SaveIndex:
+    """Cached list of candidate save files in a game folder, persisted as JSON.
+
+    The directory walk is a DirIndex, so a refresh only stats directories. Paths that were
+    seen being written during play (`add_known`) are kept as candidates even when their name
+    doesn't look like a save.
+    """
+
+    def __init__(self, path, extensions):
+        self.path = path
+        dirs, self._known = {}, set()
+        try:
+            with open(path, 'r', encoding='utf-8') as f: data = json.load(f)
+            dirs, self._known = data.get("dirs", {}), set(data.get("known", []))
+        except (OSError, ValueError): pass
+        self._dirs = DirIndex(lambda name: is_save_candidate(name, extensions), dirs)
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"dirs": self._dirs.to_json(), "known": sorted(self._known)}, f)
+        os.replace(tmp, self.path)
+
+    def add_known(self, rel_paths):
+        new = set(rel_paths) - self._known
+        if new: self._known |= new; self._save()
+
+    @property
+    def known(self): return set(self._known)
+
+    def candidates(self, folder):
+        """Relative paths of every candidate save file currently in `folder`."""
+        out, dirty = self._dirs.refresh(folder)
+        if dirty: self._save()
+        seen = set(out)
+        out.extend(k for k in sorted(self._known) if k not in seen and os.path.isfile(os.path.join(folder, k)))
+        return out
+
+class SaveVault:
+    """Incremental save-game snapshots with content-addressed, deduplicated storage.
+
+    Files are split into CHUNK_SIZE chunks stored once, zlib-compressed, under
+    `root`/.chunks/<h[:2]>/<sha256>, shared by every game. A snapshot is a small JSON manifest
+    (`root`/<game>/snapshots/<id>.json) mapping each relative path to its size, mtime and
+    chunk list. Files whose size and mtime match the previous snapshot are not read again.
+    """
+
+    def __init__(self, root, extensions):
+        self.root = root
+        self.extensions = extensions
+        self.chunk_dir = os.path.join(root, ".chunks")
+        self._lock = threading.Lock()
+
+    def _snap_dir(self, game): return os.path.join(self.root, game, "snapshots")
+    def _chunk_path(self, h): return os.path.join(self.chunk_dir, h[:2], h)
+
+    def index(self, game):
+        return SaveIndex(os.path.join(self.root, game, "index.json"), self.extensions)
+
+    def snapshots(self, game):
+        """Snapshot ids of a game, newest first (directory listing only)."""
+        d = self._snap_dir(game)
+        if not os.path.isdir(d): return []
+        return sorted((f[:-5] for f in os.listdir(d) if f.endswith(".json")), reverse=True)
+
+    def manifest(self, game, snap_id):
+        with open(os.path.join(self._snap_dir(game), snap_id + ".json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _store_file(self, path):
+        chunks, new_bytes = [], 0
+        with open(path, 'rb') as f:
+            while True:
+                buf = f.read(CHUNK_SIZE)
+                if not buf: break
+                h = hashlib.sha256(buf).hexdigest()
+                dest = self._chunk_path(h)
+                if not os.path.exists(dest):
+                    os.makedirs(os.path.dirname(dest), exist_ok=True)
+                    tmp = f"{dest}.{threading.get_ident()}.tmp"
+                    with open(tmp, 'wb') as out: out.write(zlib.compress(buf, 6))
+                    os.replace(tmp, dest)
+                    new_bytes += len(buf)
+                chunks.append(h)
+        return chunks, new_bytes
+
+    def snapshot(self, game, folder, rel_paths):
+        """Stores `rel_paths` of `folder` as a new snapshot unless nothing changed since the last one.
+
+        Returns (snap_id or None, files, changed_files, new_bytes).
+        """
+        ids = self.snapshots(game)
+        previous = self.manifest(game, ids[0])["files"] if ids else {}
+        files, changed, new_bytes = {}, 0, 0
+        with self._lock:
+            for rel in rel_paths:
+                full = os.path.join(folder, rel)
+                try: st = os.stat(full)
+                except OSError: continue
+                key = rel.replace("\\", "/")
+                old = previous.get(key)
+                if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                    files[key] = old; continue
+                try: chunks, added = self._store_file(full)
+                except OSError: continue
+                files[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "chunks": chunks}
+                changed += 1; new_bytes += added
+            if not files or files == previous: return None, len(files), 0, 0
+
+            snap_id = datetime.datetime.now().strftime(SNAPSHOT_FORMAT)
+            while snap_id in ids: snap_id += "_1"
+            os.makedirs(self._snap_dir(game), exist_ok=True)
+            path = os.path.join(self._snap_dir(game), snap_id + ".json")
+            with open(path + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump({"created": datetime.datetime.now().isoformat(timespec="seconds"), "files": files}, f)
+            os.replace(path + ".tmp", path)
+        return snap_id, len(files), changed, new_bytes
+
+    def restore(self, game, snap_id, folder):
+        """Writes every file of a snapshot back into `folder` (keeping its recorded mtime)."""
+        files = self.manifest(game, snap_id)["files"]
+        for rel, info in files.items():
+            dest = os.path.join(folder, *rel.split("/"))
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            tmp = dest + ".restore.tmp"
+            with open(tmp, 'wb') as out:
+                for h in info["chunks"]:
+                    with open(self._chunk_path(h), 'rb') as f: out.write(zlib.decompress(f.read()))
+            os.replace(tmp, dest)
+            os.utime(dest, ns=(info["mtime_ns"], info["mtime_ns"]))
+        return len(files)
+
+    def prune(self, game, keep_last=10, keep_daily=7, keep_weekly=4):
+        """Applies the retention policy to a game's snapshots and drops unreferenced chunks.
+
+        Kept: the newest `keep_last`, plus the newest snapshot of each of the last
+        `keep_daily` days and `keep_weekly` ISO weeks that have one. Returns removed ids.
+        """
+        ids = self.snapshots(game)
+        keep = set(ids[:keep_last])
+        for count, period in ((keep_daily, lambda d: d.date()), (keep_weekly, lambda d: d.isocalendar()[:2])):
+            seen = []
+            for snap_id in ids:
+                try: p = period(datetime.datetime.strptime(snap_id[:19], SNAPSHOT_FORMAT))
+                except ValueError: continue
+                if p in seen: continue
+                if len(seen) >= count: break
+                seen.append(p); keep.add(snap_id)
+        removed = [s for s in ids if s not in keep]
+        for snap_id in removed:
+            try: os.remove(os.path.join(self._snap_dir(game), snap_id + ".json"))
+            except OSError: pass
+        if removed: self.collect_garbage()
+        return removed
+
+    def collect_garbage(self):
+        """Deletes chunks no manifest of any game references."""
+        with self._lock:
+            used = set()
+            for game in os.listdir(self.root) if os.path.isdir(self.root) else []:
+                if game.startswith("."): continue
+                for snap_id in self.snapshots(game):
+                    try: files = self.manifest(game, snap_id)["files"]
+                    except (OSError, ValueError, KeyError): return  # poškodený manifest: radšej nič nemazať
+                    for info in files.values(): used.update(info["chunks"])
+            if not os.path.isdir(self.chunk_dir): return
+            for sub in os.listdir(self.chunk_dir):
+                for h in os.listdir(os.path.join(self.chunk_dir, sub)):
+                    if h not in used:
+                        try: os.remove(os.path.join(self.chunk_dir, sub, h))
+                        except OSError: pass
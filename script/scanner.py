@@ -0,0 +1,95 @@
+import os
+import time
+
+# Adresár zmenený pred menej ako touto dobou (s) nepovažujeme za stabilný,
+# lebo mtime má na niektorých FS (FAT, SMB) hrubé rozlíšenie.
+MTIME_GRACE = 2.0
+
+class ScanDelta:
+    """Changes between two library scans, as sets of zip names, plus the installed games as
+    seen by the scan that produced them."""
+
+    def __init__(self, added=None, removed=None, changed=None, installed=None):
+        self.added = set(added or ())
+        self.removed = set(removed or ())
+        self.changed = set(changed or ())
+        self.installed = set(installed or ())
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"ScanDelta(added={sorted(self.added)}, removed={sorted(self.removed)}, changed={sorted(self.changed)})"
+
+class LibraryScanner:
+    """Caches the zip/installed listings and only re-lists a directory when its mtime changes.
+
+    Only the names are cached: rewriting a zip in place or touching an installed folder
+    doesn't change the parent directory, so every entry is stat()ed again on each scan.
+    """
+
+    def __init__(self):
+        self._dirs = {}     # (kind, path) -> (mtime_ns, [entry_name], volatile)
+        self._games = {}    # zip_name -> (zip_signature, install_signature)
+        self.last_delta = ScanDelta()
+
+    def zip_size(self, zip_name):
+        sig = self._games.get(zip_name, (None, None))[0]
+        return sig[0] if sig else 0
+
+    def install_signature(self, zip_name):
+        """Stat signature of the installed folder from the last scan (None when not installed)."""
+        return self._games.get(zip_name, (None, None))[1]
+
+    def invalidate(self, path=None):
+        """Forces the next scan to re-list `path` (or every directory when None)."""
+        for key in list(self._dirs):
+            if path is None or key[1] == path: del self._dirs[key]
+
+    def _list_dir(self, kind, path, is_wanted, signature):
+        """{entry name: signature(stat)} of the wanted entries of `path`."""
+        key = (kind, path)
+        try: st = os.stat(path)
+        except OSError:
+            self._dirs.pop(key, None)
+            return {}
+        cached = self._dirs.get(key)
+        if cached and cached[0] == st.st_mtime_ns and not cached[2]:
+            entries = {}
+            for name in cached[1]:
+                try: entries[name] = signature(os.stat(os.path.join(path, name)))
+                except OSError: pass    # zmazané bez zmeny mtime priečinka (napr. hrubé rozlíšenie)
+            return entries
+
+        entries = {}
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if is_wanted(entry): entries[entry.name] = signature(entry.stat())
+                    except OSError: pass
+        except OSError: return {}
+        volatile = (time.time() - st.st_mtime) < MTIME_GRACE
+        self._dirs[key] = (st.st_mtime_ns, list(entries), volatile)
+        return entries
+
+    def scan(self, zipped_dir, installed_dir):
+        """Returns (sorted game list, installed set, ScanDelta against the previous scan)."""
+        zip_sig = lambda st: (st.st_size, st.st_mtime_ns)
+        zipped = self._list_dir("zip", zipped_dir, lambda e: e.name.lower().endswith(".zip") and e.is_file(), zip_sig) if zipped_dir else {}
+        installed = self._list_dir("installed", installed_dir, lambda e: e.is_dir() and not e.name.startswith("."), lambda st: st.st_mtime_ns) if installed_dir else {}
+
+        games = {name: (sig, None) for name, sig in zipped.items()}
+        for d, sig in installed.items():
+            zip_name = d + ".zip"
+            games[zip_name] = (games.get(zip_name, (None, None))[0], sig)
+
+        old = self._games
+        installed_set = {d + ".zip" for d in installed}
+        delta = ScanDelta(
+            added=games.keys() - old.keys(),
+            removed=old.keys() - games.keys(),
+            changed={k for k in games.keys() & old.keys() if games[k] != old[k]},
+            installed=installed_set)
+        self._games, self.last_delta = games, delta
+        return sorted(games), installed_set, delta
@@ -0,0 +1,141 @@
+import re
+from bisect import bisect_left
+
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+NUMERIC_RE = re.compile(r"^(>=|<=|>|<|=)?(\d+)(?:-(\d+))?$")
+
+TEXT_FIELDS = ("name", "genre", "company", "year", "description", "notes")
+NUMERIC_FIELDS = ("year", "rating")
+FIELD_ALIASES = {
+    "name": "name", "title": "name", "genre": "genre", "company": "company", "dev": "company",
+    "year": "year", "rating": "rating", "desc": "description", "description": "description", "notes": "notes",
+}
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text or "").lower())
+
+def _to_int(text):
+    m = re.search(r"\d+", str(text or ""))
+    return int(m.group()) if m else None
+
+class SearchIndex:
+    """Inverted index over name, description, notes, genre, company and year.
+
+    Queries are whitespace separated terms that must all match (AND). A bare term matches
+    a substring of the game name or a word prefix in any indexed field. Fielded terms
+    restrict the match: `genre:rpg`, `company:sierra`, `year:1993-1995`, `rating:>=4`.
+    """
+
+    def __init__(self):
+        self._postings = {f: {} for f in TEXT_FIELDS}     # field -> token -> {doc_id}
+        self._vocab = {}                                  # field -> zoradený zoznam tokenov (lenivo)
+        self._docs = {}                                   # doc_id -> {field: {tokens}}
+        self._numbers = {f: {} for f in NUMERIC_FIELDS}   # field -> doc_id -> int
+        self._names = {}                                  # doc_id -> lowercased name
+        self.version = 0
+
+    def doc_ids(self): return list(self._docs)
+
+    def __contains__(self, doc_id): return doc_id in self._docs
+    def __len__(self): return len(self._docs)
+
+    def add(self, doc_id, fields=None):
+        """(Re)indexes a document. The name field always comes from the doc id."""
+        fields = dict(fields or {})
+        fields["name"] = doc_id
+        self.remove(doc_id)
+        self._docs[doc_id] = {}
+        self._names[doc_id] = doc_id.lower()
+        for field, text in fields.items(): self._set_field(doc_id, field, text)
+
+    def update_field(self, doc_id, field, text):
+        if field not in TEXT_FIELDS and field not in NUMERIC_FIELDS: return
+        if doc_id not in self._docs: self.add(doc_id)
+        self._set_field(doc_id, field, text)
+
+    def _set_field(self, doc_id, field, text):
+        self.version += 1
+        doc = self._docs[doc_id]
+        if field in TEXT_FIELDS:
+            postings = self._postings[field]
+            for tok in doc.get(field, ()):
+                ids = postings.get(tok)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids: del postings[tok]
+            tokens = set(tokenize(text))
+            doc[field] = tokens
+            for tok in tokens: postings.setdefault(tok, set()).add(doc_id)
+            self._vocab.pop(field, None)
+        if field in NUMERIC_FIELDS:
+            num = _to_int(text)
+            if num is None: self._numbers[field].pop(doc_id, None)
+            else: self._numbers[field][doc_id] = num
+
+    def remove(self, doc_id):
+        doc = self._docs.pop(doc_id, None)
+        if doc is None: return
+        self.version += 1
+        for field, tokens in doc.items():
+            postings = self._postings[field]
+            for tok in tokens:
+                ids = postings.get(tok)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids: del postings[tok]
+            self._vocab.pop(field, None)
+        for nums in self._numbers.values(): nums.pop(doc_id, None)
+        self._names.pop(doc_id, None)
+
+    def rename(self, old_id, new_id):
+        doc = self._docs.get(old_id)
+        if doc is None: return
+        fields = {f: " ".join(tokens) for f, tokens in doc.items() if f != "name"}
+        for f, nums in self._numbers.items():
+            if old_id in nums and f not in fields: fields[f] = str(nums[old_id])
+        self.add(new_id, fields)
+        self.remove(old_id)
+
+    def _prefix_docs(self, field, prefix):
+        vocab = self._vocab.get(field)
+        if vocab is None: vocab = self._vocab[field] = sorted(self._postings[field])
+        postings = self._postings[field]
+        found = set()
+        i = bisect_left(vocab, prefix)
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            found |= postings[vocab[i]]; i += 1
+        return found
+
+    def _match_text(self, fields, term):
+        found = None
+        for tok in tokenize(term):
+            hits = set()
+            for f in fields: hits |= self._prefix_docs(f, tok)
+            found = hits if found is None else found & hits
+        return found if found is not None else set(self._docs)
+
+    def _match_numeric(self, field, expr):
+        m = NUMERIC_RE.match(expr)
+        if not m: return set()
+        op, lo, hi = m.group(1) or "=", int(m.group(2)), m.group(3)
+        nums = self._numbers[field]
+        if hi is not None: return {d for d, v in nums.items() if lo <= v <= int(hi)}
+        tests = {">=": lambda v: v >= lo, "<=": lambda v: v <= lo, ">": lambda v: v > lo, "<": lambda v: v < lo, "=": lambda v: v == lo}
+        return {d for d, v in nums.items() if tests[op](v)}
+
+    def search(self, query):
+        """Returns the set of matching doc ids, or None for an empty query (= everything)."""
+        result = None
+        for term in query.lower().split():
+            field, sep, value = term.partition(":")
+            field = FIELD_ALIASES.get(field) if sep else None
+            if field and not value: continue     # "genre:" počas písania zatiaľ nefiltruje
+            if field in NUMERIC_FIELDS:
+                hits = self._match_numeric(field, value)
+            elif field:
+                hits = self._match_text((field,), value)
+            else:
+                hits = self._match_text(TEXT_FIELDS, term) | {d for d, n in self._names.items() if term in n}
+            result = hits if result is None else result & hits
+            if not result: return set()
+        return result
@@ -0,0 +1,197 @@
+import os
+import time
+import shutil
+import subprocess
+import threading
+
+SAMPLE_INTERVAL = 1.0
+KILL_TIMEOUT = 5.0
+CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+class GameRunning(Exception):
+    pass
+
+def read_proc_stat(pid):
+    """(CPU seconds used, resident bytes) of a process from /proc/<pid>/stat, or None where
+    /proc is not available or the process is gone."""
+    try:
+        with open(f"/proc/{pid}/stat", 'rb') as f: data = f.read()
+        # Meno procesu v zátvorkách môže obsahovať medzery, polia začínajú až za ním
+        fields = data[data.rindex(b')') + 2:].split()
+        return (int(fields[11]) + int(fields[12])) / CLK_TCK, int(fields[21]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError): return None
+
+class Session:
+    """One running (or finished) DOSBox process and its resource samples."""
+
+    def __init__(self, game, process, exe=None, log_path=None, conf_hash=None, cycles=None):
+        self.game = game
+        self.process = process
+        self.pid = process.pid
+        self.exe = exe
+        self.log_path = log_path
+        self.conf_hash = conf_hash
+        self.cycles = cycles        # cycles, s ktorými DOSBox beží
+        self.start_time = time.time()
+        self.end_time = None
+        self.exit_code = None
+        self.cpu_percent = None     # posledná vzorka, 100 = jedno plné jadro
+        self.rss = None
+        self.peak_rss = 0
+        self.cpu_seconds = 0.0
+        self.cpu_samples = []
+        self._last = None           # (čas, cpu sekundy) predchádzajúcej vzorky
+
+    @property
+    def running(self): return self.end_time is None
+
+    @property
+    def duration(self): return (self.end_time or time.time()) - self.start_time
+
+    @property
+    def avg_cpu(self):
+        """Average CPU use over the whole session in percent of one core, or None without samples."""
+        if self._last is None or self.duration <= 0: return None
+        return 100.0 * self.cpu_seconds / self.duration
+
+    def sample(self):
+        stat = read_proc_stat(self.pid)
+        if stat is None: return
+        now, (cpu, rss) = time.monotonic(), stat
+        if self._last and now > self._last[0]:
+            self.cpu_percent = 100.0 * (cpu - self._last[1]) / (now - self._last[0])
+            self.cpu_samples.append(round(self.cpu_percent, 1))
+        self._last = (now, cpu)
+        self.cpu_seconds, self.rss = cpu, rss
+        self.peak_rss = max(self.peak_rss, rss)
+
+class SessionSupervisor:
+    """Starts DOSBox processes and watches them until they exit.
+
+    Only one session per game can run at a time; `claim` reserves a game for a launch that is
+    still being prepared (e.g. extracted into the play cache). A single monitor thread samples
+    CPU and RSS of every live session from /proc each `interval` seconds, notices exits and
+    runs each session's `on_exit(session)` in its own thread. The game stays claimed until
+    that returns, so it can't be relaunched into a folder that is still being post-processed.
+    These threads are not daemons, so post-exit work (screenshot import, save backups) still
+    finishes when the launcher window has been closed while a game was running.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self._sessions = {}     # game -> Session, alebo None pri rezervácii
+        self._on_exit = {}
+        self._lock = threading.Lock()
+        self._monitor = None
+        self.on_update = None   # on_update(sessions), volané z vlákna monitora
+
+    def claim(self, game):
+        with self._lock:
+            if game in self._sessions:
+                s = self._sessions[game]
+                raise GameRunning(f"{game} is already running (PID {s.pid})." if s else f"{game} is still starting or finishing its last session.")
+            self._sessions[game] = None
+
+    def unclaim(self, game):
+        with self._lock:
+            if self._sessions.get(game, 0) is None: del self._sessions[game]
+
+    def start(self, game, args, cwd, on_exit=None, exe=None, log_path=None, conf_hash=None, cycles=None, claimed=False):
+        """Starts `args` in `cwd` as the session of `game` and returns it. Raises GameRunning when
+        the game already runs, unless the caller `claimed` it itself."""
+        if not claimed: self.claim(game)
+        try:
+            if log_path:
+                os.makedirs(os.path.dirname(log_path), exist_ok=True)
+                with open(log_path, 'wb') as out:
+                    proc = subprocess.Popen(args, cwd=cwd, stdout=out, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+            else:
+                proc = subprocess.Popen(args, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL)
+        except BaseException:
+            self.unclaim(game)
+            raise
+        session = Session(game, proc, exe, log_path, conf_hash, cycles)
+        session.sample()
+        with self._lock:
+            self._sessions[game] = session
+            self._on_exit[game] = on_exit
+            if self._monitor is None:
+                self._monitor = threading.Thread(target=self._run, name="sessions", daemon=False)
+                self._monitor.start()
+        self._notify()
+        return session
+
+    def sessions(self):
+        """Live sessions, oldest first."""
+        with self._lock: live = [s for s in self._sessions.values() if s is not None]
+        return sorted(live, key=lambda s: s.start_time)
+
+    def get(self, game):
+        with self._lock: return self._sessions.get(game)
+
+    def is_running(self, game):
+        with self._lock: return game in self._sessions
+
+    def kill(self, game):
+        """Asks the game's DOSBox to terminate, killing it if it is still alive after KILL_TIMEOUT."""
+        s = self.get(game)
+        if s is None: return False
+        try: s.process.terminate()
+        except OSError: return False
+        def force():
+            try: s.process.wait(KILL_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                try: s.process.kill()
+                except OSError: pass
+        threading.Thread(target=force, daemon=True).start()
+        return True
+
+    def focus(self, game):
+        """Raises the game's DOSBox window with xdotool or wmctrl (X11). False when neither is
+        installed or no window of the process was found."""
+        s = self.get(game)
+        if s is None: return False
+        if shutil.which("xdotool"):
+            return subprocess.call(["xdotool", "search", "--pid", str(s.pid), "windowactivate"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0
+        if shutil.which("wmctrl"):
+            out = subprocess.run(["wmctrl", "-lp"], capture_output=True, text=True).stdout
+            for line in out.splitlines():
+                parts = line.split(None, 3)
+                if len(parts) > 2 and parts[2] == str(s.pid):
+                    return subprocess.call(["wmctrl", "-ia", parts[0]]) == 0
+        return False
+
+    def _notify(self):
+        if self.on_update:
+            try: self.on_update(self.sessions())
+            except Exception as e: print(f"Session update error: {e}")
+
+    def _run(self):
+        while True:
+            finished = []
+            for s in self.sessions():
+                s.sample()
+                code = s.process.poll()
+                if code is not None:
+                    s.end_time, s.exit_code = time.time(), code
+                    finished.append(s)
+            with self._lock:
+                for s in finished:
+                    on_exit = self._on_exit.pop(s.game, None)
+                    if on_exit:
+                        # Rezervácia ostáva, kým nedobehne práca po skončení (screenshoty, zálohy, cycles)
+                        self._sessions[s.game] = None
+                        threading.Thread(target=self._finish, args=(on_exit, s), name=f"session-exit-{s.pid}", daemon=False).start()
+                    else: del self._sessions[s.game]
+                done = not any(v is not None for v in self._sessions.values())
+                if done: self._monitor = None
+            self._notify()
+            if done: return
+            time.sleep(self.interval)
+
+    def _finish(self, on_exit, session):
+        try: on_exit(session)
+        except Exception as e: print(f"Post-session error ({session.game}): {e}")
+        finally: self.unclaim(session.game)
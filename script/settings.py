@@ -11,7 +11,19 @@ class SettingsManager:
             "dosbox_exe": "", 
             "global_conf": "",
             "capture_dir": "capture",
-            "theme": "darkly"
+            "theme": "darkly",
+            "virtual_list": False,
+            "thumb_cache_mb": 64,
+            "install_workers": 2,
+            "dedup_store": False,
+            "play_cache_mb": 4096,
+            "backup_keep_last": 10,
+            "backup_keep_daily": 7,
+            "backup_keep_weekly": 4,
+            "auto_backup_saves": False,
+            "auto_cycles": False,
+            "cycles_target_cpu": 70,
+            "confs_minimized": False
         }
         self.paths = self.defaults.copy()
         self.load()
@@ -0,0 +1,68 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import get_folder_size
+
+# Podpis (mtime priečinka hry) nezachytí zmeny hlbšie v strome, preto sa veľkosť po tejto dobe prepočíta
+SIZE_TTL = 24 * 3600
+
+class SizeCache:
+    """Folder sizes keyed by path and tree signature, computed by a background worker pool.
+
+    `get` never walks the tree on the caller's thread: it returns the cached size when the
+    signature still matches, otherwise it queues a walk and returns None. The signature only
+    covers the top of the tree, so a size older than SIZE_TTL is still returned but also
+    walked again. Finished sizes are reported through `on_ready(path, size)`, which is
+    called from a worker thread.
+    """
+
+    def __init__(self, db=None, workers=2):
+        self._db = db
+        self._sizes = db.load_sizes() if db else {}   # path -> (signature, size, čas výpočtu)
+        self._pending = set()
+        self._generation = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="size-cache")
+        self.on_ready = None
+
+    def get(self, path, signature):
+        sig = str(signature)
+        with self._lock:
+            cached = self._sizes.get(path)
+            if cached and cached[0] == sig:
+                if time.time() - cached[2] < SIZE_TTL or path in self._pending: return cached[1]
+                result = cached[1]      # zastaraná, kým dobehne nový výpočet
+            else:
+                if path in self._pending: return None
+                result = None
+            self._pending.add(path)
+            gen = self._generation.get(path, 0)
+        self._pool.submit(self._compute, path, sig, gen)
+        return result
+
+    def invalidate(self, path):
+        with self._lock:
+            self._sizes.pop(path, None)
+            self._generation[path] = self._generation.get(path, 0) + 1
+        if self._db: self._db.delete_size(path)
+
+    def _compute(self, path, sig, gen):
+        size = get_folder_size(path)
+        with self._lock:
+            current = self._generation.get(path, 0)
+            if current != gen:
+                # Medzitým invalidované: výsledok je zastaraný, prepočíta sa znova (get() už vrátil None)
+                try: self._pool.submit(self._compute, path, sig, current)
+                except RuntimeError: self._pending.discard(path)   # pool už je zatvorený
+                return
+            self._pending.discard(path)
+            now = time.time()
+            self._sizes[path] = (sig, size, now)
+        if self._db: self._db.store_size(path, sig, size, now)
+        if self.on_ready:
+            try: self.on_ready(path, size)
+            except Exception as e: print(f"Size callback error: {e}")
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
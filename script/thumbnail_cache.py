@@ -0,0 +1,141 @@
+import os
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+
+HAS_PILLOW = False
+try:
+    from PIL import Image, ImageTk
+    HAS_PILLOW = True
+except ImportError: pass
+
+THUMB_SIZE = (512, 384)
+SOURCE_FILE = "source"  # cesta k pôvodnému screenshotu, podľa nej sa mažú osirelé náhľady
+
+class ThumbnailCache:
+    """Pre-scaled screenshots on disk plus an in-memory LRU of decoded PhotoImages.
+
+    Disk thumbnails are keyed by source path, mtime and size, so an edited or replaced
+    screenshot gets a fresh thumbnail and the stale one is removed. The budget applies to
+    both caches: on disk, `prune` (run in the background at startup and whenever new
+    thumbnails exceed the budget) drops thumbnails of screenshots that no longer exist and
+    then the least recently shown ones. `load_scaled` is safe to call from worker threads;
+    `get_photo` creates Tk objects and must run on the Tk thread.
+    """
+
+    def __init__(self, cache_dir, size=THUMB_SIZE, budget_mb=64):
+        self.cache_dir = cache_dir
+        self.size = size
+        self.budget = int(budget_mb * 1024 * 1024)
+        self._photos = OrderedDict()    # key -> (PhotoImage, bytes)
+        self._used = 0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._disk_used = None          # bajty náhľadov na disku, None kým prebieha prvý prune
+        threading.Thread(target=self.prune, name="thumb-prune", daemon=True).start()
+
+    def _key(self, path):
+        st = os.stat(path)
+        path_id = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:20]
+        version = hashlib.sha1(f"{st.st_mtime_ns}|{st.st_size}|{self.size[0]}x{self.size[1]}".encode()).hexdigest()[:10]
+        return path_id, version
+
+    def thumbnail_path(self, path):
+        """Returns the on-disk thumbnail for `path`, creating it when missing or stale."""
+        path_id, version = self._key(path)
+        thumb_dir = os.path.join(self.cache_dir, path_id)
+        thumb = os.path.join(thumb_dir, version + ".png")
+        if os.path.exists(thumb):
+            # mtime slúži ako čas posledného použitia pre vyraďovanie (atime býva vypnutý)
+            try: os.utime(thumb)
+            except OSError: pass
+            return thumb
+        os.makedirs(thumb_dir, exist_ok=True)
+        source = os.path.join(thumb_dir, SOURCE_FILE)
+        if not os.path.exists(source):
+            with open(source, 'w', encoding='utf-8') as f: f.write(os.path.abspath(path))
+        img = Image.open(path)
+        if img.mode not in ("RGB", "RGBA"): img = img.convert("RGB")
+        img = img.resize(self.size, Image.Resampling.LANCZOS)
+        tmp = f"{thumb}.{threading.get_ident()}.tmp"
+        img.save(tmp, "PNG", compress_level=1)
+        os.replace(tmp, thumb)
+        freed = 0
+        # Staršie verzie toho istého screenshotu už nie sú potrebné
+        for f in os.listdir(thumb_dir):
+            if f.endswith(".png") and f != version + ".png":
+                try: freed += os.path.getsize(os.path.join(thumb_dir, f)); os.remove(os.path.join(thumb_dir, f))
+                except OSError: pass
+        with self._disk_lock:
+            if self._disk_used is not None: self._disk_used += os.path.getsize(thumb) - freed
+            over = self._disk_used is not None and self._disk_used > self.budget
+        if over: self.prune(keep=thumb)
+        return thumb
+
+    def prune(self, keep=None):
+        """Removes thumbnails whose screenshot is gone, then the least recently used ones until
+        the disk cache fits the budget. `keep` is never removed."""
+        with self._disk_lock:
+            thumbs = []     # (mtime, size, cesta)
+            try: entries = list(os.scandir(self.cache_dir))
+            except OSError: entries = []
+            for d in entries:
+                if not d.is_dir(): continue
+                try:
+                    with open(os.path.join(d.path, SOURCE_FILE), encoding='utf-8') as f: source = f.read()
+                except OSError: source = None
+                # Priečinok bez záznamu môže práve vznikať vo workeri
+                if source is None and time.time() - d.stat().st_mtime < 60: continue
+                if not source or not os.path.exists(source):
+                    shutil.rmtree(d.path, ignore_errors=True); continue
+                try:
+                    for f in os.scandir(d.path):
+                        if f.name.endswith(".png"):
+                            st = f.stat(); thumbs.append((st.st_mtime, st.st_size, f.path))
+                except OSError: continue
+            used = sum(t[1] for t in thumbs)
+            for _, size, path in sorted(thumbs):
+                if used <= self.budget: break
+                if path == keep: continue
+                try: os.remove(path)
+                except OSError: continue
+                used -= size
+            self._disk_used = used
+
+    def load_scaled(self, path):
+        """Pre-scaled PIL image for `path` (thread-safe, no Tk)."""
+        with Image.open(self.thumbnail_path(path)) as img:
+            img.load()
+            return img.copy()
+
+    def cached_photo(self, path):
+        """PhotoImage from the memory LRU, or None when it would need disk access."""
+        try: key = self._key(path)
+        except OSError: return None
+        with self._lock:
+            hit = self._photos.get(key)
+            if hit is None: return None
+            self._photos.move_to_end(key)
+            return hit[0]
+
+    def put_photo(self, path, img):
+        """Turns a scaled PIL image into a PhotoImage and stores it in the LRU (Tk thread only)."""
+        photo = ImageTk.PhotoImage(img)
+        try: key = self._key(path)
+        except OSError: return photo
+        cost = img.width * img.height * 4
+        with self._lock:
+            old = self._photos.pop(key, None)
+            if old: self._used -= old[1]
+            self._photos[key] = (photo, cost)
+            self._used += cost
+            while self._used > self.budget and len(self._photos) > 1:
+                _, (_, freed) = self._photos.popitem(last=False)
+                self._used -= freed
+        return photo
+
+    def get_photo(self, path):
+        """PhotoImage for `path` at thumbnail size (Tk thread only)."""
+        return self.cached_photo(path) or self.put_photo(path, self.load_scaled(path))
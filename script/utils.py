@@ -1,5 +1,6 @@
 import os
 import stat
+import datetime
 
 def remove_readonly(func, path, excinfo):
     os.chmod(path, stat.S_IWRITE)
@@ -11,6 +12,16 @@ def format_size(size_bytes):
     if mb < 1: return "< 1 MB"
     return f"{mb:.1f} MB"
 
+def format_duration(seconds):
+    if not seconds: return "-"
+    minutes = int(seconds) // 60
+    if minutes < 60: return f"{max(minutes, 1)}m"
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+def format_date(timestamp):
+    if not timestamp: return "-"
+    return datetime.date.fromtimestamp(timestamp).isoformat()
+
 def truncate_text(text, max_chars):
     if len(text) > max_chars: return text[:max_chars-3] + "..."
     return text
@@ -4,10 +4,14 @@ import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 import os
 import webbrowser
+import statistics
 
 # Imports from our modules
 from constants import *
 from utils import truncate_text
+from exe_index import ExeIndex, EXE_KIND_LABELS, EXE_SETUP
+
+NO_PROFILE = "(none)"
 
 class EditWindow(tb.Toplevel):
     def __init__(self, parent_app, zip_name):
@@ -22,6 +26,7 @@ class EditWindow(tb.Toplevel):
 
         self.game_folder = self.logic.find_game_folder(self.zip_name)
         self.conf_path = os.path.join(self.game_folder, "dosbox.conf")
+        self.conf = self.logic.resolve_game_config(self.name, self.game_folder)
 
         self._init_ui()
 
@@ -93,7 +98,9 @@ class EditWindow(tb.Toplevel):
         exe_frame = tb.Frame(parent)
         exe_frame.pack(fill=tk.BOTH, expand=True, padx=10)
         current_map = self.logic.load_exe_map(self.name)
-        found_exes = self.logic.scan_game_executables(self.zip_name)
+        found_exes = self.logic.classify_game_executables(self.zip_name)
+        has_main = any(info.get("role") == ROLE_MAIN for info in current_map.values())
+        suggested_main = None if has_main else ExeIndex.suggest_main(self.name, found_exes)
         self.exe_widgets = [] 
         
         canvas = tk.Canvas(exe_frame)
@@ -111,17 +118,16 @@ class EditWindow(tb.Toplevel):
         tb.Label(scrollable_frame, text="Role", font=("Segoe UI", 9, "bold")).grid(row=0, column=2, sticky="w", padx=5)
         tb.Label(scrollable_frame, text="Custom Title", font=("Segoe UI", 9, "bold")).grid(row=0, column=3, sticky="w", padx=5)
 
-        for i, exe in enumerate(found_exes):
+        for i, (exe, kind) in enumerate(found_exes.items()):
             r = i + 1
-            tb.Label(scrollable_frame, text=truncate_text(exe, 35)).grid(row=r, column=0, sticky="w", padx=5, pady=2)
+            tb.Label(scrollable_frame, text=f"{truncate_text(exe, 35)}  [{EXE_KIND_LABELS.get(kind, '?')}]").grid(row=r, column=0, sticky="w", padx=5, pady=2)
             btn_run = tb.Button(scrollable_frame, text="▶", bootstyle="success-outline", width=2,
-                                command=lambda x=exe: self.logic.launch_game(self.zip_name, x))
+                                command=lambda x=exe: self.parent_app.launch_custom(self.zip_name, x))
             btn_run.grid(row=r, column=1, padx=5)
 
             info = current_map.get(exe, None)
-            low = exe.lower()
             if info is None:
-                current_role = ROLE_SETUP if any(x in low for x in ['setup', 'install', 'config', 'setsound', 'sound']) else ROLE_UNASSIGNED
+                current_role = ROLE_SETUP if kind == EXE_SETUP else ROLE_MAIN if exe == suggested_main else ROLE_UNASSIGNED
                 current_title = ""
             else:
                 current_role = info.get("role", ROLE_UNASSIGNED)
@@ -143,29 +149,40 @@ class EditWindow(tb.Toplevel):
             self.exe_widgets.append((exe, var_role, var_title))
 
     def _build_dosbox_tab(self, parent):
-        val_core = self.logic.read_dosbox_param(self.conf_path, "cpu", "core") or "auto"
-        val_cputype = self.logic.read_dosbox_param(self.conf_path, "cpu", "cputype") or "auto"
-        val_cycles = self.logic.read_dosbox_param(self.conf_path, "cpu", "cycles") or "3000"
-        val_cycles_prot = self.logic.read_dosbox_param(self.conf_path, "cpu", "cycles_protected") or "60000"
-
-        val_memsize = self.logic.read_dosbox_param(self.conf_path, "dosbox", "memsize") or "16"
-        val_xms = self.logic.read_dosbox_param(self.conf_path, "dos", "xms") or "true"
-        val_ems = self.logic.read_dosbox_param(self.conf_path, "dos", "ems") or "true"
-        val_umb = self.logic.read_dosbox_param(self.conf_path, "dos", "umb") or "true"
+        self.is_protected = self.logic.detect_protected_mode(self.name, self.game_folder)
+        val_core = self.conf.get("cpu", "core") or "auto"
+        val_cputype = self.conf.get("cpu", "cputype") or "auto"
+        # Súbor má len jedno cycles; platí pre režim, v ktorom hra beží
+        val_cycles = (self.conf.get("cpu", "cycles") if not self.is_protected else "") or DEFAULT_GAME_CONFIG['cpu']['cycles']
+        val_cycles_prot = (self.conf.get("cpu", "cycles") if self.is_protected else "") or DEFAULT_GAME_CONFIG['cpu']['cycles_protected']
+
+        val_memsize = self.conf.get("dosbox", "memsize") or "16"
+        val_xms = self.conf.get("dos", "xms") or "true"
+        val_ems = self.conf.get("dos", "ems") or "true"
+        val_umb = self.conf.get("dos", "umb") or "true"
         
         extra_data = self.logic.load_extra_config(self.name)
         val_loadfix = extra_data.get('loadfix', False)
         val_loadfix_size = extra_data.get('loadfix_size', "64")
         val_loadhigh = extra_data.get('loadhigh', False)
 
-        val_output = self.logic.read_dosbox_param(self.conf_path, "sdl", "output") or "opengl"
-        val_fullscreen = self.logic.read_dosbox_param(self.conf_path, "sdl", "fullscreen") or "false"
-        val_winres = self.logic.read_dosbox_param(self.conf_path, "sdl", "windowresolution") or "default"
-        val_fullres = self.logic.read_dosbox_param(self.conf_path, "sdl", "fullresolution") or "desktop"
-        val_glshader = self.logic.read_dosbox_param(self.conf_path, "render", "glshader") or "none"
-        val_intscale = (self.logic.read_dosbox_param(self.conf_path, "render", "integer_scaling") or "false").lower() == "true"
+        val_output = self.conf.get("sdl", "output") or "opengl"
+        val_fullscreen = self.conf.get("sdl", "fullscreen") or "false"
+        val_winres = self.conf.get("sdl", "windowresolution") or "default"
+        val_fullres = self.conf.get("sdl", "fullresolution") or "desktop"
+        val_glshader = self.conf.get("render", "glshader") or "none"
+        val_intscale = (self.conf.get("render", "integer_scaling") or "false").lower() == "true"
         
         parent.columnconfigure(0, weight=1)
+        f_prof = tb.Labelframe(parent, text="Profile", bootstyle="secondary")
+        f_prof.pack(fill=tk.X, padx=10, pady=5)
+        profile = self.logic.get_game_profile(self.name)
+        self.v_profile = tk.StringVar(value=profile or NO_PROFILE)
+        cb_prof = tb.Combobox(f_prof, values=[NO_PROFILE] + self.logic.list_config_profiles(), textvariable=self.v_profile, state="readonly", width=25)
+        cb_prof.pack(side=tk.LEFT, padx=10, pady=5)
+        cb_prof.bind("<<ComboboxSelected>>", self._on_profile_change)
+        tb.Label(f_prof, text="Only settings that differ from the profile are stored with the game.", bootstyle="secondary").pack(side=tk.LEFT, padx=5)
+
         f_cpu = tb.Labelframe(parent, text="CPU Settings", bootstyle="primary")
         f_cpu.pack(fill=tk.X, padx=10, pady=5)
         f_cpu.columnconfigure(1, weight=1); f_cpu.columnconfigure(3, weight=1)
@@ -174,6 +191,20 @@ class EditWindow(tb.Toplevel):
         self.v_cputype = self._add_opt(f_cpu, 0, 2, "CPU Type:", CPUTYPE_OPTIONS, val_cputype)
         self.v_cycles = self._add_opt(f_cpu, 1, 0, "Cycles (Real):", CYCLES_OPTIONS, val_cycles, True)
         self.v_cycles_prot = self._add_opt(f_cpu, 1, 2, "Cycles (Prot):", CYCLES_PROT_OPTIONS, val_cycles_prot, True)
+        extender, ext_path = self.logic.get_dos_extender(self.name)
+        mode_text = f"Protected mode: {extender} ({ext_path})" if extender else "Real mode (no DOS extender found)"
+        tb.Label(f_cpu, text=mode_text, bootstyle="secondary").grid(row=2, column=0, columnspan=4, sticky="w", padx=10, pady=(0, 5))
+        cycles, loads, recommended = self.logic.cycles_recommendation(self.name)
+        if loads:
+            f_tune = tb.Frame(f_cpu)
+            f_tune.grid(row=3, column=0, columnspan=4, sticky="w", padx=10, pady=(0, 5))
+            # Rovnaká hodnota, z ktorej vychádza odporúčanie: medián p90 záťaže z posledných relácií
+            tune_text = f"Measured CPU with cycles {cycles}: {statistics.median(loads):.0f}% (median p90 of {len(loads)} sessions)"
+            tune_text += f" → recommended: {recommended}" if recommended else " – within target"
+            tb.Label(f_tune, text=tune_text, bootstyle="info").pack(side=tk.LEFT)
+            if recommended:
+                v_target = self.v_cycles_prot if self.is_protected else self.v_cycles
+                tb.Button(f_tune, text="Use", command=lambda: v_target.set(recommended), bootstyle="info-outline").pack(side=tk.LEFT, padx=10)
 
         f_mem = tb.Labelframe(parent, text="Memory Settings", bootstyle="info")
         f_mem.pack(fill=tk.X, padx=10, pady=5)
@@ -212,9 +243,9 @@ class EditWindow(tb.Toplevel):
         tb.Checkbutton(f_vid_bools, text="Integer Scaling", variable=self.v_intscale, bootstyle="round-toggle").pack(side=tk.LEFT, padx=10)
 
     def _build_audio_tab(self, parent):
-        val_rate = self.logic.read_dosbox_param(self.conf_path, "mixer", "rate") or "48000"
-        val_blocksize = self.logic.read_dosbox_param(self.conf_path, "mixer", "blocksize") or "1024"
-        val_prebuffer = self.logic.read_dosbox_param(self.conf_path, "mixer", "prebuffer") or "25"
+        val_rate = self.conf.get("mixer", "rate") or "48000"
+        val_blocksize = self.conf.get("mixer", "blocksize") or "1024"
+        val_prebuffer = self.conf.get("mixer", "prebuffer") or "25"
         
         f_mixer = tb.Labelframe(parent, text="Mixer", bootstyle="secondary")
         f_mixer.pack(fill=tk.X, padx=10, pady=5)
@@ -222,12 +253,12 @@ class EditWindow(tb.Toplevel):
         self.v_blocksize = self._add_opt(f_mixer, 0, 2, "Blocksize:", ["1024", "2048", "4096", "512"], val_blocksize)
         self.v_prebuffer = self._add_opt(f_mixer, 0, 4, "Prebuffer:", [], val_prebuffer, True)
 
-        val_sbtype = self.logic.read_dosbox_param(self.conf_path, "sblaster", "sbtype") or "sb16"
-        val_sbbase = self.logic.read_dosbox_param(self.conf_path, "sblaster", "sbbase") or "220"
-        val_irq = self.logic.read_dosbox_param(self.conf_path, "sblaster", "irq") or "7"
-        val_dma = self.logic.read_dosbox_param(self.conf_path, "sblaster", "dma") or "1"
-        val_hdma = self.logic.read_dosbox_param(self.conf_path, "sblaster", "hdma") or "5"
-        val_opl = self.logic.read_dosbox_param(self.conf_path, "sblaster", "oplmode") or "auto"
+        val_sbtype = self.conf.get("sblaster", "sbtype") or "sb16"
+        val_sbbase = self.conf.get("sblaster", "sbbase") or "220"
+        val_irq = self.conf.get("sblaster", "irq") or "7"
+        val_dma = self.conf.get("sblaster", "dma") or "1"
+        val_hdma = self.conf.get("sblaster", "hdma") or "5"
+        val_opl = self.conf.get("sblaster", "oplmode") or "auto"
 
         f_sb = tb.Labelframe(parent, text="Sound Blaster", bootstyle="danger")
         f_sb.pack(fill=tk.X, padx=10, pady=5)
@@ -238,14 +269,14 @@ class EditWindow(tb.Toplevel):
         self.v_hdma = self._add_opt(f_sb, 2, 0, "HDMA:", ["5", "1", "7"], val_hdma)
         self.v_opl = self._add_opt(f_sb, 2, 2, "OPL Mode:", OPL_MODES, val_opl)
 
-        val_gus = self.logic.read_dosbox_param(self.conf_path, "gus", "gus") or "false"
+        val_gus = self.conf.get("gus", "gus") or "false"
         f_gus = tb.Labelframe(parent, text="Gravis UltraSound", bootstyle="info")
         f_gus.pack(fill=tk.X, padx=10, pady=5)
         self.v_gus = self._add_opt(f_gus, 0, 0, "Enable GUS:", GUS_BOOL, val_gus)
         
-        val_pcspeaker = self.logic.read_dosbox_param(self.conf_path, "speaker", "pcspeaker") or "impulse"
-        val_tandy = self.logic.read_dosbox_param(self.conf_path, "speaker", "tandy") or "auto"
-        val_lpt = self.logic.read_dosbox_param(self.conf_path, "speaker", "lpt_dac") or "none"
+        val_pcspeaker = self.conf.get("speaker", "pcspeaker") or "impulse"
+        val_tandy = self.conf.get("speaker", "tandy") or "auto"
+        val_lpt = self.conf.get("speaker", "lpt_dac") or "none"
         
         f_spk = tb.Labelframe(parent, text="Speaker & Other", bootstyle="success")
         f_spk.pack(fill=tk.X, padx=10, pady=5)
@@ -253,14 +284,40 @@ class EditWindow(tb.Toplevel):
         self.v_tandy = self._add_opt(f_spk, 0, 2, "Tandy:", TANDY_TYPES, val_tandy)
         self.v_lpt = self._add_opt(f_spk, 1, 0, "LPT DAC:", LPT_DAC_TYPES, val_lpt)
 
-        val_midi = self.logic.read_dosbox_param(self.conf_path, "midi", "mididevice") or "auto"
-        val_mpu = self.logic.read_dosbox_param(self.conf_path, "midi", "mpu401") or "intelligent"
+        val_midi = self.conf.get("midi", "mididevice") or "auto"
+        val_mpu = self.conf.get("midi", "mpu401") or "intelligent"
         
         f_midi = tb.Labelframe(parent, text="MIDI", bootstyle="warning")
         f_midi.pack(fill=tk.X, padx=10, pady=5)
         self.v_midi = self._add_opt(f_midi, 0, 0, "Device:", MIDI_DEVICES, val_midi)
         self.v_mpu = self._add_opt(f_midi, 0, 2, "MPU-401:", ["intelligent", "uart", "none"], val_mpu)
 
+    def _conf_fields(self):
+        """(section, key, variable) of every field stored in dosbox.conf; cycles are handled apart."""
+        return [
+            ("cpu", "core", self.v_core), ("cpu", "cputype", self.v_cputype), ("dosbox", "memsize", self.v_memsize),
+            ("dos", "xms", self.v_xms), ("dos", "ems", self.v_ems), ("dos", "umb", self.v_umb),
+            ("sdl", "output", self.v_output), ("sdl", "fullscreen", self.v_fullscreen), ("sdl", "windowresolution", self.v_winres),
+            ("sdl", "fullresolution", self.v_fullres), ("render", "glshader", self.v_glshader), ("render", "integer_scaling", self.v_intscale),
+            ("mixer", "rate", self.v_rate), ("mixer", "blocksize", self.v_blocksize), ("mixer", "prebuffer", self.v_prebuffer),
+            ("sblaster", "sbtype", self.v_sbtype), ("sblaster", "sbbase", self.v_sbbase), ("sblaster", "irq", self.v_irq),
+            ("sblaster", "dma", self.v_dma), ("sblaster", "hdma", self.v_hdma), ("sblaster", "oplmode", self.v_opl),
+            ("gus", "gus", self.v_gus), ("speaker", "pcspeaker", self.v_pcspeaker), ("speaker", "tandy", self.v_tandy),
+            ("speaker", "lpt_dac", self.v_lpt), ("midi", "mididevice", self.v_midi), ("midi", "mpu401", self.v_mpu),
+        ]
+
+    def _on_profile_change(self, event=None):
+        # Nový profil: polia ukážu jeho hodnoty bez vlastných nastavení hry
+        profile = self.v_profile.get()
+        conf = self.logic.resolve_game_config(self.name, self.game_folder, profile="" if profile == NO_PROFILE else profile, with_game=False)
+        for section, key, var in self._conf_fields():
+            val = conf.get(section, key)
+            if not val: continue
+            if isinstance(var, tk.BooleanVar): var.set(val.lower() == "true")
+            else: var.set(val)
+        cycles = conf.get("cpu", "cycles")
+        if cycles: (self.v_cycles_prot if self.is_protected else self.v_cycles).set(cycles)
+
     def _open_browser_search(self):
         query = f"{self.v_name.get()} dos game info mobygames"
         url = f"https://www.google.com/search?q={query}"
@@ -297,12 +354,7 @@ class EditWindow(tb.Toplevel):
         self.logic.save_meta(new_name, ".txt", self.t_desc.get(1.0, tk.END).strip())
         
         # 2. Save custom dosbox path
-        cdb = self.v_custom_dosbox.get().strip()
-        if cdb:
-            self.logic.save_meta(new_name, ".dosbox", cdb)
-        else:
-            p = os.path.join(self.logic.folder_info, f"{new_name}.dosbox")
-            if os.path.exists(p): os.remove(p)
+        self.logic.save_meta(new_name, ".dosbox", self.v_custom_dosbox.get().strip())
 
         # 3. Save executable map
         new_map = {}
@@ -314,7 +366,8 @@ class EditWindow(tb.Toplevel):
         self.logic.save_exe_map(new_name, new_map)
         
         # 4. Save extra config (loadfix, etc.)
-        extra_conf = { "loadfix": self.v_loadfix.get(), "loadfix_size": self.v_loadfix_size.get(), "loadhigh": self.v_loadhigh.get() }
+        profile = self.v_profile.get()
+        extra_conf = { "loadfix": self.v_loadfix.get(), "loadfix_size": self.v_loadfix_size.get(), "loadhigh": self.v_loadhigh.get(), "profile": "" if profile == NO_PROFILE else profile }
         self.logic.save_extra_config(new_name, extra_conf)
 
         # 5. Save dosbox.conf settings
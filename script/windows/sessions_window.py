@@ -0,0 +1,66 @@
+import tkinter as tk
+from tkinter import messagebox
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+import time
+
+from utils import format_size
+
+class SessionsWindow(tb.Toplevel):
+    REFRESH_MS = 1000
+
+    def __init__(self, parent_app):
+        super().__init__(parent_app)
+        self.parent_app = parent_app
+        self.sessions = parent_app.logic.sessions
+
+        self.title("Running Games")
+        self.geometry("640x300")
+        self._init_ui()
+        self._refresh()
+
+    def _init_ui(self):
+        cols = {"game": 220, "pid": 70, "started": 80, "time": 80, "cpu": 70, "rss": 90}
+        self.tree = tb.Treeview(self, columns=list(cols), show="headings", selectmode="browse", bootstyle="dark")
+        for col, width in cols.items():
+            self.tree.heading(col, text=col.upper() if col in ("pid", "cpu", "rss") else col.title())
+            self.tree.column(col, width=width, anchor="w" if col == "game" else "center", stretch=(col == "game"))
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        self.tree.bind("<Double-1>", lambda e: self._focus())
+
+        f_btn = tb.Frame(self)
+        f_btn.pack(fill=tk.X, padx=10, pady=(0, 10))
+        tb.Button(f_btn, text="⧉ Focus Window", command=self._focus, bootstyle="info-outline").pack(side=tk.LEFT, padx=2)
+        tb.Button(f_btn, text="■ Stop Game", command=self._stop, bootstyle="danger-outline").pack(side=tk.LEFT, padx=2)
+        self.lbl_info = tb.Label(f_btn, text="", bootstyle="secondary")
+        self.lbl_info.pack(side=tk.RIGHT)
+
+    def _refresh(self):
+        if not self.winfo_exists(): return
+        live = self.sessions.sessions()
+        rows = set()
+        for s in live:
+            minutes, seconds = divmod(int(s.duration), 60)
+            values = (s.game, s.pid, time.strftime("%H:%M", time.localtime(s.start_time)), f"{minutes // 60}:{minutes % 60:02d}:{seconds:02d}",
+                      f"{s.cpu_percent:.0f}%" if s.cpu_percent is not None else "-", format_size(s.rss) if s.rss else "-")
+            if self.tree.exists(s.game): self.tree.item(s.game, values=values)
+            else: self.tree.insert("", tk.END, iid=s.game, values=values)
+            rows.add(s.game)
+        for iid in self.tree.get_children():
+            if iid not in rows: self.tree.delete(iid)
+        self.lbl_info.config(text=f"{len(live)} running" if live else "No game is running")
+        self.after(self.REFRESH_MS, self._refresh)
+
+    def _selected(self):
+        sel = self.tree.selection()
+        return sel[0] if sel else None
+
+    def _focus(self):
+        game = self._selected()
+        if game and not self.sessions.focus(game):
+            messagebox.showinfo("Focus Window", "Could not find the DOSBox window (focusing needs xdotool or wmctrl).", parent=self)
+
+    def _stop(self):
+        game = self._selected()
+        if game and messagebox.askyesno("Stop Game", f"Stop {game}? Unsaved progress in the game is lost.", parent=self):
+            self.sessions.kill(game)
@@ -6,9 +6,11 @@ import os
 import sys
 import subprocess
 import importlib.util
+import threading
 
 # Imports from our modules
 import constants
+from utils import format_size
 
 class SettingsWindow(tb.Toplevel):
     def __init__(self, parent_app):
@@ -57,6 +59,38 @@ class SettingsWindow(tb.Toplevel):
         self._create_path_row(parent, "DOSBox Executable (.exe):", self.v_exe, is_file=True)
         self._create_path_row(parent, "Global Template Config (.conf):", self.v_conf, is_file=True)
         self._create_path_row(parent, "DOSBox Capture Folder Name/Path:", self.v_capture, is_file=False, placeholder="Default: 'capture'")
+        tb.Button(parent, text="📂 Open Config Profiles Folder", command=self._open_profiles_folder, bootstyle="info-outline").pack(anchor="w", padx=10, pady=5)
+
+        f_workers = tb.Frame(parent)
+        f_workers.pack(fill=tk.X, padx=10, pady=5)
+        tb.Label(f_workers, text="Parallel installs:", bootstyle="inverse-dark").pack(side=tk.LEFT)
+        self.v_install_workers = tk.IntVar(value=int(self.settings.get("install_workers") or 1))
+        tb.Spinbox(f_workers, from_=1, to=8, width=5, textvariable=self.v_install_workers, state="readonly").pack(side=tk.LEFT, padx=10)
+
+        self.v_auto_backup = tk.BooleanVar(value=bool(self.settings.get("auto_backup_saves")))
+        tb.Checkbutton(parent, text="Back up changed save files after every session", variable=self.v_auto_backup, bootstyle="round-toggle").pack(anchor="w", padx=10, pady=5)
+
+        # Automatické ladenie cycles podľa nameranej záťaže DOSBoxu
+        f_cycles = tb.Frame(parent)
+        f_cycles.pack(fill=tk.X, padx=10, pady=5)
+        self.v_auto_cycles = tk.BooleanVar(value=bool(self.settings.get("auto_cycles")))
+        tb.Checkbutton(f_cycles, text="Tune cycles after each session to keep DOSBox under", variable=self.v_auto_cycles, bootstyle="round-toggle").pack(side=tk.LEFT)
+        self.v_cycles_target = tk.IntVar(value=int(self.settings.get("cycles_target_cpu") or 70))
+        tb.Spinbox(f_cycles, from_=20, to=100, increment=5, width=5, textvariable=self.v_cycles_target, state="readonly").pack(side=tk.LEFT, padx=5)
+        tb.Label(f_cycles, text="% CPU").pack(side=tk.LEFT)
+
+        # Zdieľané úložisko rovnakých súborov (hardlink/reflink)
+        f_dedup = tb.Frame(parent)
+        f_dedup.pack(fill=tk.X, padx=10, pady=5)
+        self.v_dedup = tk.BooleanVar(value=bool(self.settings.get("dedup_store")))
+        tb.Checkbutton(f_dedup, text="Share identical files between installed games", variable=self.v_dedup, bootstyle="round-toggle").pack(anchor="w")
+        f_dedup_row = tb.Frame(f_dedup)
+        f_dedup_row.pack(fill=tk.X, pady=(5, 0))
+        self.lbl_dedup = tb.Label(f_dedup_row, text="", bootstyle="secondary")
+        self.lbl_dedup.pack(side=tk.LEFT)
+        self.btn_dedup = tb.Button(f_dedup_row, text="Deduplicate Installed Games", command=self._run_dedup, bootstyle="info-outline")
+        self.btn_dedup.pack(side=tk.RIGHT)
+        self._show_dedup_report(self.parent_app.logic.blob_store.report())
 
         self.lbl_status = tb.Label(parent, text="", font=("Segoe UI", 9, "bold"), wraplength=530, justify="center")
         self.lbl_status.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=10)
@@ -88,7 +122,7 @@ class SettingsWindow(tb.Toplevel):
         
         self.playlist_vars = {}
         # Stĺpec 'name' je povinný a nedá sa skryť
-        all_cols = ("genre", "year", "company", "rating", "zip", "hdd")
+        all_cols = ("genre", "year", "company", "rating", "zip", "hdd", "played", "time", "recent")
         current_hidden = self.settings.get("hidden_columns") or []
         
         f_cols = tb.Frame(parent)
@@ -107,6 +141,10 @@ class SettingsWindow(tb.Toplevel):
             cb.grid(row=(i+1)//2, column=(i+1)%2, sticky='w', padx=15, pady=5)
             self.playlist_vars[col_name] = var
 
+        # Virtuálny zoznam pre veľké kolekcie (20k+ hier)
+        self.v_virtual_list = tk.BooleanVar(value=bool(self.settings.get("virtual_list")))
+        tb.Checkbutton(parent, text="Virtual list (only draw visible rows, for very large libraries)", variable=self.v_virtual_list, bootstyle="round-toggle").pack(anchor="w", padx=25, pady=(15, 5))
+
     def _build_theme_creator_section(self, parent):
         creator_installed = importlib.util.find_spec("ttkcreator") is not None
         
@@ -142,6 +180,24 @@ class SettingsWindow(tb.Toplevel):
         if placeholder:
             tb.Label(f, text=placeholder, font=("Segoe UI", 8), bootstyle="secondary").pack(anchor="w")
 
+    def _show_dedup_report(self, report):
+        self.lbl_dedup.config(text=f"{report['blobs']} shared files, {format_size(report['saved'])} saved")
+
+    def _run_dedup(self):
+        self.btn_dedup.config(state="disabled", text="Deduplicating…")
+        def work():
+            try: report, error = self.parent_app.logic.dedup_installed_games(), None
+            except Exception as e: report, error = None, e
+            self.parent_app.call_in_ui(self._on_dedup_done, report, error)
+        threading.Thread(target=work, daemon=True).start()
+
+    def _on_dedup_done(self, report, error):
+        if not self.winfo_exists(): return
+        self.btn_dedup.config(state="normal", text="Deduplicate Installed Games")
+        if error: messagebox.showerror("Error", str(error), parent=self); return
+        self._show_dedup_report(report)
+        self.parent_app.refresh_library()
+
     def _check_portability(self, *args):
         issues = []
         def is_path_portable(val):
@@ -168,6 +224,14 @@ class SettingsWindow(tb.Toplevel):
         else:
             subprocess.call(['xdg-open', themes_dir])
 
+    def _open_profiles_folder(self):
+        logic = self.parent_app.logic
+        logic.list_config_profiles()  # pri prvom otvorení zapíše vstavané profily
+        if os.name == 'nt':
+            os.startfile(logic.conf_layers.profiles_dir)
+        else:
+            subprocess.call(['xdg-open', logic.conf_layers.profiles_dir])
+
     def _run_installer(self, btn_install, btn_launch):
         try:
             btn_install.configure(state="disabled", text="Installing... (Please wait)")
@@ -190,6 +254,8 @@ class SettingsWindow(tb.Toplevel):
         # Načítanie starých hodnôt pre porovnanie
         old_theme = self.settings.get("theme")
         old_hidden_columns = self.settings.get("hidden_columns") or []
+        old_virtual_list = bool(self.settings.get("virtual_list"))
+        old_install_workers = self.settings.get("install_workers")
 
         # Uloženie nových hodnôt
         self.settings.set("root_dir", self.v_root.get())
@@ -201,14 +267,22 @@ class SettingsWindow(tb.Toplevel):
 
         new_hidden_columns = [col for col, var in self.playlist_vars.items() if not var.get()]
         self.settings.set("hidden_columns", new_hidden_columns)
+        self.settings.set("virtual_list", self.v_virtual_list.get())
+        self.settings.set("install_workers", self.v_install_workers.get())
+        self.settings.set("dedup_store", self.v_dedup.get())
+        self.settings.set("auto_backup_saves", self.v_auto_backup.get())
+        self.settings.set("auto_cycles", self.v_auto_cycles.get())
+        self.settings.set("cycles_target_cpu", self.v_cycles_target.get())
         
         self.settings.save()
         
         # Kontrola, či je potrebný reštart
         theme_changed = old_theme != self.v_theme.get()
         columns_changed = set(old_hidden_columns) != set(new_hidden_columns)
+        list_mode_changed = old_virtual_list != self.v_virtual_list.get()
+        workers_changed = old_install_workers != self.v_install_workers.get()
 
-        if theme_changed or columns_changed:
+        if theme_changed or columns_changed or list_mode_changed or workers_changed:
             messagebox.showinfo("Restart Required", "Settings have been changed that require a restart.", parent=self)
             self.destroy()
             self.parent_app.restart_program()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Moduly aplikácie sa importujú z priečinka script (rovnako ako v main.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'script'))
@@ -0,0 +1,42 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'script'))
+
+from catalog import Catalog, CatalogEntry
+from search_index import SearchIndex
+
+class CatalogFilterTest(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        entries = []
+        for name, genre, rating in [("Ultima7", "rpg", 5), ("Doom", "action", 4), ("Genre Wars", "strategy", 2)]:
+            self.index.add(name, {"genre": genre, "rating": rating})
+            entries.append(CatalogEntry(name + ".zip", meta={"genre": genre, "rating": rating}))
+        self.catalog = Catalog(entries, self.index)
+
+    def names(self, search):
+        return sorted(e.name for e in self.catalog.filter(search))
+
+    def test_fielded_query_after_its_field_name(self):
+        self.assertEqual(self.names("genre"), ["Genre Wars"])
+        self.assertEqual(self.names("genre:rpg"), ["Ultima7"])
+        self.assertEqual(self.names("rating"), [])
+        self.assertEqual(self.names("rating:>=4"), ["Doom", "Ultima7"])
+
+    def test_plain_terms_narrow(self):
+        self.assertEqual(self.names("d"), ["Doom"])
+        self.assertEqual(self.names("do"), ["Doom"])
+        self.assertEqual(self.names("doom action"), ["Doom"])
+        self.assertEqual(self.names(""), ["Doom", "Genre Wars", "Ultima7"])
+
+    def test_narrows(self):
+        self.assertTrue(Catalog._narrows("do", "doo"))
+        self.assertTrue(Catalog._narrows("doom", "doom act"))
+        self.assertFalse(Catalog._narrows("genre", "genre:rpg"))
+        self.assertFalse(Catalog._narrows("year:199", "year:1993"))
+        self.assertFalse(Catalog._narrows("doom a", "doom  a"))
+
+if __name__ == '__main__':
+    unittest.main()
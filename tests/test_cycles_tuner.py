@@ -0,0 +1,35 @@
+import pytest
+
+from cycles_tuner import parse_cycles, percentile, recommend_cycles, MIN_CYCLES
+
+@pytest.mark.parametrize("value, expected", [
+    ("auto", ("auto", None)), ("", ("auto", None)), (None, ("auto", None)),
+    ("12000", ("fixed", 12000)), ("fixed 3000", ("fixed", 3000)),
+    ("max", ("max", 100)), ("max 80%", ("max", 80)), ("MAX 50 %", ("max", 50)),
+    ("auto 3000 max 80%", ("auto", None)), ("garbage", ("auto", None)),
+])
+def test_parse_cycles(value, expected):
+    assert parse_cycles(value) == expected
+
+def test_percentile():
+    assert percentile([], 0.9) is None
+    assert percentile([5, 1, 3, 2, 4], 0.9) == 5
+    assert percentile(list(range(100)), 0.9) == 90
+
+def test_fixed_cycles_scale_to_target():
+    assert recommend_cycles("20000", [100.0, 100.0, 95.0], 80) == "16000"
+    assert recommend_cycles("fixed 20000", [100.0], 80) == "16000"
+    assert recommend_cycles("1200", [400.0], 80) == str(MIN_CYCLES)
+
+def test_no_recommendation_when_under_target_or_change_is_small():
+    assert recommend_cycles("20000", [70.0, 90.0, 60.0], 80) is None    # medián 70
+    assert recommend_cycles("20000", [82.0], 80) is None
+    assert recommend_cycles("20000", [], 80) is None
+    assert recommend_cycles("auto", [150.0], 80) is None
+
+def test_max_cycles_are_capped():
+    assert recommend_cycles("max", [100.0], 80) == "max 80%"
+    assert recommend_cycles("max 60%", [100.0], 50) == "max 50%"
+    assert recommend_cycles("max 50%", [100.0], 80) == "max 40%"
+    assert recommend_cycles("max 12%", [1000.0], 50) == "max 10%"
+    assert recommend_cycles("max 10%", [1000.0], 50) is None      # neklesne pod 10 %
@@ -0,0 +1,73 @@
+import os
+
+import dosbox_conf
+from dosbox_conf import DosboxConf, load_cached
+from conf_layers import ConfLayers
+
+TEXT = """# generated by DOSBox
+[sdl]
+fullscreen=false
+; user note
+unknownkey = keep me
+
+[cpu]
+core=auto
+cycles=max
+
+[autoexec]
+@echo off
+mount c .
+c:"""
+
+def test_parse_serialize_round_trips_unchanged_text():
+    assert DosboxConf.parse(TEXT).serialize() == TEXT
+
+def test_set_edits_in_place_and_keeps_unknown_lines():
+    conf = DosboxConf.parse(TEXT)
+    conf.set("cpu", "cycles", "fixed 20000")
+    conf.set("SDL", "output", "opengl")
+    out = conf.serialize()
+    assert "cycles=fixed 20000" in out and "cycles=max" not in out
+    assert out.index("output=opengl") < out.index("[cpu]")
+    assert "; user note" in out and conf.get("sdl", "unknownkey") == "keep me"
+    assert conf.autoexec() == ["@echo off", "mount c .", "c:"]
+    assert DosboxConf.parse(out).serialize() == out
+
+def test_new_sections_stay_before_autoexec():
+    conf = DosboxConf.parse(TEXT)
+    conf.set("mixer", "rate", "44100")
+    names = [name for name, _, _ in conf.sections]
+    assert names == ["sdl", "cpu", "mixer", "autoexec"]
+    assert conf.get("mixer", "rate") == "44100" and conf.get("autoexec", "mount") == ""
+
+def test_load_cached_rereads_after_change(tmp_path):
+    path = str(tmp_path / "dosbox.conf")
+    with open(path, "w") as f: f.write(TEXT)
+    first = load_cached(path)
+    assert load_cached(path) is first
+    conf = first.copy(); conf.set("cpu", "core", "dynamic"); conf.save(path)
+    assert load_cached(path).get("cpu", "core") == "dynamic"
+    assert first.get("cpu", "core") == "auto"
+    os.remove(path)
+    assert load_cached(path).sections == [] and path not in dosbox_conf._cache
+
+def test_layers_merge_later_wins_and_skip_lower_autoexec(tmp_path):
+    layers = ConfLayers(str(tmp_path / "cache"), str(tmp_path / "profiles"),
+                        {"cpu": {"core": "auto", "cycles": "auto"}, "sdl": {"fullscreen": "false"}},
+                        {"Fast": {"cpu": {"cycles": "max"}}})
+    assert layers.profiles() == ["Fast"]
+    template = str(tmp_path / "template.conf")
+    with open(template, "w") as f: f.write("[sdl]\nfullscreen=true\n[autoexec]\necho template")
+    game = str(tmp_path / "dosbox.conf")
+    with open(game, "w") as f: f.write("[cpu]\ncore=normal\n")
+
+    paths = layers.layers(template, "Fast")
+    assert paths[0] == layers.base_path() and paths[2] == layers.profile_path("Fast")
+    assert paths[1] != template and not load_cached(paths[1]).has_autoexec()
+    merged = layers.resolve(paths + [game])
+    assert (merged.get("cpu", "core"), merged.get("cpu", "cycles"), merged.get("sdl", "fullscreen")) == ("normal", "max", "true")
+    assert layers.resolve(paths + [game]) is merged
+
+    with open(game, "w") as f: f.write("[cpu]\ncore=dynamic\ncycles=fixed 3000\n")
+    os.utime(game, ns=(1, 1))
+    assert layers.resolve(paths + [game]).get("cpu", "cycles") == "fixed 3000"
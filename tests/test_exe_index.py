@@ -0,0 +1,39 @@
+import os
+
+import exe_index
+from exe_index import ExeIndex, EXE_DOS, EXE_SETUP
+
+
+class FakeDb:
+    def __init__(self): self.cache = {}
+    def get_cache(self, game, key): return self.cache.get((game, key))
+    def set_cache(self, game, key, value): self.cache[(game, key)] = value
+
+
+def _write(path, data=b"MZ" + b"\0" * 62):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f: f.write(data)
+
+
+def test_lookups_within_ttl_share_one_walk(tmp_path, monkeypatch):
+    _write(str(tmp_path / "GAME.EXE")); _write(str(tmp_path / "SETUP.EXE"))
+    idx, walks = ExeIndex(FakeDb()), []
+    real = exe_index.DirIndex.refresh
+    monkeypatch.setattr(exe_index.DirIndex, "refresh", lambda self, folder: walks.append(folder) or real(self, folder))
+    assert idx.scan("game", str(tmp_path)) == {"GAME.EXE": EXE_DOS, "SETUP.EXE": EXE_SETUP}
+    idx.extender("game", str(tmp_path)); idx.scan("game", str(tmp_path))
+    assert len(walks) == 1
+
+
+def test_walks_again_after_ttl_or_folder_change(tmp_path, monkeypatch):
+    _write(str(tmp_path / "GAME.EXE"))
+    idx, clock = ExeIndex(FakeDb()), [100.0]
+    monkeypatch.setattr(exe_index.time, "monotonic", lambda: clock[0])
+    assert list(idx.scan("game", str(tmp_path))) == ["GAME.EXE"]
+    _write(str(tmp_path / "SUB" / "PLAY.EXE"))
+    os.utime(tmp_path, ns=(0, 0))
+    assert list(idx.scan("game", str(tmp_path))) == ["GAME.EXE", os.path.join("SUB", "PLAY.EXE")]
+    _write(str(tmp_path / "SUB" / "MORE.EXE"))
+    assert os.path.join("SUB", "MORE.EXE") not in idx.scan("game", str(tmp_path))
+    clock[0] += exe_index.REFRESH_TTL
+    assert os.path.join("SUB", "MORE.EXE") in idx.scan("game", str(tmp_path))
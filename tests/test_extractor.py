@@ -0,0 +1,77 @@
+import io
+import os
+import threading
+import zipfile
+
+import pytest
+
+from extractor import plan_install, plan_organized, organized_layout, extract_plan, InstallCancelled
+
+def _zip(names):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        for name in names:
+            if name.endswith("/"): z.writestr(name, b"")
+            else: z.writestr(name, name.encode())
+    buf.seek(0)
+    return zipfile.ZipFile(buf)
+
+def _paths(plan): return sorted("/".join(parts) for m, parts in plan)
+
+def test_plan_strips_lone_wrapper_and_skips_bundled_dosbox():
+    z = _zip(["Doom/", "Doom/DOOM.EXE", "Doom/DATA/E1.WAD", "Doom/DOSBox/dosbox.exe"])
+    assert _paths(plan_install(z.infolist())) == ["DATA/E1.WAD", "DOOM.EXE"]
+
+def test_plan_keeps_top_level_files_and_drops_unsafe_parts():
+    z = _zip(["GAME.EXE", "../evil.txt", "/abs/x.dat", "dosbox", "Sub/./A.TXT"])
+    assert _paths(plan_install(z.infolist())) == ["GAME.EXE", "Sub/A.TXT", "abs/x.dat", "dosbox", "evil.txt"]
+
+def test_organized_moves_cd_images_and_keeps_valid_folder_name():
+    z = _zip(["KEEN/KEEN.EXE", "GAME.CUE", "GAME.BIN", "DISC.ISO", "docs/MANUAL.TXT"])
+    plan = plan_organized(plan_install(z.infolist()), "Commander Keen")
+    assert _paths(plan) == ["cd/DISC.ISO", "cd/GAME.BIN", "cd/GAME.CUE", "docs/MANUAL.TXT", "drives/c/KEEN/KEEN.EXE"]
+
+def test_organized_uses_dos_name_for_loose_files_and_long_folders():
+    loose = plan_install(_zip(["PLAY.EXE", "DATA/LEVEL1"]).infolist())
+    assert _paths(plan_organized(loose, "Prince of Persia")) == ["drives/c/PRINCEOF/DATA/LEVEL1", "drives/c/PRINCEOF/PLAY.EXE"]
+    wrapped = plan_install(_zip(["Long Name/GO.EXE", "DISC.ISO"]).infolist())
+    assert _paths(plan_organized(wrapped, "x")) == ["cd/DISC.ISO", "drives/c/X/GO.EXE"]
+    assert _paths(plan_organized(wrapped, "x", dos_name="GAME")) == ["cd/DISC.ISO", "drives/c/GAME/GO.EXE"]
+    mixed = plan_install(_zip(["KEEN/KEEN.EXE", "README.TXT"]).infolist())
+    assert _paths(plan_organized(mixed, "Keen 4")) == ["drives/c/KEEN4/KEEN/KEEN.EXE", "drives/c/KEEN4/README.TXT"]
+
+def test_layout_maps_paths_outside_the_plan():
+    dest = organized_layout(plan_install(_zip(["KEEN/KEEN.EXE", "DISC.ISO"]).infolist()), "Keen")
+    assert dest(["KEEN", "SAVE0.CK4"]) == ["drives", "c", "KEEN", "SAVE0.CK4"]
+    assert dest(["NEW.CFG"]) == ["drives", "c", "NEW.CFG"]
+    assert dest(["capture", "shot.png"]) == ["capture", "shot.png"]
+
+def test_extract_plan_writes_files_and_reports_progress(tmp_path):
+    z = _zip(["G/", "G/A.EXE", "G/SUB/B.DAT", "G/EMPTY/"])
+    calls = []
+    extract_plan(z, str(tmp_path), plan_install(z.infolist()), progress=lambda *a: calls.append(a))
+    assert (tmp_path / "A.EXE").read_bytes() == b"G/A.EXE"
+    assert (tmp_path / "SUB" / "B.DAT").read_bytes() == b"G/SUB/B.DAT"
+    assert (tmp_path / "EMPTY").is_dir()
+    total = len(b"G/A.EXE") + len(b"G/SUB/B.DAT")
+    assert calls[-1] == (total, total, 3, 3)
+
+def test_extract_plan_uses_link_instead_of_decompressing(tmp_path):
+    z = _zip(["A.EXE", "B.DAT"])
+    linked = []
+    def link(member, dest):
+        if member.filename != "B.DAT": return False
+        with open(dest, "wb") as f: f.write(b"from store")
+        linked.append(dest); return True
+    extract_plan(z, str(tmp_path), plan_install(z.infolist()), link=link)
+    assert linked == [os.path.join(str(tmp_path), "B.DAT")]
+    assert (tmp_path / "B.DAT").read_bytes() == b"from store"
+    assert (tmp_path / "A.EXE").read_bytes() == b"A.EXE"
+
+def test_extract_plan_cancels_between_members(tmp_path):
+    z, cancel = _zip(["A.EXE", "B.EXE"]), threading.Event()
+    def progress(done, total, entries, count):
+        if entries == 1: cancel.set()
+    with pytest.raises(InstallCancelled):
+        extract_plan(z, str(tmp_path), plan_install(z.infolist()), progress=progress, cancel_event=cancel)
+    assert not (tmp_path / "B.EXE").exists()
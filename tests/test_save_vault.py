@@ -0,0 +1,67 @@
+import json
+import os
+
+import save_vault
+from save_vault import SaveVault
+
+def _snap(vault, snap_id, files):
+    d = vault._snap_dir("game")
+    os.makedirs(d, exist_ok=True)
+    with open(os.path.join(d, snap_id + ".json"), "w") as f: json.dump({"files": files}, f)
+
+def _chunks(vault):
+    return {h for sub in os.listdir(vault.chunk_dir) for h in os.listdir(os.path.join(vault.chunk_dir, sub))}
+
+def test_snapshots_are_incremental_and_restore(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_vault, "CHUNK_SIZE", 4)
+    game, vault = tmp_path / "game", SaveVault(str(tmp_path / "vault"), (".sav",))
+    game.mkdir(); (game / "A.SAV").write_bytes(b"aaaabbbb"); (game / "B.SAV").write_bytes(b"aaaa")
+    snap1, files, changed, new_bytes = vault.snapshot("game", str(game), ["A.SAV", "B.SAV"])
+    assert (files, changed, new_bytes) == (2, 2, 8)     # blok "aaaa" sa uloží raz
+    assert vault.snapshot("game", str(game), ["A.SAV", "B.SAV"]) == (None, 2, 0, 0)
+
+    (game / "B.SAV").write_bytes(b"cccc")
+    os.utime(game / "B.SAV", ns=(1, 1))
+    snap2, files, changed, new_bytes = vault.snapshot("game", str(game), ["A.SAV", "B.SAV"])
+    assert snap2 != snap1 and (files, changed, new_bytes) == (2, 1, 4)
+    assert vault.snapshots("game") == sorted([snap1, snap2], reverse=True)
+
+    assert vault.restore("game", snap1, str(game)) == 2
+    assert (game / "B.SAV").read_bytes() == b"aaaa"
+    assert (game / "A.SAV").read_bytes() == b"aaaabbbb"
+
+def test_prune_keeps_last_daily_and_weekly(tmp_path):
+    vault = SaveVault(str(tmp_path), (".sav",))
+    ids = ["2026-01-05_10-00-00", "2026-01-05_12-00-00",    # pondelok, týždeň 2
+           "2026-01-06_09-00-00", "2026-01-12_09-00-00",    # týždeň 3
+           "2026-01-13_09-00-00", "2026-01-13_18-00-00"]
+    for snap_id in ids: _snap(vault, snap_id, {})
+    removed = vault.prune("game", keep_last=1, keep_daily=2, keep_weekly=2)
+    # posledný, najnovší z 13. a 12. januára, najnovší z týždňa 2 (6. januára)
+    assert vault.snapshots("game") == ["2026-01-13_18-00-00", "2026-01-12_09-00-00", "2026-01-06_09-00-00"]
+    assert sorted(removed) == ["2026-01-05_10-00-00", "2026-01-05_12-00-00", "2026-01-13_09-00-00"]
+
+def test_prune_collects_only_unreferenced_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_vault, "CHUNK_SIZE", 4)
+    game, vault = tmp_path / "game", SaveVault(str(tmp_path / "vault"), (".sav",))
+    game.mkdir(); (game / "A.SAV").write_bytes(b"old!keep")
+    old = vault.snapshot("game", str(game), ["A.SAV"])[0]
+    snaps = vault._snap_dir("game")
+    os.rename(os.path.join(snaps, old + ".json"), os.path.join(snaps, "2020-01-01_00-00-00.json"))
+    (game / "A.SAV").write_bytes(b"new!keep"); os.utime(game / "A.SAV", ns=(1, 1))
+    new = vault.snapshot("game", str(game), ["A.SAV"])[0]
+    assert len(_chunks(vault)) == 3
+
+    assert vault.prune("game", keep_last=1, keep_daily=0, keep_weekly=0) == ["2020-01-01_00-00-00"]
+    assert _chunks(vault) == set(vault.manifest("game", new)["files"]["A.SAV"]["chunks"])
+
+def test_gc_deletes_nothing_when_a_manifest_is_unreadable(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_vault, "CHUNK_SIZE", 4)
+    game, vault = tmp_path / "game", SaveVault(str(tmp_path / "vault"), (".sav",))
+    game.mkdir(); (game / "A.SAV").write_bytes(b"data")
+    vault.snapshot("game", str(game), ["A.SAV"])
+    with open(os.path.join(vault._snap_dir("game"), "2020-01-01_00-00-00.json"), "w") as f: f.write("{broken")
+    orphan = vault._chunk_path("ff" * 32)
+    os.makedirs(os.path.dirname(orphan), exist_ok=True); open(orphan, "wb").close()
+    vault.collect_garbage()
+    assert os.path.exists(orphan)
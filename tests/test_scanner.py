@@ -0,0 +1,21 @@
+import os
+
+from scanner import LibraryScanner
+
+OLD = 1_000_000_000
+
+def test_in_place_changes_are_detected(tmp_path):
+    zipped, installed = tmp_path / "zipped", tmp_path / "dosroot"
+    (installed / "Doom").mkdir(parents=True); zipped.mkdir()
+    (zipped / "Doom.zip").write_bytes(b"a")
+    for d in (zipped, installed, installed / "Doom"): os.utime(d, (OLD, OLD))
+    scanner = LibraryScanner()
+    assert scanner.scan(str(zipped), str(installed))[2].added == {"Doom.zip"}
+    assert not scanner.scan(str(zipped), str(installed))[2]
+
+    # Prepis zipu a zmena v priečinku hry nemenia mtime nadradených priečinkov
+    (zipped / "Doom.zip").write_bytes(b"bb")
+    (installed / "Doom" / "SAVE.DAT").write_bytes(b"x")
+    for d in (zipped, installed): os.utime(d, (OLD, OLD))
+    assert scanner.scan(str(zipped), str(installed))[2].changed == {"Doom.zip"}
+    assert scanner.zip_size("Doom.zip") == 2
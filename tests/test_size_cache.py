@@ -0,0 +1,27 @@
+import threading
+
+import size_cache
+from size_cache import SizeCache
+
+def wait_ready(cache):
+    done = threading.Event()
+    cache.on_ready = lambda path, size: done.set()
+    return done
+
+def test_stale_size_is_returned_and_walked_again(tmp_path, monkeypatch):
+    (tmp_path / "A.DAT").write_bytes(b"x" * 10)
+    cache = SizeCache()
+    done = wait_ready(cache)
+    assert cache.get(str(tmp_path), 1) is None
+    assert done.wait(5) and cache.get(str(tmp_path), 1) == 10
+
+    # Zmena hlboko v strome nemení podpis; po TTL sa vráti stará hodnota a prepočíta sa
+    (tmp_path / "SUB").mkdir(); (tmp_path / "SUB" / "B.DAT").write_bytes(b"y" * 5)
+    assert cache.get(str(tmp_path), 1) == 10
+    monkeypatch.setattr(size_cache, "SIZE_TTL", 0)
+    done = wait_ready(cache)
+    assert cache.get(str(tmp_path), 1) == 10
+    assert done.wait(5)
+    monkeypatch.setattr(size_cache, "SIZE_TTL", 3600)
+    assert cache.get(str(tmp_path), 1) == 15
+    cache.close()
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from components.tree_updater import TreeUpdater
+
+class FakeTree:
+    """Flat ttk.Treeview stand-in with Tk's move/detach semantics: the index given to move()
+    counts the siblings without the moved item."""
+
+    def __init__(self):
+        self.children, self.items = [], {}
+
+    def insert(self, parent, index, iid, values=(), tags=()):
+        self.items[iid] = (values, tags)
+        self.children.append(iid) if index == "end" else self.children.insert(index, iid)
+
+    def item(self, iid, values=(), tags=()): self.items[iid] = (values, tags)
+    def exists(self, iid): return iid in self.items
+    def index(self, iid): return self.children.index(iid) if iid in self.children else 0
+
+    def detach(self, iid):
+        if iid in self.children: self.children.remove(iid)
+
+    def move(self, iid, parent, index):
+        self.detach(iid)
+        self.children.insert(index, iid)
+
+    def delete(self, iid):
+        self.detach(iid)
+        del self.items[iid]
+
+def rows(ids): return [(iid, (iid,), ()) for iid in ids]
+
+def show(tree, updater, ids):
+    updater.update(rows(ids))
+    assert tree.children == list(ids)
+
+def test_moved_row_before_its_predecessor():
+    tree = FakeTree(); updater = TreeUpdater(tree)
+    show(tree, updater, ['g6', 'g5', 'g3', 'g0', 'g7', 'g1', 'g2'])
+    show(tree, updater, ['g5', 'g1', 'g0', 'g6', 'g2'])
+
+@pytest.mark.parametrize("seed", range(200))
+def test_random_updates_match_target(seed):
+    rnd = random.Random(seed)
+    universe = [f"g{i}" for i in range(rnd.randint(1, 15))]
+    tree = FakeTree(); updater = TreeUpdater(tree)
+    for _ in range(6):
+        target = rnd.sample(universe, rnd.randint(0, len(universe)))
+        if rnd.random() < 0.5: target.sort(key=universe.index)   # malé zmeny oproti celkovému premiešaniu
+        show(tree, updater, target)